@@ -0,0 +1,167 @@
+"""
+Benchmark do tempo de inicialização dos pontos de entrada
+
+Importa cada script em um interpretador novo com ``python -X importtime``
+e soma o tempo de importação do módulo. Serve de proteção contra
+regressões em duas frentes:
+
+- módulos pesados (pandas, numpy, jinja2...) que um ponto de entrada não
+  deve carregar ao ser importado;
+- tempo acima da referência gravada com ``--salvar-referencia`` (mais a
+  tolerância), medido na mesma máquina.
+
+Termina com código 1 se alguma verificação falhar, para uso em CI ou cron.
+
+Uso:
+    python benchmark_inicializacao.py --salvar-referencia
+    python benchmark_inicializacao.py --tolerancia 0.3
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Dict, List, Optional, Set, Tuple
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+# Ponto de entrada -> módulos que não podem ser carregados na importação
+PONTOS_DE_ENTRADA = {
+    "main": ["pandas", "numpy", "jinja2", "openpyxl", "pyarrow"],
+    "gerenciar_duvidas": ["pandas", "numpy", "jinja2", "openpyxl", "pyarrow"],
+    "gerador_diagnosticos": ["pandas", "numpy", "openpyxl", "pyarrow"],
+    "processador_questionarios": ["jinja2", "openpyxl"],
+}
+
+REFERENCIA_PADRAO = os.path.join(DIRETORIO, "resultados", "referencia_inicializacao.json")
+
+
+def medir_importacao(modulo: str) -> Tuple[float, Set[str], List[Tuple[float, str]]]:
+    """
+    Importa um módulo em um processo novo sob ``-X importtime``
+
+    Args:
+        modulo: Nome do módulo (ex.: "main")
+
+    Returns:
+        Tupla (milissegundos do módulo, módulos carregados, [(ms próprios, módulo)])
+
+    Raises:
+        RuntimeError: Se a importação falhar
+    """
+    processo = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {modulo}"],
+                              cwd=DIRETORIO, capture_output=True, text=True)
+    if processo.returncode != 0:
+        raise RuntimeError(f"Falha ao importar {modulo}: {processo.stderr.strip().splitlines()[-1]}")
+
+    total = 0.0
+    carregados = set()
+    proprios = []
+    for linha in processo.stderr.splitlines():
+        if not linha.startswith("import time:") or "[us]" in linha:
+            continue
+        proprio, acumulado, nome = linha[len("import time:"):].split("|")
+        nome = nome.strip()
+        carregados.add(nome)
+        proprios.append((int(proprio) / 1000, nome))
+        if nome == modulo:
+            total = int(acumulado) / 1000
+    return total, carregados, proprios
+
+
+def medir_pontos_de_entrada(repeticoes: int) -> Dict[str, Dict]:
+    """
+    Mede todos os pontos de entrada (vale a importação mais rápida)
+
+    Args:
+        repeticoes: Processos por ponto de entrada
+
+    Returns:
+        Dicionário {modulo: {"ms", "proibidos_carregados", "mais_lentos"}}
+    """
+    medicoes = {}
+    for modulo, proibidos in PONTOS_DE_ENTRADA.items():
+        melhor = None
+        for _ in range(repeticoes):
+            total, carregados, proprios = medir_importacao(modulo)
+            if melhor is None or total < melhor[0]:
+                melhor = (total, carregados, proprios)
+        total, carregados, proprios = melhor
+        medicoes[modulo] = {
+            "ms": round(total, 1),
+            "proibidos_carregados": sorted(
+                pacote for pacote in proibidos
+                if any(nome == pacote or nome.startswith(f"{pacote}.") for nome in carregados)),
+            "mais_lentos": [f"{nome} ({ms:.1f} ms)" for ms, nome in sorted(proprios, reverse=True)[:5]]
+        }
+    return medicoes
+
+
+def verificar(medicoes: Dict[str, Dict], referencia: Optional[Dict[str, float]],
+              tolerancia: float, folga_ms: float) -> List[str]:
+    """
+    Lista as regressões encontradas
+
+    Args:
+        medicoes: Resultado de ``medir_pontos_de_entrada``
+        referencia: Milissegundos de referência por módulo (None só verifica os proibidos)
+        tolerancia: Aumento relativo aceito sobre a referência
+        folga_ms: Aumento absoluto aceito, para absorver ruído em tempos pequenos
+
+    Returns:
+        Mensagens de falha (vazia se tudo passou)
+    """
+    falhas = []
+    for modulo, medicao in medicoes.items():
+        if medicao["proibidos_carregados"]:
+            falhas.append(f"{modulo} carrega {', '.join(medicao['proibidos_carregados'])} na importação")
+        if referencia and modulo in referencia:
+            limite = referencia[modulo] * (1 + tolerancia) + folga_ms
+            if medicao["ms"] > limite:
+                falhas.append(f"{modulo}: {medicao['ms']:.1f} ms (referência {referencia[modulo]:.1f} ms, "
+                              f"limite {limite:.1f} ms)")
+    return falhas
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Tempo de inicialização dos pontos de entrada")
+    parser.add_argument("--repeticoes", type=int, default=5,
+                        help="processos por ponto de entrada; vale o mais rápido (padrão: 5)")
+    parser.add_argument("--referencia", default=REFERENCIA_PADRAO,
+                        help="JSON com os tempos de referência (padrão: resultados/referencia_inicializacao.json)")
+    parser.add_argument("--salvar-referencia", action="store_true",
+                        help="grava os tempos medidos como nova referência")
+    parser.add_argument("--tolerancia", type=float, default=0.25,
+                        help="aumento relativo aceito sobre a referência (padrão: 0.25)")
+    parser.add_argument("--folga-ms", type=float, default=5.0,
+                        help="aumento absoluto aceito em ms (padrão: 5)")
+    args = parser.parse_args(argumentos)
+
+    medicoes = medir_pontos_de_entrada(args.repeticoes)
+    for modulo, medicao in medicoes.items():
+        print(f"{modulo:<28} {medicao['ms']:>9.1f} ms   {', '.join(medicao['mais_lentos'][:3])}")
+
+    if args.salvar_referencia:
+        os.makedirs(os.path.dirname(args.referencia) or ".", exist_ok=True)
+        with open(args.referencia, 'w', encoding='utf-8') as f:
+            json.dump({modulo: medicao["ms"] for modulo, medicao in medicoes.items()}, f, indent=2)
+        print(f"Referência salva em {args.referencia}")
+
+    referencia = None
+    if os.path.exists(args.referencia):
+        with open(args.referencia, 'r', encoding='utf-8') as f:
+            referencia = json.load(f)
+    else:
+        print("Sem referência de tempo; verificando apenas os módulos carregados")
+
+    falhas = verificar(medicoes, referencia, args.tolerancia, args.folga_ms)
+    for falha in falhas:
+        print(f"❌ {falha}")
+    if not falhas:
+        print("✅ Inicialização dentro do esperado")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
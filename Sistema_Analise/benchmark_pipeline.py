@@ -0,0 +1,271 @@
+"""
+Benchmark das etapas do processamento sobre dados sintéticos
+
+Para cada tamanho e formato de entrada, gera (ou reaproveita) as
+exportações de gerar_dados_sinteticos e mede, separadamente, a leitura,
+``processar_questionario_estresse``, ``processar_questionario_menacme``,
+``combinar_por_usuario`` e ``gerar_todos_diagnosticos``. O tempo de cada
+etapa é medido sem rastreamento; o pico de memória vem de uma segunda
+execução sob tracemalloc, para não distorcer as linhas/s.
+
+O resultado é gravado em JSON com o commit atual, e ``--comparar`` mostra
+a variação entre dois arquivos (por exemplo, antes e depois de uma mudança).
+
+Uso:
+    python benchmark_pipeline.py --linhas 1k 100k --formatos xlsx parquet --saida resultados/benchmark.json
+    python benchmark_pipeline.py --comparar benchmark_antes.json benchmark_depois.json
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from gerar_dados_sinteticos import (FORMATOS, escrever_questionarios, gerar_questionarios,
+                                    interpretar_tamanho)
+from gerador_diagnosticos import GeradorDiagnosticos
+from processador_questionarios import ProcessadorQuestionarios
+
+
+def medir(funcao: Callable[[], object], repeticoes: int = 1) -> Tuple[object, float, float]:
+    """
+    Mede o melhor tempo e o pico de memória alocada de uma função
+
+    Args:
+        funcao: Função sem argumentos a medir
+        repeticoes: Execuções cronometradas (vale o menor tempo)
+
+    Returns:
+        Tupla (retorno da última execução, segundos, pico em MB)
+    """
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        retorno = funcao()
+        melhor = min(melhor, time.perf_counter() - inicio)
+
+    tracemalloc.start()
+    try:
+        retorno = funcao()
+        _, pico = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return retorno, melhor, pico / (1024 * 1024)
+
+
+def preparar_dados(diretorio_dados: str, linhas: int, formato: str, semente: int, config: Dict) -> str:
+    """
+    Gera as exportações sintéticas, a menos que já existam
+
+    Args:
+        diretorio_dados: Diretório base dos dados de benchmark
+        linhas: Linhas por questionário
+        formato: Formato das exportações
+        semente: Semente do gerador
+        config: Configuração do processador (separador e formato de data do CSV)
+
+    Returns:
+        Diretório com as exportações
+    """
+    diretorio = os.path.join(diretorio_dados, f"{linhas}_s{semente}", formato)
+    esperados = [f"questionario_{questionario}.{formato}"
+                 for questionario in ("estresse", "menacme", "vulnerabilidade", "sociodemografico")]
+    if all(os.path.exists(os.path.join(diretorio, nome)) for nome in esperados):
+        return diretorio
+
+    print(f"Gerando {linhas} linhas em {formato} ({diretorio})...")
+    configuracoes = config.get("configuracoes_gerais", {})
+    escrever_questionarios(gerar_questionarios(linhas, semente), diretorio, formato,
+                           configuracoes.get("separador_csv", ";"),
+                           configuracoes.get("formato_data") or "%d/%m/%Y %H:%M:%S")
+    return diretorio
+
+
+def executar_cenario(diretorio: str, repeticoes: int, max_diagnosticos: Optional[int]) -> Dict[str, Dict]:
+    """
+    Mede cada etapa do processamento sobre um diretório de exportações
+
+    Args:
+        diretorio: Diretório com as exportações
+        repeticoes: Execuções cronometradas por etapa
+        max_diagnosticos: Limite de diagnósticos gerados (None gera todos)
+
+    Returns:
+        Dicionário {etapa: {"segundos", "linhas", "linhas_por_segundo", "pico_memoria_mb"}}
+    """
+    processador = ProcessadorQuestionarios(usar_cache=False)
+    etapas = {}
+
+    def registrar(etapa: str, linhas: int, segundos: float, pico_mb: float):
+        etapas[etapa] = {
+            "segundos": round(segundos, 4),
+            "linhas": linhas,
+            "linhas_por_segundo": round(linhas / segundos, 1) if segundos else None,
+            "pico_memoria_mb": round(pico_mb, 1)
+        }
+
+    def ler() -> Dict[str, pd.DataFrame]:
+        return {questionario: processador.ler_arquivos_questionario(
+            processador.localizar_arquivos_questionario(diretorio, questionario))
+            for questionario in ("estresse", "menacme")}
+
+    dados, segundos, pico = medir(ler, repeticoes)
+    registrar("leitura", sum(len(df) for df in dados.values()), segundos, pico)
+
+    estresse, segundos, pico = medir(
+        lambda: processador.processar_questionario_estresse(dados["estresse"]), repeticoes)
+    registrar("estresse", len(dados["estresse"]), segundos, pico)
+
+    menacme, segundos, pico = medir(
+        lambda: processador.processar_questionario_menacme(dados["menacme"]), repeticoes)
+    registrar("menacme", len(dados["menacme"]), segundos, pico)
+
+    combinados, segundos, pico = medir(
+        lambda: processador.combinar_por_usuario(estresse, menacme), repeticoes)
+    registrar("combinacao", len(estresse) + len(menacme), segundos, pico)
+
+    processador.resultados = {"estresse": estresse, "menacme": menacme, "combinados": combinados}
+    user_ids = None
+    if max_diagnosticos is not None and len(combinados) > max_diagnosticos:
+        user_ids = set(combinados.user_ids[:max_diagnosticos].tolist())
+    gerador = GeradorDiagnosticos(processador)
+
+    def gerar_diagnosticos() -> List[Dict]:
+        # Diretório novo a cada execução: o manifesto pularia os diagnósticos já gravados
+        with tempfile.TemporaryDirectory() as diretorio_diagnosticos:
+            return gerador.gerar_todos_diagnosticos(diretorio_diagnosticos, user_ids=user_ids)
+
+    diagnosticos, segundos, pico = medir(gerar_diagnosticos, 1)
+    registrar("diagnostico", len(diagnosticos), segundos, pico)
+
+    return etapas
+
+
+def commit_atual() -> Optional[str]:
+    """
+    Commit do repositório em que o benchmark roda
+
+    Returns:
+        Hash abreviado, ou None fora de um repositório git
+    """
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def formatar_cenario(nome: str, etapas: Dict[str, Dict]) -> str:
+    """
+    Tabela legível das etapas de um cenário
+
+    Args:
+        nome: Nome do cenário (ex.: "100000 linhas, xlsx")
+        etapas: Medições por etapa
+
+    Returns:
+        Texto para exibir no terminal
+    """
+    linhas = [nome]
+    for etapa, dados in etapas.items():
+        taxa = f"{dados['linhas_por_segundo']:.0f} linhas/s" if dados["linhas_por_segundo"] else "-"
+        linhas.append(f"  {etapa:<12} {dados['segundos']:>9.3f} s  {dados['linhas']:>9} linhas  "
+                      f"{taxa:>18}  pico {dados['pico_memoria_mb']:>8.1f} MB")
+    return "\n".join(linhas)
+
+
+def comparar(caminho_base: str, caminho_novo: str) -> str:
+    """
+    Variação de linhas/s e de pico de memória entre dois resultados
+
+    Args:
+        caminho_base: JSON de referência
+        caminho_novo: JSON a comparar
+
+    Returns:
+        Texto com a variação por cenário e etapa
+    """
+    with open(caminho_base, 'r', encoding='utf-8') as f:
+        base = json.load(f)
+    with open(caminho_novo, 'r', encoding='utf-8') as f:
+        novo = json.load(f)
+
+    linhas = [f"{base.get('commit') or caminho_base} -> {novo.get('commit') or caminho_novo}"]
+    for cenario, etapas in novo["cenarios"].items():
+        if cenario not in base["cenarios"]:
+            continue
+        linhas.append(cenario)
+        for etapa, dados in etapas.items():
+            anterior = base["cenarios"][cenario].get(etapa)
+            if not anterior or not anterior["linhas_por_segundo"] or not dados["linhas_por_segundo"]:
+                continue
+            taxa = dados["linhas_por_segundo"] / anterior["linhas_por_segundo"] - 1
+            memoria = dados["pico_memoria_mb"] - anterior["pico_memoria_mb"]
+            linhas.append(f"  {etapa:<12} linhas/s {taxa:>+8.1%}  pico {memoria:>+9.1f} MB")
+    return "\n".join(linhas)
+
+
+def main(argumentos: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark das etapas do processamento")
+    parser.add_argument("--linhas", nargs="+", default=["1k"],
+                        help="tamanhos a medir: 1k, 100k, 1m ou números (padrão: 1k)")
+    parser.add_argument("--formatos", nargs="+", default=["xlsx"], choices=FORMATOS,
+                        help="formatos de entrada (padrão: xlsx)")
+    parser.add_argument("--semente", type=int, default=42, help="semente dos dados (padrão: 42)")
+    parser.add_argument("--repeticoes", type=int, default=1,
+                        help="execuções cronometradas por etapa; vale a mais rápida (padrão: 1)")
+    parser.add_argument("--max-diagnosticos", type=int, default=2000,
+                        help="limite de diagnósticos gerados por cenário (padrão: 2000)")
+    parser.add_argument("--dados", default="dados_benchmark",
+                        help="diretório dos dados gerados (padrão: dados_benchmark)")
+    parser.add_argument("--saida", default=os.path.join("resultados", "benchmark.json"),
+                        help="arquivo JSON do resultado (padrão: resultados/benchmark.json)")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "NOVO"),
+                        help="compara dois resultados gravados e sai")
+    args = parser.parse_args(argumentos)
+
+    if args.comparar:
+        print(comparar(*args.comparar))
+        return
+
+    config = ProcessadorQuestionarios(usar_cache=False).config
+    # Mensagens por arquivo e por etapa não entram na medição
+    logging.disable(logging.INFO)
+    cenarios = {}
+    for tamanho in args.linhas:
+        linhas = interpretar_tamanho(tamanho)
+        for formato in args.formatos:
+            diretorio = preparar_dados(args.dados, linhas, formato, args.semente, config)
+            nome = f"{linhas}_{formato}"
+            cenarios[nome] = executar_cenario(diretorio, args.repeticoes, args.max_diagnosticos)
+            print(formatar_cenario(f"{linhas} linhas, {formato}", cenarios[nome]))
+
+    resultado = {
+        "commit": commit_atual(),
+        "data": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "numpy": np.__version__,
+        "cpus": os.cpu_count(),
+        "semente": args.semente,
+        "cenarios": cenarios
+    }
+    os.makedirs(os.path.dirname(args.saida) or ".", exist_ok=True)
+    with open(args.saida, 'w', encoding='utf-8') as f:
+        json.dump(resultado, f, indent=2, ensure_ascii=False)
+    print(f"Resultado salvo em {args.saida}")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,209 @@
+"""
+Cache das planilhas já lidas, guardadas em Parquet ao lado dos resultados
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Dict, Optional
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class CacheLeitura:
+    """
+    Cache em disco de DataFrames lidos de arquivos de entrada
+
+    Cada entrada é identificada pelo tamanho, data de modificação e hash
+    SHA-256 do arquivo de origem. O hash só é recalculado quando tamanho
+    ou data de modificação mudam. Quando o total ultrapassa o limite,
+    as entradas usadas há mais tempo são removidas (LRU).
+    """
+
+    def __init__(self, diretorio: str, limite_mb: float = 512):
+        """
+        Inicializa o cache
+
+        Args:
+            diretorio: Diretório onde os arquivos de cache são guardados
+            limite_mb: Tamanho máximo do cache em megabytes
+        """
+        self.diretorio = diretorio
+        self.limite_bytes = int(limite_mb * 1024 * 1024)
+        self.caminho_indice = os.path.join(diretorio, "indice.json")
+        self.indice = self.carregar_indice()
+
+    def carregar_indice(self) -> Dict:
+        """
+        Carrega o índice do cache
+
+        Returns:
+            Dicionário com "entradas" e "arquivos" (impressões digitais das origens)
+        """
+        if os.path.exists(self.caminho_indice):
+            try:
+                with open(self.caminho_indice, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Índice do cache inválido, recriando: {e}")
+        return {"entradas": {}, "arquivos": {}}
+
+    def salvar_indice(self):
+        """
+        Salva o índice do cache de forma atômica
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+        caminho_temporario = f"{self.caminho_indice}.tmp"
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.indice, f, indent=2, ensure_ascii=False)
+        os.replace(caminho_temporario, self.caminho_indice)
+
+    def calcular_chave(self, caminho_arquivo: str) -> str:
+        """
+        Calcula a chave de cache de um arquivo de origem
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo de origem
+
+        Returns:
+            Chave no formato "<tamanho>-<mtime>-<sha256>"
+        """
+        estado = os.stat(caminho_arquivo)
+        origem = os.path.abspath(caminho_arquivo)
+        conhecido = self.indice["arquivos"].get(origem)
+
+        if conhecido and conhecido["tamanho"] == estado.st_size and conhecido["mtime"] == estado.st_mtime_ns:
+            conteudo_hash = conhecido["sha256"]
+        else:
+            sha256 = hashlib.sha256()
+            with open(caminho_arquivo, 'rb') as f:
+                for parte in iter(lambda: f.read(1024 * 1024), b""):
+                    sha256.update(parte)
+            conteudo_hash = sha256.hexdigest()
+            self.indice["arquivos"][origem] = {
+                "tamanho": estado.st_size,
+                "mtime": estado.st_mtime_ns,
+                "sha256": conteudo_hash
+            }
+
+        return f"{estado.st_size}-{estado.st_mtime_ns}-{conteudo_hash}"
+
+    def obter(self, caminho_arquivo: str) -> Optional[pd.DataFrame]:
+        """
+        Retorna o DataFrame em cache de um arquivo, se existir
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo de origem
+
+        Returns:
+            DataFrame guardado ou None
+        """
+        chave = self.calcular_chave(caminho_arquivo)
+        entrada = self.indice["entradas"].get(chave)
+        if not entrada:
+            return None
+
+        caminho_cache = os.path.join(self.diretorio, entrada["arquivo"])
+        try:
+            df = pd.read_parquet(caminho_cache)
+        except Exception as e:
+            logger.warning(f"Entrada de cache ilegível para {caminho_arquivo}: {e}")
+            self.remover(chave)
+            return None
+
+        entrada["ultimo_acesso"] = time.time()
+        self.salvar_indice()
+        logger.info(
+            f"Arquivo {caminho_arquivo} carregado do cache com {len(df)} registros")
+        return df
+
+    def localizar(self, caminho_arquivo: str) -> Optional[str]:
+        """
+        Caminho do Parquet em cache de um arquivo, sem carregá-lo
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo de origem
+
+        Returns:
+            Caminho do arquivo de cache ou None
+        """
+        entrada = self.indice["entradas"].get(self.calcular_chave(caminho_arquivo))
+        if not entrada:
+            return None
+        caminho_cache = os.path.join(self.diretorio, entrada["arquivo"])
+        return caminho_cache if os.path.exists(caminho_cache) else None
+
+    def guardar(self, caminho_arquivo: str, df: pd.DataFrame):
+        """
+        Guarda o DataFrame lido de um arquivo no cache
+
+        DataFrames que não podem ser gravados em Parquet (por exemplo,
+        colunas com tipos misturados) são ignorados.
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo de origem
+            df: DataFrame lido do arquivo
+        """
+        chave = self.calcular_chave(caminho_arquivo)
+        nome_cache = f"{hashlib.sha256(chave.encode()).hexdigest()[:32]}.parquet"
+        caminho_cache = os.path.join(self.diretorio, nome_cache)
+
+        os.makedirs(self.diretorio, exist_ok=True)
+        try:
+            df.to_parquet(f"{caminho_cache}.tmp")
+            os.replace(f"{caminho_cache}.tmp", caminho_cache)
+        except Exception as e:
+            logger.warning(f"Não foi possível guardar {caminho_arquivo} no cache: {e}")
+            if os.path.exists(f"{caminho_cache}.tmp"):
+                os.remove(f"{caminho_cache}.tmp")
+            return
+
+        # Entradas antigas do mesmo arquivo de origem não serão mais usadas
+        origem = os.path.abspath(caminho_arquivo)
+        for chave_antiga, entrada in list(self.indice["entradas"].items()):
+            if entrada["origem"] == origem and chave_antiga != chave:
+                self.remover(chave_antiga, salvar=False)
+
+        self.indice["entradas"][chave] = {
+            "origem": origem,
+            "arquivo": nome_cache,
+            "tamanho_bytes": os.path.getsize(caminho_cache),
+            "ultimo_acesso": time.time()
+        }
+        self.aplicar_limite()
+        self.salvar_indice()
+
+    def remover(self, chave: str, salvar: bool = True):
+        """
+        Remove uma entrada do cache
+
+        Args:
+            chave: Chave da entrada
+            salvar: Se True, grava o índice em seguida
+        """
+        entrada = self.indice["entradas"].pop(chave, None)
+        if entrada:
+            caminho_cache = os.path.join(self.diretorio, entrada["arquivo"])
+            if os.path.exists(caminho_cache):
+                os.remove(caminho_cache)
+        if salvar:
+            self.salvar_indice()
+
+    def aplicar_limite(self):
+        """
+        Remove as entradas usadas há mais tempo até o cache caber no limite
+        """
+        entradas = sorted(self.indice["entradas"].items(),
+                          key=lambda item: item[1]["ultimo_acesso"])
+        total = sum(entrada["tamanho_bytes"] for _, entrada in entradas)
+
+        for chave, entrada in entradas:
+            if total <= self.limite_bytes:
+                break
+            total -= entrada["tamanho_bytes"]
+            logger.info(f"Removendo do cache: {entrada['origem']}")
+            self.remover(chave, salvar=False)
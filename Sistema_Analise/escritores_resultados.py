@@ -0,0 +1,316 @@
+"""
+Escritores dos formatos de saída de salvar_resultados
+
+Todos recebem uma tabela colunar (ver resultados_compactos) e gravam
+direto dos vetores, sem montar a coorte inteira como dicionários.
+"""
+
+import json
+import logging
+import os
+import shutil
+from typing import Dict, Optional, Set
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+# Formatos aceitos em configuracoes_gerais.formatos_saida
+FORMATOS_SAIDA = ("json", "ndjson", "parquet", "csv", "xlsx")
+
+
+def _gravar_atomico(caminho_arquivo: str, gravar):
+    """
+    Grava em um arquivo temporário e o renomeia ao final
+
+    Args:
+        caminho_arquivo: Caminho final do arquivo
+        gravar: Função que recebe o caminho temporário e grava nele
+    """
+    caminho_temporario = f"{caminho_arquivo}.tmp"
+    try:
+        gravar(caminho_temporario)
+        os.replace(caminho_temporario, caminho_arquivo)
+    finally:
+        if os.path.exists(caminho_temporario):
+            os.remove(caminho_temporario)
+
+
+def _dataframe_saida(tabela) -> pd.DataFrame:
+    """
+    DataFrame plano da tabela com timestamps em um tipo único
+
+    Timestamps de CSVs que não puderam ser convertidos ficam como texto,
+    e o Parquet não aceita colunas com tipos misturados.
+
+    Args:
+        tabela: Tabela colunar de resultados
+
+    Returns:
+        DataFrame pronto para gravação
+    """
+    df = tabela.para_dataframe()
+    if df["timestamp"].dtype == object:
+        convertidos = pd.to_datetime(df["timestamp"], errors="coerce")
+        if convertidos.notna().sum() == df["timestamp"].notna().sum():
+            df["timestamp"] = convertidos
+        else:
+            df["timestamp"] = df["timestamp"].astype(str)
+    return df
+
+
+def _escrever_linhas_ndjson(tabela, arquivo):
+    """
+    Escreve um participante por linha, serializados um por vez
+
+    Args:
+        tabela: Tabela colunar de resultados
+        arquivo: Arquivo texto aberto para escrita
+    """
+    for registro in tabela.como_dicts():
+        arquivo.write(json.dumps(registro, ensure_ascii=False, default=str))
+        arquivo.write("\n")
+
+
+def escrever_ndjson(tabela, caminho_arquivo: str):
+    """
+    Grava um participante por linha em JSON (newline-delimited JSON)
+
+    Os registros são serializados um por vez, com a mesma estrutura do
+    resultados_completos.json.
+
+    Args:
+        tabela: Tabela colunar de resultados
+        caminho_arquivo: Caminho do arquivo .ndjson
+    """
+    def gravar(caminho):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            _escrever_linhas_ndjson(tabela, f)
+
+    _gravar_atomico(caminho_arquivo, gravar)
+
+
+def anexar_ndjson(tabela, caminho_arquivo: str):
+    """
+    Acrescenta os participantes da tabela ao fim de um NDJSON existente
+
+    Só as linhas novas são serializadas; o arquivo atual é copiado para o
+    temporário antes, para que uma interrupção não deixe linha pela metade.
+
+    Args:
+        tabela: Tabela colunar com apenas as linhas a acrescentar
+        caminho_arquivo: Caminho do arquivo .ndjson
+    """
+    def gravar(caminho):
+        shutil.copyfile(caminho_arquivo, caminho)
+        with open(caminho, 'a', encoding='utf-8') as f:
+            _escrever_linhas_ndjson(tabela, f)
+
+    _gravar_atomico(caminho_arquivo, gravar)
+
+
+def escrever_parquet(tabela, caminho_arquivo: str):
+    """
+    Grava a tabela em Parquet (uma coluna por pergunta)
+
+    Args:
+        tabela: Tabela colunar de resultados
+        caminho_arquivo: Caminho do arquivo .parquet
+    """
+    df = _dataframe_saida(tabela)
+    _gravar_atomico(caminho_arquivo, lambda caminho: df.to_parquet(caminho, index=False))
+
+
+def escrever_csv(tabela, caminho_arquivo: str, separador: str = ";", encoding: str = "utf-8"):
+    """
+    Grava a tabela em CSV (uma coluna por pergunta)
+
+    Args:
+        tabela: Tabela colunar de resultados
+        caminho_arquivo: Caminho do arquivo .csv
+        separador: Separador de colunas
+        encoding: Codificação do arquivo
+    """
+    df = tabela.para_dataframe()
+    _gravar_atomico(caminho_arquivo, lambda caminho: df.to_csv(
+        caminho, sep=separador, encoding=encoding, index=False))
+
+
+def escrever_xlsx(tabela, caminho_arquivo: str):
+    """
+    Grava a tabela em Excel no modo somente escrita do openpyxl
+
+    As linhas são enviadas ao arquivo conforme são geradas, sem estilos
+    por célula, o que é bem mais rápido e leve que ``DataFrame.to_excel``.
+
+    Args:
+        tabela: Tabela colunar de resultados
+        caminho_arquivo: Caminho do arquivo .xlsx
+    """
+    from openpyxl import Workbook
+
+    df = _dataframe_saida(tabela)
+
+    def gravar(caminho):
+        workbook = Workbook(write_only=True)
+        planilha = workbook.create_sheet()
+        planilha.append([str(coluna) for coluna in df.columns])
+        for linha in df.itertuples(index=False, name=None):
+            planilha.append([None if pd.isna(valor) else valor.to_pydatetime()
+                             if isinstance(valor, pd.Timestamp) else valor.item()
+                             if hasattr(valor, "item") else valor for valor in linha])
+        workbook.save(caminho)
+
+    _gravar_atomico(caminho_arquivo, gravar)
+
+
+def escrever_tabela(tabela, formato: str, caminho_base: str, opcoes_csv: Dict = None) -> str:
+    """
+    Grava uma tabela no formato pedido
+
+    Args:
+        tabela: Tabela colunar de resultados
+        formato: Um de FORMATOS_SAIDA, exceto "json"
+        caminho_base: Caminho do arquivo sem extensão
+        opcoes_csv: Separador e encoding para o CSV
+
+    Returns:
+        Caminho do arquivo gravado
+    """
+    caminho_arquivo = f"{caminho_base}.{formato}"
+    if formato == "ndjson":
+        escrever_ndjson(tabela, caminho_arquivo)
+    elif formato == "parquet":
+        escrever_parquet(tabela, caminho_arquivo)
+    elif formato == "csv":
+        escrever_csv(tabela, caminho_arquivo, **(opcoes_csv or {}))
+    elif formato == "xlsx":
+        escrever_xlsx(tabela, caminho_arquivo)
+    else:
+        raise ValueError(
+            f"Formato de saída inválido: {formato}. Use {', '.join(FORMATOS_SAIDA)}")
+    return caminho_arquivo
+
+
+def _nome_arquivo_valido(user_id: str) -> bool:
+    """
+    Indica se o user_id pode ser usado como parte de um nome de arquivo
+
+    Args:
+        user_id: Identificador do participante
+
+    Returns:
+        True se o identificador não contém separadores de diretório
+    """
+    return bool(user_id) and user_id not in (".", "..") and \
+        os.path.basename(user_id) == user_id and "\\" not in user_id
+
+
+def carregar_manifesto(caminho_manifesto: str) -> Dict:
+    """
+    Carrega um manifesto de hashes por participante
+
+    Usado pelos arquivos por participante (``{user_id: {questionario:
+    sha256}}``) e pelos diagnósticos (``{user_id: sha256}``, junto com a
+    versão dos templates).
+
+    Args:
+        caminho_manifesto: Caminho do manifesto
+
+    Returns:
+        Dicionário com ao menos a chave "participantes" (vazio se o
+        arquivo não existir ou estiver inválido)
+    """
+    if os.path.exists(caminho_manifesto):
+        try:
+            with open(caminho_manifesto, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning(f"Manifesto inválido, recriando: {e}")
+    return {"participantes": {}}
+
+
+def escrever_resultados_participantes(tabelas: Dict, diretorio_saida: str,
+                                      politica: str = "ultima",
+                                      user_ids: Optional[Set[str]] = None,
+                                      nome_manifesto: str = "manifesto_participantes.json") -> Dict[str, int]:
+    """
+    Grava um arquivo ``{user_id}_{questionario}.json`` por participante
+
+    Cada arquivo recebe o envio escolhido pela política de duplicatas
+    (``"primeira"`` usa o primeiro; as demais, o último). O manifesto
+    guarda o hash de cada participante, calculado dos vetores da tabela
+    (``hashes_linhas``), e só os arquivos cujo hash mudou são
+    serializados e regravados. Sem ``user_ids``, arquivos de participantes
+    que não estão mais nos resultados são removidos.
+
+    Args:
+        tabelas: Tabelas colunares por questionário (ex.: estresse, menacme)
+        diretorio_saida: Diretório dos resultados
+        politica: Política de duplicatas (configuracoes_gerais.politica_duplicatas)
+        user_ids: Se informado, considera apenas esses participantes
+        nome_manifesto: Nome do arquivo de manifesto
+
+    Returns:
+        Contagem de arquivos {"gravados", "inalterados", "removidos"}
+    """
+    caminho_manifesto = os.path.join(diretorio_saida, nome_manifesto)
+    manifesto = carregar_manifesto(caminho_manifesto)
+    participantes = manifesto.setdefault("participantes", {})
+    contagem = {"gravados": 0, "inalterados": 0, "removidos": 0}
+    atuais = {}
+    if user_ids is not None:
+        user_ids = {str(user_id) for user_id in user_ids}
+
+    for questionario, tabela in tabelas.items():
+        posicoes = {}
+        for posicao, user_id in enumerate(tabela.user_ids.tolist()):
+            user_id = str(user_id)
+            if user_ids is not None and user_id not in user_ids:
+                continue
+            if politica != "primeira" or user_id not in posicoes:
+                posicoes[user_id] = posicao
+
+        hashes = tabela.selecionar(list(posicoes.values())).hashes_linhas() if posicoes else []
+        for (user_id, posicao), conteudo_hash in zip(posicoes.items(), hashes):
+            if not _nome_arquivo_valido(user_id):
+                logger.warning(f"user_id inválido para nome de arquivo, ignorado: {user_id!r}")
+                continue
+
+            atuais.setdefault(user_id, {})[questionario] = conteudo_hash
+
+            caminho_arquivo = os.path.join(diretorio_saida, f"{user_id}_{questionario}.json")
+            if participantes.get(user_id, {}).get(questionario) == conteudo_hash \
+                    and os.path.exists(caminho_arquivo):
+                contagem["inalterados"] += 1
+                continue
+
+            def gravar(caminho, registro=tabela[posicao]):
+                with open(caminho, 'w', encoding='utf-8') as f:
+                    f.write(json.dumps(registro.como_dict(), indent=2, ensure_ascii=False, default=str))
+
+            _gravar_atomico(caminho_arquivo, gravar)
+            contagem["gravados"] += 1
+
+    if user_ids is None:
+        for user_id, arquivos in participantes.items():
+            for questionario in arquivos:
+                if questionario in atuais.get(user_id, {}):
+                    continue
+                caminho_arquivo = os.path.join(diretorio_saida, f"{user_id}_{questionario}.json")
+                if os.path.exists(caminho_arquivo):
+                    os.remove(caminho_arquivo)
+                contagem["removidos"] += 1
+        participantes.clear()
+    for user_id, arquivos in atuais.items():
+        participantes.setdefault(user_id, {}).update(arquivos)
+    # Sem arquivos gravados ou removidos, o manifesto salvo continua igual
+    if not contagem["gravados"] and not contagem["removidos"] and os.path.exists(caminho_manifesto):
+        return contagem
+
+    def gravar_manifesto(caminho):
+        with open(caminho, 'w', encoding='utf-8') as f:
+            json.dump(manifesto, f, indent=2, ensure_ascii=False)
+
+    _gravar_atomico(caminho_manifesto, gravar_manifesto)
+    return contagem
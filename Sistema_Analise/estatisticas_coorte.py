@@ -0,0 +1,297 @@
+"""
+Estatísticas da coorte calculadas sobre as tabelas de resultados
+
+As estatísticas são guardadas como agregados parciais somáveis
+(contagens): histograma das pontuações, contagem de níveis, fases e
+sintomas, e a tabela cruzada nível de estresse x fase da menopausa. Médias,
+desvios, quantis e prevalências são derivados dessas contagens, então uma
+execução incremental só precisa somar a parte dos participantes novos e
+subtrair a que eles tinham antes, sem reler a coorte inteira.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+# Quantis publicados no resumo das pontuações
+QUANTIS = (0.1, 0.25, 0.5, 0.75, 0.9)
+
+
+def _contar_codigos(codigos: np.ndarray, nomes: np.ndarray) -> Dict[str, int]:
+    """
+    Conta os códigos de uma coluna categórica
+
+    Args:
+        codigos: Código de cada participante
+        nomes: Nome de cada código
+
+    Returns:
+        Dicionário {nome: contagem} sem categorias vazias
+    """
+    contagens = np.bincount(codigos, minlength=len(nomes)) if len(codigos) else np.zeros(len(nomes), dtype=int)
+    return {str(nome): int(contagem) for nome, contagem in zip(nomes.tolist(), contagens.tolist()) if contagem}
+
+
+def _zero_como(valor):
+    """
+    Contagem vazia com a mesma forma de ``valor``
+
+    Args:
+        valor: Contagem de referência (inteiro, lista ou dicionário)
+
+    Returns:
+        0, lista de zeros ou dicionário vazio (listas de textos são copiadas)
+    """
+    if isinstance(valor, dict):
+        return {}
+    if isinstance(valor, list):
+        return list(valor) if valor and isinstance(valor[0], str) else [0] * len(valor)
+    return 0
+
+
+def _somar_contagens(atual, parcela, sinal: int):
+    """
+    Soma (ou subtrai) contagens aninhadas em dicionários e listas
+
+    Entradas que chegam a zero são removidas dos dicionários; listas de
+    textos (os rótulos das perguntas) precisam ser iguais nas duas partes,
+    a menos que uma delas esteja vazia (tabela sem participantes).
+
+    Args:
+        atual: Contagens acumuladas
+        parcela: Contagens a somar
+        sinal: 1 para somar, -1 para subtrair
+
+    Returns:
+        Novas contagens
+
+    Raises:
+        ValueError: Se as partes tiverem perguntas diferentes
+    """
+    if isinstance(atual, dict):
+        resultado = dict(atual)
+        for chave, valor in parcela.items():
+            resultado[chave] = _somar_contagens(resultado.get(chave, _zero_como(valor)), valor, sinal)
+        return {chave: valor for chave, valor in resultado.items() if valor != 0 and valor != {}}
+    if isinstance(atual, list):
+        if not parcela:
+            return atual
+        if not atual:
+            atual = _zero_como(parcela)
+        if len(atual) != len(parcela) or (atual and isinstance(atual[0], str) and atual != parcela):
+            raise ValueError("Não é possível juntar estatísticas de perguntas diferentes")
+        return atual if atual and isinstance(atual[0], str) else \
+            [a + sinal * b for a, b in zip(atual, parcela)]
+    return atual + sinal * parcela
+
+
+def _resumo_pontuacoes(histograma: Dict[str, int]) -> Dict:
+    """
+    Média, desvio padrão, extremos e quantis a partir do histograma
+
+    Os quantis usam interpolação linear, com os mesmos valores de
+    ``np.quantile`` sobre as pontuações individuais.
+
+    Args:
+        histograma: Dicionário {pontuação: participantes}
+
+    Returns:
+        Resumo da distribuição (vazio sem participantes)
+    """
+    if not histograma:
+        return {}
+    valores = np.array(sorted(int(pontuacao) for pontuacao in histograma), dtype=np.int64)
+    contagens = np.array([histograma[str(valor)] for valor in valores.tolist()], dtype=np.int64)
+    total = int(contagens.sum())
+    media = float((valores * contagens).sum() / total)
+    variancia = float((contagens * (valores - media) ** 2).sum() / total)
+
+    acumulado = np.cumsum(contagens)
+    posicoes = (total - 1) * np.array(QUANTIS)
+    abaixo = valores[np.searchsorted(acumulado, np.floor(posicoes), side="right")]
+    acima = valores[np.searchsorted(acumulado, np.ceil(posicoes), side="right")]
+    quantis = abaixo + (posicoes - np.floor(posicoes)) * (acima - abaixo)
+
+    return {
+        "media": round(media, 4),
+        "desvio_padrao": round(variancia ** 0.5, 4),
+        "minimo": int(valores[0]),
+        "maximo": int(valores[-1]),
+        "quantis": {f"p{round(quantil * 100)}": round(float(valor), 4)
+                    for quantil, valor in zip(QUANTIS, quantis)},
+        "distribuicao": {str(valor): int(contagem) for valor, contagem in zip(valores.tolist(), contagens.tolist())}
+    }
+
+
+def _proporcoes(contagens: Dict[str, int], total: int) -> Dict[str, Dict]:
+    """
+    Acrescenta a proporção sobre o total a cada contagem
+
+    Args:
+        contagens: Dicionário {categoria: participantes}
+        total: Total de participantes
+
+    Returns:
+        Dicionário {categoria: {"participantes", "proporcao"}}
+    """
+    return {categoria: {"participantes": contagem,
+                        "proporcao": round(contagem / total, 4) if total else None}
+            for categoria, contagem in contagens.items()}
+
+
+class EstatisticasCoorte:
+    """
+    Agregados parciais da coorte e o resumo derivado deles
+    """
+
+    def __init__(self, parciais: Optional[Dict] = None, politica_duplicatas: str = "ultima"):
+        """
+        Args:
+            parciais: Contagens {"questionarios": {...}, "cruzamento_nivel_fase": {...}}
+            politica_duplicatas: Política usada nos resultados que geraram as contagens
+        """
+        self.parciais = parciais or {}
+        self.politica_duplicatas = politica_duplicatas
+
+    @classmethod
+    def de_resultados(cls, resultados: Dict, politica_duplicatas: str = "ultima") -> "EstatisticasCoorte":
+        """
+        Calcula as contagens direto dos vetores das tabelas de resultados
+
+        Args:
+            resultados: Tabelas por questionário e ``"combinados"``
+            politica_duplicatas: Política usada na combinação
+
+        Returns:
+            Estatísticas das tabelas
+        """
+        questionarios = {}
+        for questionario, tabela in resultados.items():
+            # Tabelas vazias (questionário ausente) não entram nas contagens
+            if questionario == "combinados" or not hasattr(tabela, "user_ids") or not len(tabela):
+                continue
+            parcial = {"participantes": len(tabela)}
+            if getattr(tabela, "pontuado", hasattr(tabela, "pontuacao_total")):
+                valores, contagens = np.unique(tabela.pontuacao_total, return_counts=True)
+                parcial["pontuacoes"] = {str(valor): int(contagem)
+                                         for valor, contagem in zip(valores.tolist(), contagens.tolist())}
+                parcial["niveis"] = _contar_codigos(tabela.codigos_nivel, tabela.niveis)
+            if hasattr(tabela, "sintomas"):
+                parcial["perguntas"] = list(tabela.perguntas)
+                parcial["sintomas"] = tabela.sintomas.sum(axis=0, dtype=np.int64).tolist()
+                parcial["fases"] = _contar_codigos(tabela.codigos_fase, tabela.fases)
+            questionarios[questionario] = parcial
+
+        cruzamento = {}
+        combinados = resultados.get("combinados")
+        if combinados is not None and len(combinados):
+            estresse, menacme = combinados.estresse, combinados.menacme
+            codigos = estresse.codigos_nivel[combinados.posicoes_estresse].astype(np.int64) * len(menacme.fases) \
+                + menacme.codigos_fase[combinados.posicoes_menacme]
+            contagens = np.bincount(codigos, minlength=len(estresse.niveis) * len(menacme.fases)).reshape(
+                len(estresse.niveis), len(menacme.fases))
+            for i, nivel in enumerate(estresse.niveis.tolist()):
+                linha = {str(fase): int(contagem)
+                         for fase, contagem in zip(menacme.fases.tolist(), contagens[i].tolist()) if contagem}
+                if linha:
+                    cruzamento[str(nivel)] = linha
+
+        # Mesma forma das contagens somadas (sem entradas zeradas)
+        parciais = _somar_contagens({}, {"questionarios": questionarios, "cruzamento_nivel_fase": cruzamento}, 1)
+        return cls(parciais, politica_duplicatas)
+
+    def somar(self, outra: "EstatisticasCoorte", sinal: int = 1) -> "EstatisticasCoorte":
+        """
+        Junta as contagens de outra parte da coorte
+
+        Args:
+            outra: Estatísticas a somar
+            sinal: 1 para somar, -1 para retirar participantes
+
+        Returns:
+            Novas estatísticas
+        """
+        return EstatisticasCoorte(_somar_contagens(self.parciais, outra.parciais, sinal),
+                                  self.politica_duplicatas)
+
+    def confere_com(self, resultados: Dict, politica_duplicatas: str) -> bool:
+        """
+        Indica se as contagens correspondem às tabelas informadas
+
+        Args:
+            resultados: Tabelas por questionário
+            politica_duplicatas: Política em uso
+
+        Returns:
+            True se a política e a quantidade de participantes coincidem
+        """
+        questionarios = self.parciais.get("questionarios", {})
+        return politica_duplicatas == self.politica_duplicatas and all(
+            questionarios.get(questionario, {}).get("participantes", 0) == len(tabela)
+            for questionario, tabela in resultados.items() if questionario != "combinados")
+
+    def resumo(self) -> Dict:
+        """
+        Resumo legível derivado das contagens
+
+        Returns:
+            Dicionário serializável em JSON
+        """
+        questionarios = {}
+        for questionario, parcial in self.parciais.get("questionarios", {}).items():
+            total = parcial.get("participantes", 0)
+            resumo = {"participantes": total}
+            # Contagens zeradas são removidas ao somar; tabelas vazias ficam sem elas
+            if "pontuacoes" in parcial or "niveis" in parcial:
+                resumo["pontuacao"] = _resumo_pontuacoes(parcial.get("pontuacoes", {}))
+                resumo["niveis"] = _proporcoes(parcial.get("niveis", {}), total)
+            if "sintomas" in parcial or "fases" in parcial:
+                resumo["fases"] = _proporcoes(parcial.get("fases", {}), total)
+                resumo["prevalencia_sintomas"] = _proporcoes(
+                    dict(zip(parcial.get("perguntas", []), parcial.get("sintomas", []))), total)
+            questionarios[questionario] = resumo
+
+        return {
+            "questionarios": questionarios,
+            "cruzamento_nivel_fase": self.parciais.get("cruzamento_nivel_fase", {})
+        }
+
+    def salvar(self, caminho_arquivo: str):
+        """
+        Grava o resumo e as contagens em JSON, de forma atômica
+
+        Args:
+            caminho_arquivo: Caminho do arquivo (ex.: resultados/estatisticas.json)
+        """
+        os.makedirs(os.path.dirname(caminho_arquivo) or ".", exist_ok=True)
+        caminho_temporario = f"{caminho_arquivo}.tmp"
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump({"resumo": self.resumo(), "politica_duplicatas": self.politica_duplicatas,
+                       "parciais": self.parciais}, f, indent=2, ensure_ascii=False)
+        os.replace(caminho_temporario, caminho_arquivo)
+
+    @classmethod
+    def carregar(cls, caminho_arquivo: str) -> Optional["EstatisticasCoorte"]:
+        """
+        Carrega as contagens gravadas por ``salvar``
+
+        Args:
+            caminho_arquivo: Caminho do arquivo
+
+        Returns:
+            Estatísticas, ou None se o arquivo não existir ou for inválido
+        """
+        if not os.path.exists(caminho_arquivo):
+            return None
+        try:
+            with open(caminho_arquivo, 'r', encoding='utf-8') as f:
+                dados = json.load(f)
+            return cls(dados["parciais"], dados.get("politica_duplicatas", "ultima"))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Estatísticas inválidas em {caminho_arquivo}, recalculando: {e}")
+            return None
@@ -1,20 +1,85 @@
-from processador_questionarios import ProcessadorQuestionarios
-from jinja2 import Template
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
 import os
 from datetime import datetime
+import functools
+import hashlib
 import json
-from typing import Dict, List
+from concurrent.futures import ProcessPoolExecutor
+from typing import TYPE_CHECKING, Callable, Dict, Iterator, List, Optional, Set, Tuple
 import logging
 
+if TYPE_CHECKING:
+    # Só para as anotações; o processador (e o pandas) é carregado por quem o cria
+    from processador_questionarios import ProcessadorQuestionarios
+    from resultados_compactos import RegistroCombinado
+
 logger = logging.getLogger(__name__)
 
+# Campos do resultado combinado, de estresse e de menacme usados pelos templates
+CHAVES_CONTEXTO = (
+    ("id_combinado", "user_id", "timestamp", "estresse", "menacme"),
+    ("user_id", "nivel_estresse", "pontuacao_total"),
+    ("user_id", "fase_menopausa", "sintomas_identificados"),
+)
+
+# Templates em <diretorios.templates>/<nome>.md
+TEMPLATES = ("estresse_baixo", "estresse_moderado", "estresse_alto", "estresse_muito_alto",
+             "menacme_template", "diagnostico_combinado")
+
+
+def criar_ambiente_templates(diretorio_templates: str, diretorio_cache: Optional[str] = None) -> Environment:
+    """
+    Cria o ambiente Jinja dos templates de diagnóstico
+
+    Com ``diretorio_cache``, o bytecode compilado de cada template fica em
+    disco e novas execuções (ou a API) carregam o template sem recompilar
+    enquanto o arquivo não mudar.
+
+    Args:
+        diretorio_templates: Diretório com os arquivos ``.md``
+        diretorio_cache: Diretório do bytecode compilado (None desativa)
+
+    Returns:
+        Ambiente Jinja
+    """
+    cache_bytecode = None
+    if diretorio_cache:
+        os.makedirs(diretorio_cache, exist_ok=True)
+        cache_bytecode = FileSystemBytecodeCache(diretorio_cache)
+    return Environment(loader=FileSystemLoader(diretorio_templates), bytecode_cache=cache_bytecode,
+                       auto_reload=False)
+
+
+def formatar_data_diagnostico(timestamp) -> str:
+    """
+    Data exibida no relatório, tirada do envio mais recente do participante
+
+    Usar a data dos dados (e não a hora da execução) mantém o relatório
+    idêntico entre execuções enquanto as respostas não mudam.
+
+    Args:
+        timestamp: Timestamp do resultado combinado (datetime ou texto ISO)
+
+    Returns:
+        Data no formato "dd/mm/aaaa às hh:mm"
+    """
+    if isinstance(timestamp, str):
+        try:
+            timestamp = datetime.fromisoformat(timestamp)
+        except ValueError:
+            return timestamp
+    try:
+        return timestamp.strftime("%d/%m/%Y às %H:%M")
+    except (AttributeError, ValueError):
+        return "data não informada"
+
 
 class GeradorDiagnosticos:
     """
     Classe para gerar diagnósticos personalizados baseados nos resultados dos questionários
     """
 
-    def __init__(self, processador: ProcessadorQuestionarios):
+    def __init__(self, processador: "ProcessadorQuestionarios"):
         """
         Inicializa o gerador de diagnósticos
 
@@ -22,186 +87,81 @@ class GeradorDiagnosticos:
             processador: Instância do ProcessadorQuestionarios
         """
         self.processador = processador
+        self._versao_templates = None
+        self.ambiente = criar_ambiente_templates(
+            self.diretorio_templates(), self.diretorio_cache_templates())
         self.templates = self.carregar_templates()
+        self.fragmentos = self.criar_cache_fragmentos()
 
-    def carregar_templates(self) -> Dict[str, str]:
+    def diretorio_templates(self) -> str:
         """
-        Carrega templates de diagnósticos
+        Diretório dos templates (``diretorios.templates`` no config.json)
+
+        Caminhos relativos partem da pasta deste módulo, para que a API e os
+        scripts encontrem os mesmos arquivos de qualquer diretório.
 
         Returns:
-            Dicionário com templates de diagnósticos
+            Caminho do diretório
         """
-        return {
-            "estresse_baixo": """
-## 🟢 Diagnóstico de Estresse: BAIXO
-
-Parabéns! Seus níveis de estresse estão em uma faixa saudável. 
-
-**Sua pontuação:** {{pontuacao}}/120 pontos
-
-### ✅ Pontos Positivos:
-- Você demonstra bom controle emocional
-- Capacidade adequada de lidar com pressões do dia a dia
-- Baixo risco de desenvolver problemas relacionados ao estresse
-
-### 💡 Recomendações para Manter:
-- Continue praticando atividades relaxantes
-- Mantenha uma rotina de exercícios regulares
-- Preserve seus momentos de lazer e descanso
-- Pratique técnicas de respiração quando necessário
-
-### 📞 Quando Procurar Ajuda:
-Se você notar mudanças significativas em seu bem-estar emocional.
-            """,
-
-            "estresse_moderado": """
-## 🟡 Diagnóstico de Estresse: MODERADO
-
-Seus níveis de estresse estão em uma faixa que merece atenção.
-
-**Sua pontuação:** {{pontuacao}}/120 pontos
-
-### ⚠️ Sinais Identificados:
-- Presença de alguns sintomas de estresse
-- Possível impacto no bem-estar diário
-- Necessidade de estratégias de manejo
-
-### 💡 Recomendações:
-- **Exercícios físicos:** 30 minutos, 3x por semana
-- **Técnicas de relaxamento:** meditação, yoga ou respiração profunda
-- **Organização do tempo:** estabeleça prioridades e prazos realistas
-- **Sono adequado:** 7-8 horas por noite
-- **Alimentação equilibrada:** evite excesso de cafeína e açúcar
-
-### 📞 Quando Procurar Ajuda:
-Se os sintomas piorarem ou interferirem significativamente em suas atividades.
-            """,
-
-            "estresse_alto": """
-## 🟠 Diagnóstico de Estresse: ALTO
-
-ATENÇÃO: Seus níveis de estresse estão elevados e requerem intervenção.
-
-**Sua pontuação:** {{pontuacao}}/120 pontos
-
-### 🚨 Sinais de Alerta:
-- Múltiplos sintomas de estresse presentes
-- Provável impacto significativo na qualidade de vida
-- Risco aumentado para problemas de saúde
-
-### 🎯 Ações Urgentes Recomendadas:
-- **Consulte um profissional:** psicólogo ou médico
-- **Reavalie sua rotina:** identifique principais fontes de estresse
-- **Técnicas de manejo imediato:** respiração profunda, caminhadas
-- **Apoio social:** converse com pessoas de confiança
-- **Limite compromissos:** priorize o que é realmente essencial
-
-### 📋 Estratégias Específicas:
-- Mindfulness e meditação diária (15-20 min)
-- Exercícios físicos regulares (consulte médico antes)
-- Evite álcool e substâncias como automedicação
-- Estabeleça limites claros entre trabalho e vida pessoal
-
-### 📞 Busque Ajuda Profissional IMEDIATAMENTE se:
-- Sentir-se sobrecarregada constantemente
-- Tiver pensamentos negativos persistentes
-- Apresentar sintomas físicos (dores, insônia, problemas digestivos)
-            """,
-
-            "estresse_muito_alto": """
-## 🔴 Diagnóstico de Estresse: MUITO ALTO
-
-⚠️ ALERTA MÁXIMO: Seus níveis de estresse estão em uma faixa crítica.
-
-**Sua pontuação:** {{pontuacao}}/120 pontos
-
-### 🚨 SITUAÇÃO CRÍTICA:
-- Múltiplos sintomas graves de estresse
-- Alto risco para a saúde física e mental
-- Impacto severo na qualidade de vida
-- **NECESSITA INTERVENÇÃO PROFISSIONAL IMEDIATA**
-
-### 🏥 AÇÕES URGENTES:
-1. **PROCURE AJUDA MÉDICA/PSICOLÓGICA HOJE**
-2. **Informe familiares/amigos sobre sua situação**
-3. **Considere afastamento temporário de atividades estressantes**
-4. **Não tome decisões importantes neste momento**
-
-### 🆘 Estratégias de Emergência:
-- **Respiração:** 4 segundos inspirando, 4 segurando, 4 expirando
-- **Hidratação:** beba água regularmente
-- **Contato social:** não se isole
-- **Ambiente calmo:** reduza estímulos (ruído, luz forte)
-
-### 📞 CONTATOS DE EMERGÊNCIA:
-- **CVV:** 188 (24h, gratuito)
-- **SAMU:** 192
-- **Emergência:** 193
-
-### ⚡ Não ignore estes sinais. Sua saúde é prioridade!
-            """,
-
-            "menacme_template": """
-## 🌸 Análise da Fase de Menopausa
-
-**Fase identificada:** {{fase_descricao}}
+        diretorio = self.processador.config.get("diretorios", {}).get("templates", "templates")
+        return os.path.join(os.path.dirname(os.path.abspath(__file__)), diretorio)
 
-### 📊 Sintomas Identificados:
-{{sintomas_lista}}
-
-### 💡 Informações sobre sua fase:
-{{informacoes_fase}}
-
-### 🌿 Recomendações Específicas:
-{{recomendacoes_fase}}
-
-### 🏥 Acompanhamento Médico:
-É importante manter consultas regulares com ginecologista para monitoramento adequado desta fase da vida.
-            """,
-
-            "diagnostico_combinado": """
-# 📋 Relatório Diagnóstico Personalizado
-
-**Data:** {{data_diagnostico}}
-**ID do Participante:** {{id_participante}}
-
----
-
-{{diagnostico_estresse}}
-
----
-
-{{diagnostico_menacme}}
-
----
-
-## 🔗 Análise Integrada
-
-{{analise_integrada}}
+    def diretorio_cache_templates(self) -> Optional[str]:
+        """
+        Diretório do bytecode compilado conforme ``configuracoes_gerais.cache_templates``
 
----
+        Returns:
+            Caminho do diretório, ou None se o cache estiver desativado
+        """
+        config_cache = self.processador.config.get(
+            "configuracoes_gerais", {}).get("cache_templates", {})
+        if not config_cache.get("ativo", True):
+            return None
+        diretorio_saida = self.processador.config.get("diretorios", {}).get("saida", "resultados")
+        return config_cache.get("diretorio", os.path.join(diretorio_saida, ".cache", "templates"))
+
+    def carregar_templates(self) -> Dict[str, Template]:
+        """
+        Carrega e compila os templates de diagnósticos, uma única vez
 
-## 📞 Recursos de Apoio
+        Returns:
+            Dicionário com templates de diagnósticos compilados
+        """
+        return {nome: self.ambiente.get_template(f"{nome}.md") for nome in TEMPLATES}
 
-### 🏥 Profissionais Recomendados:
-- **Psicólogo:** para manejo do estresse e bem-estar emocional
-- **Ginecologista:** para acompanhamento da saúde feminina
-- **Endocrinologista:** se necessário para questões hormonais
+    def criar_cache_fragmentos(self) -> Dict[str, Callable[..., str]]:
+        """
+        Memoriza as seções do diagnóstico pelos valores de que dependem
 
-### 📚 Recursos Adicionais:
-- **Grupos de apoio:** busque grupos de mulheres na sua região
-- **Apps de meditação:** Headspace, Calm, Lojong
-- **Atividades físicas:** yoga, pilates, caminhada
+        A seção de estresse depende só de (nível, pontuação), a de menacme
+        de (fase, sintomas) e a análise integrada de (nível, fase), então a
+        mesma seção se repete entre muitos participantes. O tamanho de cada
+        cache vem de ``configuracoes_gerais.cache_fragmentos_diagnostico``
+        (0 desativa).
 
-### 🆘 Em caso de emergência:
-- **CVV:** 188 (24h, gratuito)
-- **SAMU:** 192
+        Returns:
+            Dicionário {seção: função memorizada}
+        """
+        tamanho_maximo = int(self.processador.config.get("configuracoes_gerais", {}).get(
+            "cache_fragmentos_diagnostico", {}).get("tamanho_maximo", 4096))
+        return {
+            "estresse": functools.lru_cache(maxsize=tamanho_maximo)(self.renderizar_secao_estresse),
+            "menacme": functools.lru_cache(maxsize=tamanho_maximo)(self.renderizar_secao_menacme),
+            "analise_integrada": functools.lru_cache(maxsize=tamanho_maximo)(self.renderizar_analise_integrada)
+        }
 
----
+    def estatisticas_fragmentos(self) -> Dict[str, Dict[str, int]]:
+        """
+        Acertos e falhas do cache de cada seção neste processo
 
-*Este relatório foi gerado automaticamente baseado em suas respostas. Não substitui consulta médica profissional.*
-            """
-        }
+        Returns:
+            Dicionário {seção: {"acertos", "falhas", "tamanho"}}
+        """
+        estatisticas = {}
+        for secao, funcao in self.fragmentos.items():
+            info = funcao.cache_info()
+            estatisticas[secao] = {"acertos": info.hits, "falhas": info.misses, "tamanho": info.currsize}
+        return estatisticas
 
     def gerar_diagnostico_estresse(self, resultado_estresse: Dict) -> str:
         """
@@ -213,14 +173,25 @@ ATENÇÃO: Seus níveis de estresse estão elevados e requerem intervenção.
         Returns:
             Diagnóstico formatado
         """
-        nivel = resultado_estresse["nivel_estresse"]
-        pontuacao = resultado_estresse["pontuacao_total"]
+        return self.fragmentos["estresse"](
+            resultado_estresse["nivel_estresse"], int(resultado_estresse["pontuacao_total"]))
+
+    def renderizar_secao_estresse(self, nivel: str, pontuacao: int) -> str:
+        """
+        Renderiza a seção de estresse (sem cache)
+
+        Args:
+            nivel: Nível de estresse
+            pontuacao: Pontuação total
 
+        Returns:
+            Seção formatada
+        """
         template_key = f"estresse_{nivel}"
         if template_key not in self.templates:
             template_key = "estresse_moderado"  # fallback
 
-        template = Template(self.templates[template_key])
+        template = self.templates[template_key]
         return template.render(pontuacao=pontuacao)
 
     def gerar_diagnostico_menacme(self, resultado_menacme: Dict) -> str:
@@ -233,9 +204,20 @@ ATENÇÃO: Seus níveis de estresse estão elevados e requerem intervenção.
         Returns:
             Diagnóstico formatado
         """
-        fase = resultado_menacme["fase_menopausa"]
-        sintomas = resultado_menacme["sintomas_identificados"]
+        return self.fragmentos["menacme"](
+            resultado_menacme["fase_menopausa"], tuple(resultado_menacme["sintomas_identificados"]))
+
+    def renderizar_secao_menacme(self, fase: str, sintomas: Tuple[str, ...]) -> str:
+        """
+        Renderiza a seção de menacme (sem cache)
+
+        Args:
+            fase: Fase da menopausa
+            sintomas: Sintomas identificados, na ordem das perguntas
 
+        Returns:
+            Seção formatada
+        """
         # Descrições das fases
         fases_descricao = {
             "pre_menopausa": "Pré-menopausa - Fase reprodutiva",
@@ -292,7 +274,7 @@ O foco agora é manter a saúde óssea, cardiovascular e o bem-estar geral.
         else:
             sintomas_lista = "- Nenhum sintoma específico identificado"
 
-        template = Template(self.templates["menacme_template"])
+        template = self.templates["menacme_template"]
         return template.render(
             fase_descricao=fases_descricao.get(fase, "Fase não identificada"),
             sintomas_lista=sintomas_lista,
@@ -310,9 +292,20 @@ O foco agora é manter a saúde óssea, cardiovascular e o bem-estar geral.
         Returns:
             Análise integrada
         """
-        nivel_estresse = resultado_combinado["estresse"]["nivel"]
-        fase_menacme = resultado_combinado["menacme"]["fase"]
+        return self.fragmentos["analise_integrada"](
+            resultado_combinado["estresse"]["nivel"], resultado_combinado["menacme"]["fase"])
+
+    def renderizar_analise_integrada(self, nivel_estresse: str, fase_menacme: str) -> str:
+        """
+        Escolhe o texto da análise integrada (sem cache)
+
+        Args:
+            nivel_estresse: Nível de estresse
+            fase_menacme: Fase da menopausa
 
+        Returns:
+            Análise integrada
+        """
         # Análises específicas por combinação
         if nivel_estresse in ["alto", "muito_alto"] and fase_menacme in ["perimenopausa", "pos_menopausa"]:
             return """
@@ -354,35 +347,36 @@ Uma abordagem que considere ambos os fatores será mais eficaz.
 - Monitore como mudanças em uma área afetam a outra
             """
 
-    def gerar_diagnostico_completo(self, resultado_combinado: Dict) -> str:
+    def contexto_diagnostico(self, resultado_combinado: "RegistroCombinado") -> Tuple[Dict, Dict, Dict]:
         """
-        Gera diagnóstico completo combinando estresse e menacme
+        Resultados individuais de um participante combinado
+
+        Usa o par de envios escolhido na combinação (``politica_duplicatas``),
+        e não uma nova busca por user_id: com envios repetidos, o relatório
+        mostra exatamente as respostas que geraram o resultado combinado.
 
         Args:
             resultado_combinado: Resultado combinado dos questionários
 
         Returns:
-            Diagnóstico completo formatado
+            Tupla (resultado combinado, resultado de estresse, resultado de menacme)
         """
-        # Buscar resultados individuais
-        user_id = resultado_combinado["user_id"]
-        resultado_estresse = None
-        resultado_menacme = None
+        return (resultado_combinado, resultado_combinado.registro_estresse,
+                resultado_combinado.registro_menacme)
 
-        for est in self.processador.resultados["estresse"]:
-            if est["user_id"] == user_id:
-                resultado_estresse = est
-                break
-
-        for men in self.processador.resultados["menacme"]:
-            if men["user_id"] == user_id:
-                resultado_menacme = men
-                break
+    def montar_diagnostico(self, resultado_combinado: Dict, resultado_estresse: Dict,
+                           resultado_menacme: Dict) -> str:
+        """
+        Renderiza o diagnóstico completo a partir dos resultados já localizados
 
-        if not resultado_estresse or not resultado_menacme:
-            raise ValueError(
-                f"Não foi possível encontrar resultados completos para {user_id}")
+        Args:
+            resultado_combinado: Resultado combinado dos questionários
+            resultado_estresse: Resultado do questionário de estresse
+            resultado_menacme: Resultado do questionário de menacme
 
+        Returns:
+            Diagnóstico completo formatado
+        """
         # Gerar diagnósticos individuais
         diagnostico_estresse = self.gerar_diagnostico_estresse(
             resultado_estresse)
@@ -390,69 +384,333 @@ Uma abordagem que considere ambos os fatores será mais eficaz.
         analise_integrada = self.gerar_analise_integrada(resultado_combinado)
 
         # Gerar diagnóstico completo
-        template = Template(self.templates["diagnostico_combinado"])
+        template = self.templates["diagnostico_combinado"]
         return template.render(
-            data_diagnostico=datetime.now().strftime("%d/%m/%Y às %H:%M"),
+            data_diagnostico=formatar_data_diagnostico(resultado_combinado["timestamp"]),
             id_participante=resultado_combinado["id_combinado"],
             diagnostico_estresse=diagnostico_estresse,
             diagnostico_menacme=diagnostico_menacme,
             analise_integrada=analise_integrada
         )
 
-    def gerar_todos_diagnosticos(self, diretorio_saida: str = "diagnosticos"):
+    def gerar_diagnostico_completo(self, resultado_combinado: "RegistroCombinado") -> str:
         """
-        Gera diagnósticos para todos os participantes
+        Gera diagnóstico completo combinando estresse e menacme
 
         Args:
-            diretorio_saida: Diretório para salvar os diagnósticos
+            resultado_combinado: Resultado combinado dos questionários
+
+        Returns:
+            Diagnóstico completo formatado
         """
-        os.makedirs(diretorio_saida, exist_ok=True)
+        return self.montar_diagnostico(*self.contexto_diagnostico(resultado_combinado))
 
-        diagnosticos_gerados = []
+    def renderizar_contextos(self, contextos: List) -> List[Tuple[Optional[str], Optional[str]]]:
+        """
+        Renderiza um lote de diagnósticos sem interromper o lote em caso de erro
 
-        # Gerar diagnósticos combinados
-        for resultado_combinado in self.processador.resultados["combinados"]:
+        Args:
+            contextos: Tuplas de ``contexto_diagnostico``
+
+        Returns:
+            Lista de (diagnóstico, None) ou (None, mensagem de erro), na mesma ordem
+        """
+        renderizados = []
+        for contexto in contextos:
             try:
-                diagnostico = self.gerar_diagnostico_completo(
-                    resultado_combinado)
+                renderizados.append((self.montar_diagnostico(*contexto), None))
+            except Exception as e:
+                renderizados.append((None, str(e)))
+        return renderizados
+
+    def preparar_contextos(self, combinados: List) -> List:
+        """
+        Reduz os resultados individuais de um lote de participantes
+
+        Só os campos usados pelos templates (``CHAVES_CONTEXTO``) são
+        copiados, em dicionários simples: é o que vai para os processos do
+        pool e o que entra no hash do manifesto.
+
+        Args:
+            combinados: Resultados combinados do lote
+
+        Returns:
+            Lista de contextos para ``renderizar_contextos``
+        """
+        return [tuple({chave: resultado[chave] for chave in chaves}
+                      for resultado, chaves in zip(self.contexto_diagnostico(resultado_combinado), CHAVES_CONTEXTO))
+                for resultado_combinado in combinados]
+
+    def versao_templates(self) -> str:
+        """
+        Hash dos templates e deste módulo (que guarda os textos por fase)
+
+        Qualquer mudança nos textos dos diagnósticos muda a versão e faz
+        todos os diagnósticos serem gerados de novo.
+
+        Returns:
+            sha256 em hexadecimal
+        """
+        if self._versao_templates is None:
+            conteudo = hashlib.sha256()
+            for nome in TEMPLATES:
+                fonte, _, _ = self.ambiente.loader.get_source(self.ambiente, f"{nome}.md")
+                conteudo.update(fonte.encode('utf-8'))
+            with open(os.path.abspath(__file__), 'rb') as f:
+                conteudo.update(f.read())
+            self._versao_templates = conteudo.hexdigest()
+        return self._versao_templates
+
+    def hash_contexto(self, contexto: Tuple[Dict, Dict, Dict]) -> str:
+        """
+        Hash das entradas de um diagnóstico, junto com a versão dos templates
+
+        Args:
+            contexto: Contexto reduzido de ``preparar_contextos``
+
+        Returns:
+            sha256 em hexadecimal
+        """
+        texto = json.dumps(contexto, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(f"{self.versao_templates()}\n{texto}".encode('utf-8')).hexdigest()
+
+    def obter_configuracao_paralela(self, workers: Optional[int] = None) -> Tuple[int, int, int]:
+        """
+        Lê a configuração de ``configuracoes_gerais.geracao_paralela_diagnosticos``
+
+        Args:
+            workers: Quantidade de processos (substitui a do config.json)
+
+        Returns:
+            Tupla (workers, diagnósticos mínimos para usar o pool, diagnósticos por lote)
+        """
+        config_paralelo = self.processador.config.get(
+            "configuracoes_gerais", {}).get("geracao_paralela_diagnosticos", {})
+        workers = workers or config_paralelo.get("workers") or os.cpu_count() or 1
+        return (max(1, int(workers)), int(config_paralelo.get("diagnosticos_minimos_paralelo", 2000)),
+                max(1, int(config_paralelo.get("tamanho_lote", 500))))
+
+    def renderizar_lotes(self, contextos: List, workers: int, tamanho_lote: int) -> Iterator[List]:
+        """
+        Renderiza os diagnósticos lote a lote, na ordem dos contextos
 
-                # Salvar arquivo individual
-                nome_arquivo = f"diagnostico_{resultado_combinado['user_id']}.md"
-                caminho_arquivo = os.path.join(diretorio_saida, nome_arquivo)
+        Com mais de um worker, os lotes são renderizados em um pool de
+        processos; cada processo compila os templates uma vez ao iniciar.
 
-                with open(caminho_arquivo, 'w', encoding='utf-8') as f:
+        Args:
+            contextos: Contextos de ``preparar_contextos``
+            workers: Quantidade de processos (1 renderiza no próprio processo)
+            tamanho_lote: Diagnósticos por lote
+
+        Yields:
+            Lista de (diagnóstico, erro) de cada lote, na ordem original
+        """
+        lotes = [contextos[inicio:inicio + tamanho_lote]
+                 for inicio in range(0, len(contextos), tamanho_lote)]
+        if workers <= 1:
+            for lote in lotes:
+                yield self.renderizar_contextos(lote)
+            return
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_iniciar_worker_diagnosticos,
+                                 initargs=(self.processador.config,)) as executor:
+            # map devolve os lotes na ordem de envio, mesmo que terminem fora de ordem
+            yield from executor.map(_renderizar_lote, lotes)
+
+    def gravar_lote(self, diretorio_saida: str, user_ids: List[str],
+                    renderizados: List[Tuple[Optional[str], Optional[str]]]) -> List[Optional[str]]:
+        """
+        Grava os arquivos de um lote renderizado
+
+        Args:
+            diretorio_saida: Diretório dos diagnósticos
+            user_ids: Participantes do lote
+            renderizados: Saída de ``renderizar_contextos`` para o lote
+
+        Returns:
+            Mensagem de erro de cada participante (None se o arquivo foi gravado)
+        """
+        erros = []
+        for user_id, (diagnostico, erro) in zip(user_ids, renderizados):
+            if erro is None:
+                with open(os.path.join(diretorio_saida, f"diagnostico_{user_id}.md"), 'w', encoding='utf-8') as f:
                     f.write(diagnostico)
+                logger.debug(f"Diagnóstico gerado para {user_id}")
+            erros.append(erro)
+        return erros
+
+    def gerar_todos_diagnosticos(self, diretorio_saida: str = "diagnosticos", user_ids: Optional[Set[str]] = None,
+                                 workers: Optional[int] = None):
+        """
+        Gera diagnósticos para todos os participantes
+
+        O ``manifesto_diagnosticos.json`` guarda o hash das entradas de cada
+        diagnóstico (com a versão dos templates); participantes cujo hash não
+        mudou e cujo arquivo ainda existe não são renderizados nem regravados.
+        Os demais são renderizados em lotes (em paralelo conforme
+        ``configuracoes_gerais.geracao_paralela_diagnosticos``) e gravados
+        lote a lote; o índice segue sempre a ordem dos resultados combinados.
+        Numa execução completa, os diagnósticos de participantes que saíram
+        do manifesto (não estão mais nos resultados) são removidos.
+
+        Args:
+            diretorio_saida: Diretório para salvar os diagnósticos
+            user_ids: Se informado, gera apenas os diagnósticos destes
+                participantes e mantém as demais entradas do índice existente
+            workers: Quantidade de processos (substitui a do config.json)
+        """
+        from escritores_resultados import carregar_manifesto
 
+        os.makedirs(diretorio_saida, exist_ok=True)
+
+        diagnosticos_gerados = []
+        caminho_indice = os.path.join(
+            diretorio_saida, "indice_diagnosticos.json")
+        if user_ids is not None and os.path.exists(caminho_indice):
+            with open(caminho_indice, 'r', encoding='utf-8') as f:
+                diagnosticos_gerados = [
+                    diag for diag in json.load(f) if diag["user_id"] not in user_ids]
+
+        caminho_manifesto = os.path.join(diretorio_saida, "manifesto_diagnosticos.json")
+        manifesto = carregar_manifesto(caminho_manifesto)
+        anteriores = manifesto.get("participantes", {})
+        atuais = {} if user_ids is None else dict(anteriores)
+
+        # Gerar diagnósticos combinados
+        with self.processador.metricas.medir("diagnostico") as etapa:
+            combinados = [resultado_combinado for resultado_combinado in self.processador.resultados["combinados"]
+                          if user_ids is None or resultado_combinado["user_id"] in user_ids]
+            etapa["linhas"] = len(combinados)
+            contextos = self.preparar_contextos(combinados)
+            erros = [None] * len(contextos)
+
+            pendentes = []
+            inalterados = 0
+            for posicao, (resultado_combinado, contexto) in enumerate(zip(combinados, contextos)):
+                user_id = resultado_combinado["user_id"]
+                atuais[user_id] = self.hash_contexto(contexto)
+                if anteriores.get(user_id) != atuais[user_id] or not os.path.exists(
+                        os.path.join(diretorio_saida, f"diagnostico_{user_id}.md")):
+                    pendentes.append(posicao)
+                else:
+                    inalterados += 1
+
+            workers, minimo_paralelo, tamanho_lote = self.obter_configuracao_paralela(workers)
+            if len(pendentes) < minimo_paralelo:
+                workers = 1
+            inicio = 0
+            for renderizados in self.renderizar_lotes([contextos[posicao] for posicao in pendentes],
+                                                      workers, tamanho_lote):
+                lote = pendentes[inicio:inicio + len(renderizados)]
+                inicio += len(renderizados)
+                for posicao, erro in zip(lote, self.gravar_lote(
+                        diretorio_saida, [combinados[posicao]["user_id"] for posicao in lote], renderizados)):
+                    erros[posicao] = erro
+
+            for resultado_combinado, erro in zip(combinados, erros):
+                user_id = resultado_combinado["user_id"]
+                if erro is not None:
+                    etapa["erros"] += 1
+                    atuais.pop(user_id, None)
+                    logger.error(f"Erro ao gerar diagnóstico para {user_id}: {erro}")
+                    continue
                 diagnosticos_gerados.append({
-                    "user_id": resultado_combinado["user_id"],
-                    "arquivo": nome_arquivo,
+                    "user_id": user_id,
+                    "arquivo": f"diagnostico_{user_id}.md",
                     "timestamp": resultado_combinado["timestamp"]
                 })
 
-                logger.info(
-                    f"Diagnóstico gerado para {resultado_combinado['user_id']}")
-
-            except Exception as e:
-                logger.error(
-                    f"Erro ao gerar diagnóstico para {resultado_combinado['user_id']}: {e}")
+        removidos = 0
+        if user_ids is None:
+            presentes = {resultado_combinado["user_id"] for resultado_combinado in combinados}
+            for user_id in anteriores.keys() - presentes:
+                caminho_arquivo = os.path.join(diretorio_saida, f"diagnostico_{user_id}.md")
+                if os.path.exists(caminho_arquivo):
+                    os.remove(caminho_arquivo)
+                removidos += 1
 
         # Salvar índice de diagnósticos
-        with open(os.path.join(diretorio_saida, "indice_diagnosticos.json"), 'w', encoding='utf-8') as f:
+        with open(caminho_indice, 'w', encoding='utf-8') as f:
             json.dump(diagnosticos_gerados, f, indent=2,
                       ensure_ascii=False, default=str)
 
+        caminho_temporario = f"{caminho_manifesto}.tmp"
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump({"versao_templates": self.versao_templates(), "participantes": atuais},
+                      f, indent=2, ensure_ascii=False)
+        os.replace(caminho_temporario, caminho_manifesto)
+
+        if workers <= 1 and pendentes:
+            fragmentos = ", ".join(f"{secao} {dados['acertos']}/{dados['acertos'] + dados['falhas']}"
+                                   for secao, dados in self.estatisticas_fragmentos().items())
+            logger.info(f"Seções reaproveitadas do cache (acertos/total): {fragmentos}")
+
         print(
-            f"✅ {len(diagnosticos_gerados)} diagnósticos gerados em {diretorio_saida}")
+            f"✅ {len(diagnosticos_gerados)} diagnósticos gerados em {diretorio_saida} "
+            f"({len(pendentes)} renderizados, {inalterados} inalterados, {removidos} removidos)")
         return diagnosticos_gerados
 
 
+# Gerador de cada processo do pool, criado por _iniciar_worker_diagnosticos
+_gerador_worker: Optional[GeradorDiagnosticos] = None
+
+
+def _criar_processador(**kwargs) -> "ProcessadorQuestionarios":
+    """
+    Cria um processador, importado só aqui para que este módulo não carregue o pandas
+
+    Args:
+        **kwargs: Argumentos do ProcessadorQuestionarios
+
+    Returns:
+        Processador de questionários
+    """
+    import processador_questionarios
+
+    return processador_questionarios.ProcessadorQuestionarios(**kwargs)
+
+
+def _iniciar_worker_diagnosticos(config: Dict):
+    """
+    Compila os templates uma vez em cada processo do pool
+
+    Args:
+        config: Configuração do processador que criou o pool
+    """
+    global _gerador_worker
+    _gerador_worker = GeradorDiagnosticos(_criar_processador(config=config, usar_cache=False))
+
+
+def _renderizar_lote(contextos: List) -> List[Tuple[Optional[str], Optional[str]]]:
+    """
+    Renderiza um lote de diagnósticos em um processo do pool
+
+    Args:
+        contextos: Contextos reduzidos de ``preparar_contextos``
+
+    Returns:
+        Lista de (diagnóstico, erro) na ordem do lote
+    """
+    return _gerador_worker.renderizar_contextos(contextos)
+
+
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Gera os diagnósticos dos questionários de dados_entrada")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignora o cache de planilhas já lidas")
+    parser.add_argument("--workers", type=int,
+                        help="processos para renderizar os diagnósticos (padrão: config.json)")
+    args = parser.parse_args()
+
     # Exemplo de uso
-    processador = ProcessadorQuestionarios()
+    processador = _criar_processador(usar_cache=not args.no_cache)
 
     # Processar questionários
     resultados = processador.processar_todos_questionarios("dados_entrada")
 
     # Gerar diagnósticos
     gerador = GeradorDiagnosticos(processador)
-    gerador.gerar_todos_diagnosticos("diagnosticos")
+    gerador.gerar_todos_diagnosticos("diagnosticos", workers=args.workers)
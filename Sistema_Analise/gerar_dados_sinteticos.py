@@ -0,0 +1,269 @@
+"""
+Gerador de exportações sintéticas do Google Forms
+
+Gera os arquivos de entrada com o mesmo leiaute das planilhas reais
+(carimbo de data/hora na primeira coluna, perguntas com o texto do
+formulário e o ID da participante) para medir o desempenho do
+processamento em escala. A geração é vetorizada e reprodutível pela
+semente.
+
+Uso:
+    python gerar_dados_sinteticos.py dados_benchmark/100k --linhas 100000 --formatos xlsx csv parquet
+"""
+
+import argparse
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+# Tamanhos nomeados aceitos em --linhas
+TAMANHOS = {"1k": 1_000, "100k": 100_000, "1m": 1_000_000}
+
+FORMATOS = ("xlsx", "csv", "parquet")
+
+COLUNA_TIMESTAMP = "Carimbo de data/hora"
+COLUNA_USER_ID = "ID da participante"
+
+PERGUNTAS_ESTRESSE = [
+    "Com que frequência você ficou aborrecida por causa de algo que aconteceu inesperadamente?",
+    "Com que frequência você sentiu que foi incapaz de controlar coisas importantes na sua vida?",
+    "Com que frequência você esteve nervosa ou estressada?",
+    "Com que frequência você esteve confiante em sua capacidade de lidar com seus problemas pessoais?",
+    "Com que frequência você sentiu que as coisas aconteceram da maneira que você esperava?",
+    "Com que frequência você achou que não conseguiria lidar com todas as coisas que tinha por fazer?",
+    "Com que frequência você foi capaz de controlar irritações na sua vida?",
+    "Com que frequência você sentiu que todos os aspectos de sua vida estavam sob controle?",
+    "Com que frequência você esteve bastante irritada por coisas que estavam fora do seu controle?",
+    "Com que frequência você sentiu que os problemas acumularam tanto que você não conseguiria resolvê-los?",
+]
+RESPOSTAS_ESTRESSE = ["Nunca", "Quase nunca", "Às vezes", "Quase sempre", "Sempre"]
+
+PERGUNTAS_MENACME = [
+    "Como está o seu ciclo menstrual?",
+    "Você tem ondas de calor (fogachos)?",
+    "Você tem suores noturnos?",
+    "Você tem dificuldade para dormir?",
+    "Você sente alterações de humor?",
+    "Você sente ressecamento vaginal?",
+    "Você sente dores articulares?",
+    "Você sente diminuição da libido?",
+]
+RESPOSTAS_CICLO = ["Regular", "Irregular", "Parou há menos de 12 meses", "Ausente há mais de 12 meses"]
+RESPOSTAS_MENACME = ["Não", "Sim", "Frequente", "Muito frequente", "Intenso", "Severo"]
+
+PERGUNTAS_VULNERABILIDADE = [f"Item {i} da escala de vulnerabilidade ao estresse" for i in range(1, 21)]
+RESPOSTAS_VULNERABILIDADE = ["1", "2", "3", "4", "5"]
+
+PERGUNTAS_SOCIODEMOGRAFICO = {
+    "Faixa etária": ["18 a 29 anos", "30 a 39 anos", "40 a 49 anos", "50 a 59 anos", "60 anos ou mais"],
+    "Escolaridade": ["Fundamental", "Médio", "Superior", "Pós-graduação"],
+    "Estado civil": ["Solteira", "Casada", "União estável", "Divorciada", "Viúva"],
+    "Renda familiar": ["Até 2 salários mínimos", "2 a 5 salários mínimos", "Mais de 5 salários mínimos"],
+}
+
+
+def interpretar_tamanho(texto: str) -> int:
+    """
+    Converte um tamanho ("1k", "100k", "1m" ou um número) em linhas
+
+    Args:
+        texto: Tamanho informado na linha de comando
+
+    Returns:
+        Quantidade de linhas
+    """
+    return TAMANHOS.get(str(texto).lower()) or int(texto)
+
+
+def gerar_identificacao(gerador: np.random.Generator, linhas: int, participantes: int,
+                        taxa_sem_id: float) -> pd.DataFrame:
+    """
+    Gera carimbos de data/hora crescentes e IDs de participantes
+
+    Cada participante responde ao menos uma vez; as linhas restantes são
+    reenvios de participantes sorteadas, e uma fração das linhas fica sem
+    ID, como acontece nas exportações reais.
+
+    Args:
+        gerador: Gerador aleatório
+        linhas: Quantidade de linhas
+        participantes: Quantidade de participantes distintas (no máximo ``linhas``)
+        taxa_sem_id: Fração de linhas sem ID
+
+    Returns:
+        DataFrame com as colunas de timestamp e user_id
+    """
+    intervalos = gerador.exponential(90.0, size=linhas).astype(np.int64) + 1
+    timestamps = pd.Timestamp("2025-03-01 08:00:00") + pd.to_timedelta(np.cumsum(intervalos), unit="s")
+
+    numeros = gerador.permutation(np.concatenate([
+        np.arange(participantes), gerador.integers(0, participantes, size=linhas - participantes)]))
+    user_ids = pd.Series(numeros).map("P{:07d}".format).to_numpy(dtype=object)
+    user_ids[gerador.random(linhas) < taxa_sem_id] = None
+
+    return pd.DataFrame({COLUNA_TIMESTAMP: timestamps, COLUNA_USER_ID: user_ids})
+
+
+def sortear_respostas(gerador: np.random.Generator, linhas: int, opcoes: Sequence[str],
+                      taxa_em_branco: float, pesos: Optional[Sequence[float]] = None) -> np.ndarray:
+    """
+    Sorteia as respostas de uma pergunta
+
+    Args:
+        gerador: Gerador aleatório
+        linhas: Quantidade de linhas
+        opcoes: Alternativas da pergunta
+        taxa_em_branco: Fração de respostas deixadas em branco
+        pesos: Probabilidade de cada alternativa (uniforme se omitido)
+
+    Returns:
+        Vetor de respostas (None nas em branco)
+    """
+    respostas = np.asarray(opcoes, dtype=object)[gerador.choice(len(opcoes), size=linhas, p=pesos)]
+    respostas[gerador.random(linhas) < taxa_em_branco] = None
+    return respostas
+
+
+def montar_questionario(identificacao: pd.DataFrame, perguntas: Dict[str, np.ndarray]) -> pd.DataFrame:
+    """
+    Monta o leiaute da exportação: timestamp, perguntas e ID por último
+
+    Args:
+        identificacao: Colunas de timestamp e user_id
+        perguntas: Respostas de cada pergunta, na ordem do formulário
+
+    Returns:
+        DataFrame da exportação
+    """
+    colunas = {COLUNA_TIMESTAMP: identificacao[COLUNA_TIMESTAMP].to_numpy()}
+    colunas.update(perguntas)
+    colunas[COLUNA_USER_ID] = identificacao[COLUNA_USER_ID].to_numpy()
+    return pd.DataFrame(colunas)
+
+
+def gerar_questionarios(linhas: int, semente: int = 42, taxa_reenvio: float = 0.05,
+                        taxa_sem_id: float = 0.01, taxa_em_branco: float = 0.01) -> Dict[str, pd.DataFrame]:
+    """
+    Gera as exportações dos quatro questionários
+
+    As mesmas participantes respondem a todos os questionários, então a
+    combinação por user_id encontra pares como em uma coleta real.
+
+    Args:
+        linhas: Linhas de cada questionário
+        semente: Semente do gerador aleatório
+        taxa_reenvio: Fração de envios repetidos de uma mesma participante
+        taxa_sem_id: Fração de linhas sem ID
+        taxa_em_branco: Fração de respostas em branco
+
+    Returns:
+        Dicionário {questionario: DataFrame}
+    """
+    gerador = np.random.default_rng(semente)
+    participantes = min(linhas, max(1, round(linhas * (1 - taxa_reenvio))))
+    questionarios = {}
+
+    identificacao = gerar_identificacao(gerador, linhas, participantes, taxa_sem_id)
+    questionarios["estresse"] = montar_questionario(identificacao, {
+        pergunta: sortear_respostas(gerador, linhas, RESPOSTAS_ESTRESSE, taxa_em_branco,
+                                    [0.15, 0.25, 0.3, 0.2, 0.1])
+        for pergunta in PERGUNTAS_ESTRESSE})
+
+    identificacao = gerar_identificacao(gerador, linhas, participantes, taxa_sem_id)
+    respostas_menacme = {PERGUNTAS_MENACME[0]: sortear_respostas(
+        gerador, linhas, RESPOSTAS_CICLO, taxa_em_branco, [0.55, 0.3, 0.1, 0.05])}
+    respostas_menacme.update({
+        pergunta: sortear_respostas(gerador, linhas, RESPOSTAS_MENACME, taxa_em_branco,
+                                    [0.45, 0.2, 0.15, 0.1, 0.06, 0.04])
+        for pergunta in PERGUNTAS_MENACME[1:]})
+    questionarios["menacme"] = montar_questionario(identificacao, respostas_menacme)
+
+    identificacao = gerar_identificacao(gerador, linhas, participantes, taxa_sem_id)
+    questionarios["vulnerabilidade"] = montar_questionario(identificacao, {
+        pergunta: sortear_respostas(gerador, linhas, RESPOSTAS_VULNERABILIDADE, taxa_em_branco)
+        for pergunta in PERGUNTAS_VULNERABILIDADE})
+
+    identificacao = gerar_identificacao(gerador, linhas, participantes, taxa_sem_id)
+    questionarios["sociodemografico"] = montar_questionario(identificacao, {
+        pergunta: sortear_respostas(gerador, linhas, opcoes, taxa_em_branco)
+        for pergunta, opcoes in PERGUNTAS_SOCIODEMOGRAFICO.items()})
+
+    return questionarios
+
+
+def escrever_xlsx(df: pd.DataFrame, caminho_arquivo: str):
+    """
+    Grava a planilha no modo somente escrita do openpyxl
+
+    Args:
+        df: Exportação do questionário
+        caminho_arquivo: Caminho do arquivo .xlsx
+    """
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    planilha = workbook.create_sheet("Respostas ao formulário 1")
+    planilha.append(list(df.columns))
+    timestamps = df.iloc[:, 0].dt.to_pydatetime()
+    respostas = df.iloc[:, 1:].to_numpy(dtype=object)
+    for timestamp, linha in zip(timestamps, respostas):
+        planilha.append([timestamp, *linha])
+    workbook.save(caminho_arquivo)
+
+
+def escrever_questionarios(questionarios: Dict[str, pd.DataFrame], diretorio: str, formato: str,
+                           separador_csv: str = ";", formato_data: str = "%d/%m/%Y %H:%M:%S") -> List[str]:
+    """
+    Grava as exportações com os nomes esperados pelo processador
+
+    No CSV o carimbo de data/hora é gravado como texto em ``formato_data``,
+    como no download do Google Forms.
+
+    Args:
+        questionarios: Dicionário {questionario: DataFrame}
+        diretorio: Diretório de destino
+        formato: Um de FORMATOS
+        separador_csv: Separador de colunas do CSV
+        formato_data: Formato do carimbo de data/hora no CSV
+
+    Returns:
+        Caminhos gravados
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato inválido: {formato}. Use {', '.join(FORMATOS)}")
+    os.makedirs(diretorio, exist_ok=True)
+
+    caminhos = []
+    for questionario, df in questionarios.items():
+        caminho = os.path.join(diretorio, f"questionario_{questionario}.{formato}")
+        if formato == "xlsx":
+            escrever_xlsx(df, caminho)
+        elif formato == "csv":
+            df.assign(**{COLUNA_TIMESTAMP: df[COLUNA_TIMESTAMP].dt.strftime(formato_data)}).to_csv(
+                caminho, sep=separador_csv, index=False)
+        else:
+            df.to_parquet(caminho, index=False)
+        caminhos.append(caminho)
+    return caminhos
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Gera exportações sintéticas do Google Forms para benchmarks")
+    parser.add_argument("diretorio", help="diretório de destino (um subdiretório por formato)")
+    parser.add_argument("--linhas", default="1k",
+                        help="linhas por questionário: 1k, 100k, 1m ou um número (padrão: 1k)")
+    parser.add_argument("--formatos", nargs="+", default=["xlsx"], choices=FORMATOS,
+                        help="formatos a gravar (padrão: xlsx)")
+    parser.add_argument("--semente", type=int, default=42, help="semente do gerador (padrão: 42)")
+    parser.add_argument("--taxa-reenvio", type=float, default=0.05,
+                        help="fração de envios repetidos (padrão: 0.05)")
+    args = parser.parse_args()
+
+    linhas = interpretar_tamanho(args.linhas)
+    questionarios = gerar_questionarios(linhas, args.semente, args.taxa_reenvio)
+    for formato in args.formatos:
+        for caminho in escrever_questionarios(questionarios, os.path.join(args.diretorio, formato), formato):
+            print(f"{caminho} ({linhas} linhas)")
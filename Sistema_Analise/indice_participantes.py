@@ -0,0 +1,88 @@
+"""
+Índice persistido de user_id para as linhas de cada arquivo de entrada
+"""
+
+import json
+import logging
+import os
+from typing import Callable, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class IndiceParticipantes:
+    """
+    Posições das linhas de cada participante nos arquivos de entrada
+
+    Cada lote de um questionário guarda o arquivo indexado, seu tamanho,
+    data de modificação e total de linhas; quando o arquivo muda, o índice
+    daquele lote é reconstruído na próxima consulta.
+    """
+
+    def __init__(self, caminho_indice: str):
+        """
+        Args:
+            caminho_indice: Caminho do arquivo JSON do índice
+        """
+        self.caminho_indice = caminho_indice
+        self.dados = self.carregar()
+
+    def carregar(self) -> Dict:
+        """
+        Carrega o índice do disco
+
+        Returns:
+            Dicionário {"questionario/lote": {"arquivo", "tamanho", "mtime", "total_linhas", "linhas"}}
+        """
+        if os.path.exists(self.caminho_indice):
+            try:
+                with open(self.caminho_indice, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Índice de participantes inválido, recriando: {e}")
+        return {}
+
+    def salvar(self):
+        """
+        Salva o índice de forma atômica
+        """
+        os.makedirs(os.path.dirname(self.caminho_indice) or ".", exist_ok=True)
+        caminho_temporario = f"{self.caminho_indice}.tmp"
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump(self.dados, f, ensure_ascii=False)
+        os.replace(caminho_temporario, self.caminho_indice)
+
+    def posicoes(self, questionario: str, caminho_arquivo: str, user_id: str,
+                 construir: Callable[[], Tuple[Dict[str, List[int]], int]]) -> Tuple[List[int], int]:
+        """
+        Posições das linhas de um participante em um lote
+
+        Args:
+            questionario: Nome do questionário
+            caminho_arquivo: Lote de entrada do questionário
+            user_id: Identificador do participante
+            construir: Função que lê o arquivo e retorna ({user_id: [posições]}, total de linhas),
+                chamada apenas se o índice estiver ausente ou desatualizado
+
+        Returns:
+            Tupla (posições das linhas do participante, sem o cabeçalho e em
+            ordem; total de linhas do lote)
+        """
+        chave = f"{questionario}/{os.path.basename(caminho_arquivo)}"
+        estado = os.stat(caminho_arquivo)
+        entrada = self.dados.get(chave)
+        if not entrada or entrada["arquivo"] != os.path.abspath(caminho_arquivo) \
+                or entrada["tamanho"] != estado.st_size or entrada["mtime"] != estado.st_mtime_ns \
+                or "total_linhas" not in entrada:
+            logger.info(f"Indexando participantes de {caminho_arquivo}")
+            linhas, total_linhas = construir()
+            entrada = {
+                "arquivo": os.path.abspath(caminho_arquivo),
+                "tamanho": estado.st_size,
+                "mtime": estado.st_mtime_ns,
+                "total_linhas": total_linhas,
+                "linhas": linhas
+            }
+            self.dados[chave] = entrada
+            self.salvar()
+        return entrada["linhas"].get(user_id, []), entrada["total_linhas"]
@@ -1,20 +1,30 @@
 """
 Script principal para executar o sistema de análise de questionários
+
+O processador (pandas, numpy) e o gerador de diagnósticos (jinja2) são
+importados só quando a etapa correspondente começa, para que ``--help``, a
+verificação de dependências e execuções sem arquivos terminem rápido.
 """
 
-from gerador_diagnosticos import GeradorDiagnosticos
-from processador_questionarios import ProcessadorQuestionarios
+import argparse
+import importlib.util
 import os
 import sys
-from pathlib import Path
 
 # Adicionar o diretório atual ao path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 
-def main():
+def main(incremental: bool = False, usar_cache: bool = True, perfilar: bool = False):
     """
     Função principal do sistema
+
+    Args:
+        incremental: Se True, processa apenas as respostas novas desde a
+            última execução (ver controle_ids.json)
+        usar_cache: Se False, ignora o cache de planilhas já lidas
+        perfilar: Se True, grava o perfil de CPU e memória de cada etapa
+            em resultados/profile
     """
     print("=" * 60)
     print("🔬 SISTEMA DE ANÁLISE DE QUESTIONÁRIOS")
@@ -22,10 +32,6 @@ def main():
     print("=" * 60)
 
     try:
-        # Inicializar processador
-        print("\n📊 Inicializando processador de questionários...")
-        processador = ProcessadorQuestionarios()
-
         # Criar diretórios necessários
         print("📁 Criando estrutura de diretórios...")
         os.makedirs("dados_entrada", exist_ok=True)
@@ -38,27 +44,47 @@ def main():
             print("\n⚠️  ATENÇÃO: Nenhum arquivo encontrado em 'dados_entrada'")
             print("\n📋 Para usar o sistema:")
             print(
-                "1. Coloque os arquivos Excel dos Google Forms na pasta 'dados_entrada'")
+                "1. Coloque os arquivos dos Google Forms na pasta 'dados_entrada'")
             print("2. Nomeie os arquivos como:")
             print("   - questionario_estresse.xlsx (para questionário de estresse)")
             print("   - questionario_menacme.xlsx (para questionário de menacme)")
+            print("   - questionario_vulnerabilidade.xlsx (para vulnerabilidade ao estresse)")
+            print("   - questionario_sociodemografico.xlsx (opcional)")
+            print("   (também são aceitos .csv, .csv.gz e .parquet)")
             print("3. Execute este script novamente")
             return
 
         print(f"📄 Arquivos encontrados: {len(arquivos_entrada)}")
 
-        # Processar questionários
-        print("\n🔄 Processando questionários...")
-        resultados = processador.processar_todos_questionarios("dados_entrada")
-
-        # Salvar resultados
-        print("💾 Salvando resultados...")
-        processador.salvar_resultados("resultados")
+        # Inicializar processador
+        print("\n📊 Inicializando processador de questionários...")
+        from processador_questionarios import ProcessadorQuestionarios
+        processador = ProcessadorQuestionarios(usar_cache=usar_cache)
+        if perfilar:
+            from perfil_execucao import PerfilExecucao
+            processador.metricas.perfil = PerfilExecucao(os.path.join("resultados", "profile"))
+
+        if incremental:
+            # Processar apenas respostas novas (salva resultados e controle)
+            print("\n🔄 Processando respostas novas (modo incremental)...")
+            resultados = processador.processar_incremental(
+                "dados_entrada", "resultados")
+        else:
+            # Processar questionários
+            print("\n🔄 Processando questionários...")
+            resultados = processador.processar_todos_questionarios(
+                "dados_entrada")
+
+            # Salvar resultados
+            print("💾 Salvando resultados...")
+            processador.salvar_resultados("resultados")
 
         # Gerar diagnósticos
         print("🎯 Gerando diagnósticos personalizados...")
+        from gerador_diagnosticos import GeradorDiagnosticos
         gerador = GeradorDiagnosticos(processador)
-        diagnosticos = gerador.gerar_todos_diagnosticos("diagnosticos")
+        diagnosticos = gerador.gerar_todos_diagnosticos(
+            "diagnosticos", user_ids=processador.user_ids_atualizados)
 
         # Mostrar estatísticas finais
         print("\n" + "=" * 60)
@@ -68,19 +94,33 @@ def main():
             f"📊 Questionários de estresse processados: {len(resultados['estresse'])}")
         print(
             f"🌸 Questionários de menacme processados: {len(resultados['menacme'])}")
+        print(
+            f"🛡️  Questionários de vulnerabilidade processados: {len(resultados.get('vulnerabilidade', []))}")
         print(f"🔗 Resultados combinados: {len(resultados['combinados'])}")
         print(f"📋 Diagnósticos gerados: {len(diagnosticos)}")
 
+        # Desempenho por etapa
+        processador.metricas.salvar(os.path.join("resultados", "run_metrics.json"))
+        print("\n⏱️  Desempenho por etapa:")
+        print(processador.metricas.formatar_resumo())
+        if perfilar:
+            processador.metricas.perfil.salvar()
+            print("\n🔎 Perfil por etapa salvo em resultados/profile/ (.prof e .txt)")
+
         print("\n📁 Arquivos gerados:")
         print("   📂 resultados/")
-        print("      ├── resultados_completos.json")
-        print("      ├── resultados_estresse.xlsx")
-        print("      ├── resultados_menacme.xlsx")
-        print("      └── resultados_combinados.xlsx")
+        arquivos_resultados = sorted(
+            arquivo for arquivo in os.listdir("resultados")
+            if arquivo.startswith("resultados_") and not arquivo.endswith(".tmp"))
+        for arquivo in arquivos_resultados + ["estatisticas.json", "run_metrics.json"]:
+            print(f"      ├── {arquivo}")
         print("   📂 diagnosticos/")
         print("      ├── indice_diagnosticos.json")
-        for diag in diagnosticos:
+        print("      ├── manifesto_diagnosticos.json")
+        for diag in diagnosticos[:10]:
             print(f"      └── {diag['arquivo']}")
+        if len(diagnosticos) > 10:
+            print(f"      └── ... e mais {len(diagnosticos) - 10} arquivos")
 
         print("\n🎉 Sistema executado com sucesso!")
 
@@ -99,15 +139,11 @@ def main():
 def verificar_dependencias():
     """
     Verifica se as dependências necessárias estão instaladas
+
+    Só procura os pacotes (``find_spec``), sem importá-los.
     """
     dependencias = ['pandas', 'openpyxl', 'jinja2']
-    faltando = []
-
-    for dep in dependencias:
-        try:
-            __import__(dep)
-        except ImportError:
-            faltando.append(dep)
+    faltando = [dep for dep in dependencias if importlib.util.find_spec(dep) is None]
 
     if faltando:
         print(f"⚠️  Dependências faltando: {', '.join(faltando)}")
@@ -118,9 +154,19 @@ def verificar_dependencias():
 
 
 if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Sistema de análise de questionários")
+    parser.add_argument("--incremental", action="store_true",
+                        help="processa apenas as respostas novas desde a última execução")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignora o cache de planilhas já lidas")
+    parser.add_argument("--profile", action="store_true",
+                        help="perfila cada etapa (cProfile e tracemalloc) em resultados/profile")
+    args = parser.parse_args()
+
     print("🔍 Verificando dependências...")
     if verificar_dependencias():
         print("✅ Todas as dependências estão instaladas!")
-        main()
+        main(incremental=args.incremental, usar_cache=not args.no_cache, perfilar=args.profile)
     else:
         print("❌ Instale as dependências antes de continuar.")
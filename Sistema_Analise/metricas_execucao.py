@@ -0,0 +1,152 @@
+"""
+Métricas de desempenho por etapa do processamento em lote
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Dict, Iterator, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Ordem em que as etapas aparecem no resumo
+ETAPAS = ("leitura", "pontuacao", "combinacao", "estatisticas", "gravacao", "diagnostico")
+
+
+def pico_memoria_mb() -> Optional[float]:
+    """
+    Pico de memória residente (RSS) do processo até agora
+
+    Returns:
+        Pico em megabytes, ou None se a plataforma não informar
+    """
+    if resource is None:
+        return None
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux informa em KB; macOS em bytes
+    divisor = 1024 * 1024 if sys.platform == "darwin" else 1024
+    return round(pico / divisor, 1)
+
+
+class MetricasExecucao:
+    """
+    Acumula tempo, linhas, erros e pico de memória de cada etapa
+
+    A mesma etapa pode ser medida várias vezes (por exemplo, um bloco de
+    leitura por vez); os valores são somados.
+    """
+
+    def __init__(self, perfil=None):
+        """
+        Args:
+            perfil: PerfilExecucao que também perfila cada etapa (None desliga)
+        """
+        self.inicio = datetime.now()
+        self.etapas = {}
+        self.perfil = perfil
+
+    @contextmanager
+    def medir(self, etapa: str) -> Iterator[Dict[str, int]]:
+        """
+        Mede o tempo de um trecho e o acumula na etapa
+
+        O dicionário entregue pode receber ``linhas`` e ``erros``. Uma
+        exceção dentro do trecho conta como erro e é propagada. Com um
+        perfil configurado, o trecho também é perfilado.
+
+        Args:
+            etapa: Nome da etapa (ver ETAPAS)
+
+        Yields:
+            Dicionário {"linhas": 0, "erros": 0} a preencher
+        """
+        contagem = {"linhas": 0, "erros": 0}
+        perfil = nullcontext() if self.perfil is None else self.perfil.perfilar(etapa)
+        inicio = time.perf_counter()
+        try:
+            with perfil:
+                yield contagem
+        except Exception:
+            contagem["erros"] += 1
+            raise
+        finally:
+            self.registrar(etapa, time.perf_counter() - inicio,
+                           contagem["linhas"], contagem["erros"])
+
+    def registrar(self, etapa: str, segundos: float, linhas: int = 0, erros: int = 0):
+        """
+        Soma uma medição à etapa
+
+        Args:
+            etapa: Nome da etapa
+            segundos: Tempo de parede gasto
+            linhas: Linhas (ou participantes) tratadas
+            erros: Linhas com erro
+        """
+        dados = self.etapas.setdefault(
+            etapa, {"segundos": 0.0, "linhas": 0, "erros": 0, "pico_rss_mb": None})
+        dados["segundos"] += segundos
+        dados["linhas"] += linhas
+        dados["erros"] += erros
+        dados["pico_rss_mb"] = pico_memoria_mb()
+
+    def resumo(self) -> Dict:
+        """
+        Monta o resumo das etapas medidas
+
+        Returns:
+            Dicionário serializável em JSON
+        """
+        ordem = [etapa for etapa in ETAPAS if etapa in self.etapas] + \
+            [etapa for etapa in self.etapas if etapa not in ETAPAS]
+        etapas = {}
+        for etapa in ordem:
+            dados = self.etapas[etapa]
+            etapas[etapa] = {
+                "segundos": round(dados["segundos"], 4),
+                "linhas": dados["linhas"],
+                "linhas_por_segundo": round(dados["linhas"] / dados["segundos"], 1) if dados["segundos"] else None,
+                "erros": dados["erros"],
+                "pico_rss_mb": dados["pico_rss_mb"]
+            }
+
+        return {
+            "inicio": self.inicio.isoformat(),
+            "fim": datetime.now().isoformat(),
+            "segundos_total": round(sum(dados["segundos"] for dados in self.etapas.values()), 4),
+            "pico_rss_mb": pico_memoria_mb(),
+            "etapas": etapas
+        }
+
+    def formatar_resumo(self) -> str:
+        """
+        Resumo legível das etapas, uma por linha
+
+        Returns:
+            Texto para exibir no terminal
+        """
+        linhas = []
+        for etapa, dados in self.resumo()["etapas"].items():
+            taxa = f"{dados['linhas_por_segundo']:.0f} linhas/s" if dados["linhas_por_segundo"] else "-"
+            memoria = f"{dados['pico_rss_mb']} MB" if dados["pico_rss_mb"] is not None else "-"
+            linhas.append(
+                f"{etapa:<12} {dados['segundos']:>9.3f} s  {dados['linhas']:>9} linhas  {taxa:>18}  "
+                f"pico {memoria:>10}  erros {dados['erros']}")
+        return "\n".join(linhas)
+
+    def salvar(self, caminho_arquivo: str):
+        """
+        Grava o resumo em JSON
+
+        Args:
+            caminho_arquivo: Caminho do arquivo (ex.: resultados/run_metrics.json)
+        """
+        os.makedirs(os.path.dirname(caminho_arquivo) or ".", exist_ok=True)
+        with open(caminho_arquivo, 'w', encoding='utf-8') as f:
+            json.dump(self.resumo(), f, indent=2, ensure_ascii=False)
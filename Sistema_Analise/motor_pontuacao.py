@@ -0,0 +1,283 @@
+"""
+Planos de pontuação dos questionários declarados no config.json
+
+Cada questionário com ``"tipo": "escala"`` ou ``"tipo": "categorico"`` é
+compilado uma única vez em um PlanoPontuacao: colunas localizadas pelo
+cabeçalho, escala de respostas, itens invertidos e faixas de
+interpretação. A pontuação de um bloco é feita sobre o vocabulário de
+respostas distintas e espalhada para a matriz por indexação, sem laços
+por participante. As funções de escala e de faixas também pontuam o
+questionário de estresse.
+"""
+
+import re
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+# Tipos de questionário atendidos pelo plano genérico
+TIPOS_PLANO = ("escala", "categorico")
+
+# Especificação de coluna: posição (aceita negativos) ou trecho do cabeçalho
+EspecificacaoColuna = Union[int, str]
+
+
+def normalizar_cabecalho(texto) -> str:
+    """
+    Normaliza um cabeçalho de coluna para comparação
+
+    Args:
+        texto: Cabeçalho original
+
+    Returns:
+        Texto em minúsculas, sem espaços extras
+    """
+    return re.sub(r"\s+", " ", str(texto)).strip().casefold()
+
+
+def localizar_coluna(colunas: Sequence, especificacao: EspecificacaoColuna) -> int:
+    """
+    Encontra a posição de uma coluna pela posição ou pelo cabeçalho
+
+    Um texto casa primeiro com o cabeçalho idêntico, depois com o
+    cabeçalho que começa com ele e por fim com o que o contém. Mais de um
+    candidato no mesmo critério é tratado como ambíguo.
+
+    Args:
+        colunas: Cabeçalhos do DataFrame
+        especificacao: Posição ou trecho do cabeçalho
+
+    Returns:
+        Posição da coluna
+
+    Raises:
+        ValueError: Se a coluna não existir ou for ambígua
+    """
+    if isinstance(especificacao, int):
+        if not -len(colunas) <= especificacao < len(colunas):
+            raise ValueError(f"Coluna {especificacao} fora da planilha ({len(colunas)} colunas)")
+        return especificacao % len(colunas)
+
+    trecho = normalizar_cabecalho(especificacao)
+    cabecalhos = [normalizar_cabecalho(coluna) for coluna in colunas]
+    for criterio in (str.__eq__, str.startswith, str.__contains__):
+        candidatos = [i for i, cabecalho in enumerate(cabecalhos) if criterio(cabecalho, trecho)]
+        if len(candidatos) == 1:
+            return candidatos[0]
+        if len(candidatos) > 1:
+            raise ValueError(f"Cabeçalho ambíguo para '{especificacao}': "
+                             f"{[str(colunas[i]) for i in candidatos]}")
+    raise ValueError(f"Coluna não encontrada: '{especificacao}'")
+
+
+def compilar_escala(escala: Dict[str, int]) -> Dict[str, int]:
+    """
+    Normaliza as chaves de uma escala de respostas, mantendo a ordem
+
+    Args:
+        escala: Mapeamento trecho de texto -> pontos do config.json
+
+    Returns:
+        Escala com as chaves normalizadas e os pontos inteiros
+    """
+    return {normalizar_cabecalho(texto): int(pontos) for texto, pontos in escala.items()}
+
+
+def pontuar_vocabulario(vocabulario: np.ndarray, escala: Dict[str, int],
+                        priorizar_identicas: bool = True) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Pontua cada texto distinto de resposta uma única vez
+
+    Indexar o resultado pela matriz de códigos das respostas
+    (``pontos[codigos]``) produz a matriz de pontos do bloco inteiro.
+    Respostas idênticas a uma chave da escala usam seus pontos; as demais
+    usam a primeira chave contida no texto. Números exportados como
+    decimais ("3.0") são comparados como inteiros.
+
+    Args:
+        vocabulario: Textos distintos de resposta
+        escala: Escala retornada por ``compilar_escala``
+        priorizar_identicas: Se False, vale sempre a primeira chave contida
+            no texto, na ordem da escala (regra do questionário de estresse)
+
+    Returns:
+        Tupla (pontos de cada texto, máscara de textos reconhecidos)
+    """
+    pontos = np.zeros(len(vocabulario), dtype=np.int64)
+    reconhecidos = np.zeros(len(vocabulario), dtype=bool)
+    for i, texto in enumerate(vocabulario):
+        texto = re.sub(r"^(-?\d+)\.0+$", r"\1", normalizar_cabecalho(texto))
+        if priorizar_identicas and texto in escala:
+            pontos[i], reconhecidos[i] = escala[texto], True
+            continue
+        for chave, valor in escala.items():
+            if chave and chave in texto:
+                pontos[i], reconhecidos[i] = valor, True
+                break
+    return pontos, reconhecidos
+
+
+def compilar_faixas(interpretacao: Dict) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Prepara as faixas de interpretação para busca por intervalo
+
+    Args:
+        interpretacao: Faixas {nivel: {"min": ..., "max": ...}} do config.json
+
+    Returns:
+        Tupla (limites mínimos ordenados, limites máximos, nomes dos níveis)
+    """
+    faixas = sorted(interpretacao.items(), key=lambda item: item[1]["min"])
+    return (np.array([faixa["min"] for _, faixa in faixas]),
+            np.array([faixa["max"] for _, faixa in faixas]),
+            np.array([nivel for nivel, _ in faixas], dtype=object))
+
+
+def classificar_faixas(pontuacoes: np.ndarray, faixas: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                       padrao: str) -> np.ndarray:
+    """
+    Classifica pontuações totais nas faixas de interpretação via busca binária
+
+    Args:
+        pontuacoes: Vetor de pontuações totais
+        faixas: Tabela retornada por ``compilar_faixas``
+        padrao: Nível atribuído a pontuações fora de todas as faixas
+
+    Returns:
+        Vetor com o nome do nível de cada pontuação
+    """
+    minimos, maximos, nomes = faixas
+    if len(nomes) == 0:
+        return np.full(len(pontuacoes), padrao, dtype=object)
+
+    posicoes = np.clip(np.searchsorted(minimos, pontuacoes, side="right") - 1, 0, None)
+    validos = (pontuacoes >= minimos[0]) & (pontuacoes <= maximos[posicoes])
+    return np.where(validos, nomes[posicoes], padrao)
+
+
+class PlanoPontuacao:
+    """
+    Declaração de um questionário compilada para pontuação vetorizada
+    """
+
+    def __init__(self, nome: str, declaracao: Dict):
+        """
+        Compila a declaração de ``questionarios.<nome>`` do config.json
+
+        Args:
+            nome: Nome do questionário (ex.: "vulnerabilidade")
+            declaracao: Seção do questionário no config.json
+
+        Raises:
+            ValueError: Se a declaração for inconsistente
+        """
+        self.nome = nome
+        self.tipo = declaracao.get("tipo", "escala")
+        if self.tipo not in TIPOS_PLANO:
+            raise ValueError(f"Tipo de questionário inválido em {nome}: {self.tipo}. "
+                             f"Use {', '.join(TIPOS_PLANO)}")
+
+        self.prefixo_id = declaracao.get("prefixo_id", nome[:3].upper())
+        self.rotulo_perguntas = declaracao.get("rotulo_perguntas", nome[:1].upper())
+
+        colunas = declaracao.get("colunas", {})
+        self.coluna_timestamp = colunas.get("timestamp", 0)
+        self.coluna_user_id = colunas.get("user_id", -1)
+        self.colunas_perguntas: Optional[List[EspecificacaoColuna]] = colunas.get("perguntas")
+
+        self.pontuado = self.tipo == "escala"
+        escala = declaracao.get("escala", {})
+        if self.pontuado and not escala:
+            raise ValueError(f"Questionário {nome} do tipo escala sem 'escala' definida")
+        self.escala = compilar_escala(escala)
+        self.ponto_minimo = min(self.escala.values(), default=0)
+        self.ponto_maximo = max(self.escala.values(), default=0)
+        self.itens_invertidos = [int(item) for item in declaracao.get("itens_invertidos", [])]
+
+        interpretacao = declaracao.get("interpretacao", {}) if self.pontuado else {}
+        self.faixas = compilar_faixas(interpretacao)
+        self.cores = {nivel: faixa.get("cor") for nivel, faixa in interpretacao.items()}
+        self.nivel_padrao = declaracao.get("nivel_padrao", "indefinido")
+
+        self._colunas_resolvidas = {}
+
+    def resolver_colunas(self, colunas: Sequence) -> Tuple[int, int, List[int]]:
+        """
+        Localiza as colunas do questionário em um cabeçalho de planilha
+
+        O resultado é guardado por cabeçalho, então blocos da mesma
+        planilha não repetem a busca.
+
+        Args:
+            colunas: Cabeçalhos do DataFrame
+
+        Returns:
+            Tupla (posição do timestamp, posição do user_id, posições das perguntas)
+
+        Raises:
+            ValueError: Se alguma coluna não for encontrada
+        """
+        chave = tuple(str(coluna) for coluna in colunas)
+        if chave not in self._colunas_resolvidas:
+            posicao_timestamp = localizar_coluna(colunas, self.coluna_timestamp)
+            posicao_user_id = localizar_coluna(colunas, self.coluna_user_id)
+            if self.colunas_perguntas is None:
+                posicoes_perguntas = [i for i in range(len(colunas))
+                                      if i not in (posicao_timestamp, posicao_user_id)]
+            else:
+                posicoes_perguntas = [localizar_coluna(colunas, especificacao)
+                                      for especificacao in self.colunas_perguntas]
+
+            invalidos = [item for item in self.itens_invertidos
+                         if not 1 <= item <= len(posicoes_perguntas)]
+            if invalidos:
+                raise ValueError(f"Itens invertidos fora do questionário {self.nome}: {invalidos}")
+            self._colunas_resolvidas[chave] = (posicao_timestamp, posicao_user_id, posicoes_perguntas)
+        return self._colunas_resolvidas[chave]
+
+    def rotulos(self, quantidade: int) -> List[str]:
+        """
+        Rótulos das perguntas ("V1", "V2", ...)
+
+        Args:
+            quantidade: Quantidade de perguntas
+
+        Returns:
+            Lista de rótulos
+        """
+        return [f"{self.rotulo_perguntas}{i}" for i in range(1, quantidade + 1)]
+
+    def pontuar(self, codigos: np.ndarray, vocabulario: np.ndarray) -> np.ndarray:
+        """
+        Monta a matriz de pontos de um bloco, já com os itens invertidos
+
+        Respostas não reconhecidas (inclusive em branco) valem 0 e não são
+        invertidas.
+
+        Args:
+            codigos: Matriz de códigos das respostas (linhas x perguntas)
+            vocabulario: Texto correspondente a cada código
+
+        Returns:
+            Matriz de pontos com o formato de ``codigos``
+        """
+        pontos_vocabulario, reconhecidos_vocabulario = pontuar_vocabulario(vocabulario, self.escala)
+        pontos = pontos_vocabulario[codigos]
+        if self.itens_invertidos:
+            colunas = np.array(self.itens_invertidos) - 1
+            reconhecidos = reconhecidos_vocabulario[codigos[:, colunas]]
+            pontos[:, colunas] = np.where(
+                reconhecidos, self.ponto_minimo + self.ponto_maximo - pontos[:, colunas], 0)
+        return pontos
+
+    def classificar(self, pontuacoes: np.ndarray) -> np.ndarray:
+        """
+        Classifica pontuações totais nas faixas de interpretação
+
+        Args:
+            pontuacoes: Vetor de pontuações totais
+
+        Returns:
+            Vetor com o nome do nível de cada pontuação
+        """
+        return classificar_faixas(pontuacoes, self.faixas, self.nivel_padrao)
@@ -0,0 +1,152 @@
+"""
+Perfil de CPU e de memória por etapa do processamento (opção --profile)
+
+Cada etapa medida por ``MetricasExecucao.medir`` é executada sob cProfile
+e entre dois snapshots do tracemalloc. Ao final, ``salvar`` grava por
+etapa um ``{etapa}.prof`` (abrir com ``python -m pstats`` ou snakeviz) e um
+``{etapa}.txt`` com as funções mais caras e as linhas que mais alocaram.
+
+Só o processo principal é perfilado: com ``processamento_paralelo``, o
+trabalho feito nos workers aparece como espera pelo resultado.
+"""
+
+import cProfile
+import io
+import logging
+import os
+import pstats
+import tracemalloc
+from contextlib import contextmanager
+from typing import Dict, Iterator, List
+
+logger = logging.getLogger(__name__)
+
+# Quadros guardados por alocação; 1 basta para agrupar por linha
+QUADROS_TRACEMALLOC = 1
+
+# Alocações do próprio perfil (snapshots) ficam fora do relatório
+FILTROS_TRACEMALLOC = [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__)]
+
+
+class PerfilExecucao:
+    """
+    Acumula o perfil de CPU e as alocações de cada etapa
+
+    A mesma etapa pode ser perfilada várias vezes (um bloco de leitura por
+    vez); os perfis e as alocações são somados. Em etapas aninhadas, o tempo
+    da etapa interna conta só para ela.
+    """
+
+    def __init__(self, diretorio: str, top_n: int = 30):
+        """
+        Args:
+            diretorio: Onde gravar os arquivos (ex.: resultados/profile)
+            top_n: Quantidade de funções e de linhas em cada relatório
+        """
+        self.diretorio = diretorio
+        self.top_n = top_n
+        self.perfis: Dict[str, cProfile.Profile] = {}
+        self.alocacoes: Dict[str, Dict[str, List[int]]] = {}
+        self.picos_mb: Dict[str, float] = {}
+        self._ativas: List[str] = []
+        self._iniciou_tracemalloc = False
+
+    @contextmanager
+    def perfilar(self, etapa: str) -> Iterator[None]:
+        """
+        Perfila um trecho e o acumula na etapa
+
+        Args:
+            etapa: Nome da etapa (ver metricas_execucao.ETAPAS)
+        """
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(QUADROS_TRACEMALLOC)
+            self._iniciou_tracemalloc = True
+
+        perfil = self.perfis.setdefault(etapa, cProfile.Profile())
+        if self._ativas:
+            self.perfis[self._ativas[-1]].disable()
+            self._registrar_pico()
+        self._ativas.append(etapa)
+
+        antes = tracemalloc.take_snapshot().filter_traces(FILTROS_TRACEMALLOC)
+        tracemalloc.reset_peak()
+        perfil.enable()
+        try:
+            yield
+        finally:
+            perfil.disable()
+            self._registrar_pico()
+            depois = tracemalloc.take_snapshot().filter_traces(FILTROS_TRACEMALLOC)
+            self._ativas.pop()
+            if self._ativas:
+                self.perfis[self._ativas[-1]].enable()
+
+            alocacoes = self.alocacoes.setdefault(etapa, {})
+            for diferenca in depois.compare_to(antes, "lineno"):
+                if diferenca.size_diff or diferenca.count_diff:
+                    quadro = diferenca.traceback[0]
+                    acumulado = alocacoes.setdefault(f"{quadro.filename}:{quadro.lineno}", [0, 0])
+                    acumulado[0] += diferenca.size_diff
+                    acumulado[1] += diferenca.count_diff
+
+    def _registrar_pico(self):
+        """
+        Atribui o pico desde o último reset a todas as etapas em andamento
+        """
+        _, pico = tracemalloc.get_traced_memory()
+        for etapa in self._ativas:
+            self.picos_mb[etapa] = max(self.picos_mb.get(etapa, 0.0), pico / (1024 * 1024))
+        tracemalloc.reset_peak()
+
+    def relatorio(self, etapa: str) -> str:
+        """
+        Funções mais caras e linhas que mais alocaram na etapa
+
+        Args:
+            etapa: Nome da etapa
+
+        Returns:
+            Texto do relatório
+        """
+        saida = io.StringIO()
+        saida.write(f"Etapa: {etapa}\n")
+        saida.write(f"Pico de memória alocada (tracemalloc): {self.picos_mb.get(etapa, 0.0):.1f} MB\n\n")
+
+        saida.write(f"== Top {self.top_n} funções por tempo acumulado ==\n")
+        estatisticas = pstats.Stats(self.perfis[etapa], stream=saida)
+        estatisticas.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top_n)
+
+        saida.write(f"== Top {self.top_n} funções por tempo próprio ==\n")
+        estatisticas.sort_stats(pstats.SortKey.TIME).print_stats(self.top_n)
+
+        saida.write(f"== Top {self.top_n} linhas por memória retida ao fim da etapa ==\n")
+        alocacoes = sorted(self.alocacoes.get(etapa, {}).items(), key=lambda item: -abs(item[1][0]))
+        for linha, (tamanho, blocos) in alocacoes[:self.top_n]:
+            saida.write(f"{tamanho / 1024:>+12.1f} KiB {blocos:>+9} blocos  {linha}\n")
+        return saida.getvalue()
+
+    def salvar(self) -> List[str]:
+        """
+        Grava ``{etapa}.prof`` e ``{etapa}.txt`` de cada etapa perfilada
+
+        Encerra o tracemalloc se ele foi iniciado por este perfil.
+
+        Returns:
+            Caminhos dos arquivos gravados
+        """
+        os.makedirs(self.diretorio, exist_ok=True)
+        arquivos = []
+        for etapa, perfil in self.perfis.items():
+            caminho_prof = os.path.join(self.diretorio, f"{etapa}.prof")
+            perfil.dump_stats(caminho_prof)
+            caminho_relatorio = os.path.join(self.diretorio, f"{etapa}.txt")
+            with open(caminho_relatorio, 'w', encoding='utf-8') as f:
+                f.write(self.relatorio(etapa))
+            arquivos.extend([caminho_prof, caminho_relatorio])
+
+        if self._iniciou_tracemalloc:
+            tracemalloc.stop()
+            self._iniciou_tracemalloc = False
+        logger.info(f"Perfil de {len(self.perfis)} etapas salvo em {self.diretorio}")
+        return arquivos
@@ -2,31 +2,77 @@ import pandas as pd
 import numpy as np
 from datetime import datetime
 import os
+import re
 import json
+import functools
+import hashlib
+import importlib.util
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Tuple, Any
+from typing import Dict, List, Tuple, Any, Callable, Iterator, Optional
 import logging
 
+from cache_leitura import CacheLeitura
+from indice_participantes import IndiceParticipantes
+from metricas_execucao import MetricasExecucao
+from estatisticas_coorte import EstatisticasCoorte
+from escritores_resultados import (FORMATOS_SAIDA, anexar_ndjson,
+                                   escrever_resultados_participantes, escrever_tabela)
+from motor_pontuacao import (TIPOS_PLANO, PlanoPontuacao, classificar_faixas, compilar_escala,
+                             compilar_faixas, localizar_coluna, pontuar_vocabulario)
+from resultados_compactos import (ResultadosCombinados, ResultadosEstresse,
+                                  ResultadosMenacme, ResultadosQuestionario,
+                                  TabelaResultados, codificar)
+
 # Configurar logging
 logging.basicConfig(level=logging.INFO,
                     format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Extensões aceitas em dados_entrada, da leitura mais rápida para a mais lenta
+FORMATOS_ENTRADA = (".parquet", ".csv.gz", ".csv", ".xlsx")
+
+# Tabela de resultados e método de processamento de cada tipo de questionário
+# (questionarios.<nome>.tipo no config.json; o padrão é o próprio nome)
+TABELAS_RESULTADOS = {
+    "estresse": ResultadosEstresse,
+    "menacme": ResultadosMenacme,
+    "escala": ResultadosQuestionario,
+    "categorico": ResultadosQuestionario
+}
+
+PROCESSADORES_POR_TIPO = {
+    "estresse": "processar_questionario_estresse",
+    "menacme": "processar_questionario_menacme",
+    "escala": "processar_questionario_configurado",
+    "categorico": "processar_questionario_configurado"
+}
+
 
 class ProcessadorQuestionarios:
     """
-    Classe principal para processar questionários de estresse e menacme
+    Classe principal para processar os questionários do projeto
     """
 
-    def __init__(self, config_path: str = "config.json"):
+    def __init__(self, config_path: str = "config.json", usar_cache: bool = True, config: Optional[Dict] = None):
         """
         Inicializa o processador com configurações
 
         Args:
             config_path: Caminho para o arquivo de configuração
+            usar_cache: Se False, não usa o cache de planilhas lidas
+            config: Configuração já carregada (dispensa a leitura de config_path)
         """
-        self.config = self.carregar_configuracao(config_path)
+        self.config = config if config is not None else self.carregar_configuracao(
+            config_path)
         self.resultados = {}
+        self._padroes_menacme = None
+        self._planos = {}
+        self.user_ids_atualizados = None
+        self.estatisticas = None
+        self.cache = self.criar_cache() if usar_cache else None
+        self.metricas = MetricasExecucao()
 
     def carregar_configuracao(self, config_path: str) -> Dict:
         """
@@ -46,6 +92,30 @@ class ProcessadorQuestionarios:
                 f"Arquivo de configuração {config_path} não encontrado. Usando configuração padrão.")
             return self.configuracao_padrao()
 
+    def criar_cache(self) -> Optional[CacheLeitura]:
+        """
+        Cria o cache de planilhas lidas conforme ``configuracoes_gerais.cache_leitura``
+
+        Returns:
+            Instância de CacheLeitura, ou None se desativado ou sem pyarrow
+        """
+        config_cache = self.config.get(
+            "configuracoes_gerais", {}).get("cache_leitura", {})
+        if not config_cache.get("ativo", True):
+            return None
+
+        if importlib.util.find_spec("pyarrow") is None:
+            logger.info("pyarrow não instalado; cache de leitura desativado")
+            return None
+
+        diretorio_saida = self.config.get(
+            "diretorios", {}).get("saida", "resultados")
+        return CacheLeitura(
+            config_cache.get("diretorio", os.path.join(
+                diretorio_saida, ".cache")),
+            config_cache.get("limite_mb", 512)
+        )
+
     def configuracao_padrao(self) -> Dict:
         """
         Retorna configuração padrão para os questionários
@@ -75,17 +145,75 @@ class ProcessadorQuestionarios:
                 "menacme": {
                     "arquivo": "questionario_menacme.xlsx",
                     "colunas_perguntas": "B:Z",
+                    "palavras_chave": {
+                        "sintoma": ["sim", "frequente", "intenso"],
+                        "sintoma_intenso": ["muito frequente", "intenso", "severo"],
+                        "irregularidade_menstrual": ["irregular", "parou", "ausente"]
+                    },
                     "interpretacao": {
                         "pre_menopausa": "Fase pré-menopausa",
                         "perimenopausa": "Fase de perimenopausa",
                         "pos_menopausa": "Fase pós-menopausa"
                     }
+                },
+                "vulnerabilidade": {
+                    "tipo": "escala",
+                    "arquivo": "questionario_vulnerabilidade.xlsx",
+                    "prefixo_id": "VUL",
+                    "rotulo_perguntas": "V",
+                    "colunas": {"timestamp": 0, "user_id": -1},
+                    "escala": {
+                        "quase sempre": 1,
+                        "nunca": 5,
+                        "1": 1, "2": 2, "3": 3, "4": 4, "5": 5
+                    },
+                    "itens_invertidos": [],
+                    "interpretacao": {
+                        "nao_vulneravel": {"min": 20, "max": 49, "cor": "verde"},
+                        "vulneravel": {"min": 50, "max": 69, "cor": "amarelo"},
+                        "seriamente_vulneravel": {"min": 70, "max": 95, "cor": "laranja"},
+                        "extremamente_vulneravel": {"min": 96, "max": 100, "cor": "vermelho"}
+                    }
+                },
+                "sociodemografico": {
+                    "tipo": "categorico",
+                    "arquivo": "questionario_sociodemografico.xlsx",
+                    "prefixo_id": "SOC",
+                    "rotulo_perguntas": "S",
+                    "colunas": {"timestamp": 0, "user_id": -1}
                 }
             },
             "diretorios": {
                 "entrada": "dados_entrada",
                 "saida": "resultados",
                 "templates": "templates"
+            },
+            "configuracoes_gerais": {
+                "politica_duplicatas": "ultima",
+                "tamanho_bloco_leitura": None,
+                "formatos_saida": ["json"],
+                "resultados_por_participante": True,
+                "cache_leitura": {
+                    "ativo": True,
+                    "diretorio": "resultados/.cache",
+                    "limite_mb": 512
+                },
+                "cache_templates": {
+                    "ativo": True,
+                    "diretorio": "resultados/.cache/templates"
+                },
+                "cache_fragmentos_diagnostico": {
+                    "tamanho_maximo": 4096
+                },
+                "processamento_paralelo": {
+                    "workers": None,
+                    "linhas_minimas_paralelo": 10000
+                },
+                "geracao_paralela_diagnosticos": {
+                    "workers": None,
+                    "diagnosticos_minimos_paralelo": 2000,
+                    "tamanho_lote": 500
+                }
             }
         }
 
@@ -114,284 +242,1863 @@ class ProcessadorQuestionarios:
             logger.error(f"Erro ao ler planilha {caminho_arquivo}: {e}")
             raise
 
-    def processar_questionario_estresse(self, df: pd.DataFrame) -> List[Dict]:
+    def detectar_formato(self, caminho_arquivo: str) -> str:
+        """
+        Identifica o formato de um arquivo de entrada pela extensão
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo
+
+        Returns:
+            Extensão reconhecida (uma de FORMATOS_ENTRADA)
+        """
+        nome = caminho_arquivo.lower()
+        for formato in FORMATOS_ENTRADA:
+            if nome.endswith(formato):
+                return formato
+        raise ValueError(
+            f"Formato de arquivo não suportado: {caminho_arquivo}. Use {', '.join(FORMATOS_ENTRADA)}")
+
+    def localizar_arquivos_questionario(self, diretorio_entrada: str, questionario: str) -> List[str]:
+        """
+        Procura todos os lotes exportados de um questionário
+
+        O nome base vem de ``questionarios.<nome>.arquivo`` no config.json
+        (sem extensão). São aceitos o arquivo com o nome base e lotes com
+        sufixo (``questionario_estresse_2026-10-01.xlsx``), em qualquer
+        formato suportado. Se um lote existir em mais de um formato, usa o
+        de leitura mais rápida, na ordem de FORMATOS_ENTRADA.
+
+        Args:
+            diretorio_entrada: Diretório com os arquivos exportados
+            questionario: Nome do questionário
+
+        Returns:
+            Caminhos encontrados: o nome base primeiro e os lotes em ordem alfabética
+        """
+        arquivo = self.config["questionarios"][questionario].get(
+            "arquivo", f"questionario_{questionario}.xlsx")
+        nome_base = Path(arquivo).name.split(".")[0]
+        if not os.path.isdir(diretorio_entrada):
+            return []
+
+        lotes = {}
+        for nome in os.listdir(diretorio_entrada):
+            formato = next((formato for formato in FORMATOS_ENTRADA if nome.endswith(formato)), None)
+            if formato is None or nome.startswith("~$"):
+                continue
+            lote = nome[:-len(formato)]
+            if lote != nome_base and not lote.startswith(f"{nome_base}_"):
+                continue
+            atual = lotes.get(lote)
+            if atual is None or FORMATOS_ENTRADA.index(formato) < FORMATOS_ENTRADA.index(atual):
+                lotes[lote] = formato
+
+        ordem = sorted(lotes, key=lambda lote: (lote != nome_base, lote))
+        return [os.path.join(diretorio_entrada, lote + lotes[lote]) for lote in ordem]
+
+    def ler_arquivo_dados(self, caminho_arquivo: str) -> pd.DataFrame:
+        """
+        Lê um arquivo de respostas em qualquer formato suportado
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo (.xlsx, .csv, .csv.gz ou .parquet)
+
+        Returns:
+            DataFrame com os dados
+        """
+        formato = self.detectar_formato(caminho_arquivo)
+
+        # Planilhas e CSVs já lidos são recarregados do cache em Parquet
+        if self.cache and formato != ".parquet":
+            df = self.cache.obter(caminho_arquivo)
+            if df is not None:
+                return df
+
+        df = self.ler_arquivo_origem(caminho_arquivo)
+
+        if self.cache and formato != ".parquet":
+            self.cache.guardar(caminho_arquivo, df)
+        return df
+
+    def ler_arquivo_origem(self, caminho_arquivo: str) -> pd.DataFrame:
+        """
+        Lê um arquivo de respostas direto da origem, sem passar pelo cache
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo (.xlsx, .csv, .csv.gz ou .parquet)
+
+        Returns:
+            DataFrame com os dados
+        """
+        formato = self.detectar_formato(caminho_arquivo)
+        if formato == ".xlsx":
+            return self.ler_planilha_excel(caminho_arquivo)
+
+        try:
+            if formato == ".parquet":
+                df = pd.read_parquet(caminho_arquivo)
+            else:
+                df = pd.read_csv(caminho_arquivo, **self._opcoes_csv())
+            logger.info(
+                f"Arquivo {caminho_arquivo} carregado com {len(df)} registros")
+            return df
+        except Exception as e:
+            logger.error(f"Erro ao ler arquivo {caminho_arquivo}: {e}")
+            raise
+
+    def ler_arquivos_questionario(self, caminhos: List[str]) -> pd.DataFrame:
+        """
+        Lê todos os lotes de um questionário, ao mesmo tempo, e os junta
+
+        Lotes que não estão no cache são lidos em threads; o cache é
+        consultado e atualizado apenas na thread principal. As linhas de
+        cada lote recebem posições contínuas às do lote anterior, para que
+        os ids ``EST_n``/``MEN_n`` não se repitam entre lotes.
+
+        Args:
+            caminhos: Arquivos retornados por localizar_arquivos_questionario
+
+        Returns:
+            DataFrame com as linhas de todos os lotes, na ordem dos arquivos
+        """
+        if len(caminhos) == 1:
+            return self.ler_arquivo_dados(caminhos[0])
+
+        usa_cache = {caminho: bool(self.cache) and self.detectar_formato(caminho) != ".parquet"
+                     for caminho in caminhos}
+        lidos = {caminho: self.cache.obter(caminho) for caminho in caminhos if usa_cache[caminho]}
+        pendentes = [caminho for caminho in caminhos if lidos.get(caminho) is None]
+
+        if pendentes:
+            workers, _ = self.obter_configuracao_paralela()
+            with ThreadPoolExecutor(max_workers=min(workers, len(pendentes))) as executor:
+                lidos.update(zip(pendentes, executor.map(self.ler_arquivo_origem, pendentes)))
+            for caminho in pendentes:
+                if usa_cache[caminho]:
+                    self.cache.guardar(caminho, lidos[caminho])
+
+        colunas = lidos[caminhos[0]].columns
+        partes, inicio = [], 0
+        for caminho in caminhos:
+            df = lidos[caminho]
+            if df.shape[1] != len(colunas):
+                raise ValueError(
+                    f"{caminho} tem {df.shape[1]} colunas; o primeiro lote tem {len(colunas)}")
+            # As colunas são lidas por posição; cabeçalhos editados entre lotes não importam
+            df.columns = colunas
+            df.index = pd.RangeIndex(inicio, inicio + len(df))
+            inicio += len(df)
+            partes.append(df)
+        return pd.concat(partes)
+
+    def ler_arquivo_em_blocos(self, caminho_arquivo: str, tamanho_bloco: int) -> Iterator[pd.DataFrame]:
+        """
+        Lê um arquivo de respostas em blocos de linhas, em qualquer formato suportado
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo (.xlsx, .csv, .csv.gz ou .parquet)
+            tamanho_bloco: Quantidade máxima de linhas por bloco
+
+        Yields:
+            DataFrames com até ``tamanho_bloco`` linhas
+        """
+        formato = self.detectar_formato(caminho_arquivo)
+        if formato == ".xlsx":
+            yield from self.ler_planilha_em_blocos(caminho_arquivo, tamanho_bloco)
+
+        elif formato == ".parquet":
+            import pyarrow.parquet as pq
+
+            inicio = 0
+            for lote in pq.ParquetFile(caminho_arquivo).iter_batches(batch_size=tamanho_bloco):
+                df = lote.to_pandas()
+                df.index = pd.RangeIndex(inicio, inicio + len(df))
+                inicio += len(df)
+                yield df
+
+        else:
+            with pd.read_csv(caminho_arquivo, chunksize=tamanho_bloco, **self._opcoes_csv()) as leitor:
+                yield from leitor
+
+    def _opcoes_csv(self) -> Dict[str, Any]:
+        """
+        Opções de leitura de CSV vindas de ``configuracoes_gerais``
+
+        A primeira coluna (carimbo de data/hora) é convertida com
+        ``formato_data`` para ficar com o mesmo tipo lido do Excel.
+
+        Returns:
+            Argumentos nomeados para ``pd.read_csv``
+        """
+        configuracoes = self.config.get("configuracoes_gerais", {})
+        return {
+            "sep": configuracoes.get("separador_csv", ","),
+            "encoding": configuracoes.get("encoding", "utf-8"),
+            "parse_dates": [0],
+            "date_format": configuracoes.get("formato_data")
+        }
+
+    def ler_planilha_em_blocos(self, caminho_arquivo: str, tamanho_bloco: int,
+                               sheet_name: str = None) -> Iterator[pd.DataFrame]:
+        """
+        Lê uma planilha Excel em blocos de linhas com memória limitada
+
+        Usa o modo somente leitura do openpyxl, que percorre a planilha sem
+        carregá-la inteira. Cada bloco mantém o índice que a linha teria
+        em ``ler_planilha_excel``, preservando os ids ``EST_n``/``MEN_n``.
+        Linhas totalmente vazias são ignoradas.
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo Excel (.xlsx)
+            tamanho_bloco: Quantidade máxima de linhas por bloco
+            sheet_name: Nome da aba (opcional)
+
+        Yields:
+            DataFrames com até ``tamanho_bloco`` linhas
+        """
+        from openpyxl import load_workbook
+
+        if tamanho_bloco <= 0:
+            raise ValueError(
+                f"Tamanho de bloco inválido: {tamanho_bloco}")
+
+        workbook = load_workbook(caminho_arquivo, read_only=True, data_only=True)
+        try:
+            planilha = workbook[sheet_name] if sheet_name else workbook.active
+            linhas = planilha.iter_rows(values_only=True)
+            cabecalho = list(next(linhas, ()))
+
+            bloco, indices, total = [], [], 0
+            for posicao, linha in enumerate(linhas):
+                if all(valor is None for valor in linha):
+                    continue
+                bloco.append(linha)
+                indices.append(posicao)
+
+                if len(bloco) == tamanho_bloco:
+                    total += len(bloco)
+                    yield self._montar_bloco(bloco, indices, cabecalho)
+                    bloco, indices = [], []
+
+            if bloco:
+                total += len(bloco)
+                yield self._montar_bloco(bloco, indices, cabecalho)
+
+            logger.info(
+                f"Planilha {caminho_arquivo} lida em blocos com {total} registros")
+
+        except Exception as e:
+            logger.error(f"Erro ao ler planilha {caminho_arquivo}: {e}")
+            raise
+        finally:
+            workbook.close()
+
+    def _montar_bloco(self, linhas: List[tuple], indices: List[int], cabecalho: List) -> pd.DataFrame:
+        """
+        Monta um DataFrame a partir de linhas cruas da planilha
+
+        Args:
+            linhas: Valores das linhas do bloco
+            indices: Posição de cada linha na planilha (sem o cabeçalho)
+            cabecalho: Valores da primeira linha da planilha
+
+        Returns:
+            DataFrame do bloco
+        """
+        df = pd.DataFrame(linhas, index=indices)
+        df.columns = [
+            cabecalho[i] if i < len(cabecalho) and cabecalho[i] is not None else f"Unnamed: {i}"
+            for i in range(df.shape[1])
+        ]
+        return df
+
+    def normalizar_bloco_respostas(self, bloco: pd.DataFrame, minusculas: bool = True) -> np.ndarray:
+        """
+        Normaliza um bloco de respostas para texto sem espaços extras
+
+        Args:
+            bloco: DataFrame apenas com as colunas de respostas
+            minusculas: Se True, converte o texto para minúsculas
+
+        Returns:
+            Matriz de strings (linhas x perguntas); células vazias viram ""
+        """
+        if minusculas:
+            textos = bloco.astype(str).apply(lambda col: col.str.lower().str.strip())
+        else:
+            textos = bloco.astype(str).apply(lambda col: col.str.strip())
+        return textos.where(bloco.notna(), "").to_numpy(dtype=object)
+
+    def converter_timestamps(self, coluna: pd.Series) -> pd.Series:
+        """
+        Converte uma coluna de carimbos de data/hora de uma só vez
+
+        Textos são lidos com ``configuracoes_gerais.formato_data`` e, se não
+        casarem, como ISO 8601 (ex.: "2025-03-04 10:00"). Datas já lidas
+        pelo Excel são mantidas.
+
+        Args:
+            coluna: Coluna de carimbos de data/hora
+
+        Returns:
+            Série datetime64 com NaT nos valores ausentes ou inválidos
+        """
+        if pd.api.types.is_datetime64_any_dtype(coluna):
+            return coluna
+
+        formato = self.config.get("configuracoes_gerais", {}).get("formato_data")
+        convertidos = pd.to_datetime(coluna, format=formato, errors="coerce") if formato \
+            else pd.Series(pd.NaT, index=coluna.index, dtype="datetime64[us]")
+        restantes = convertidos.isna().to_numpy() & coluna.notna().to_numpy()
+        if restantes.any():
+            convertidos[restantes] = pd.to_datetime(
+                coluna[restantes], format="ISO8601", errors="coerce")
+        return convertidos
+
+    def extrair_identificacao(self, df: pd.DataFrame, coluna_user_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Extrai timestamps e user_ids de um bloco de respostas
+
+        A primeira coluna é convertida por converter_timestamps; valores
+        ausentes ou inválidos ficam como NaT (os inválidos são avisados no
+        log), para que a mesma planilha gere sempre o mesmo resultado.
+        user_ids ausentes viram ``USR_<timestamp>_<linha>`` (ou
+        ``USR_sem_data_<linha>``), gerados para o bloco inteiro de uma vez.
+
+        Args:
+            df: DataFrame com respostas do questionário
+            coluna_user_id: Posição da coluna com o ID da usuária
+
+        Returns:
+            Tupla (timestamps, user_ids)
+        """
+        coluna_timestamp = df.iloc[:, 0]
+        convertidos = self.converter_timestamps(coluna_timestamp)
+        invalidos = convertidos.isna().to_numpy() & coluna_timestamp.notna().to_numpy()
+        if invalidos.any():
+            exemplos = coluna_timestamp[invalidos].astype(str).unique()[:3].tolist()
+            logger.warning(f"{int(invalidos.sum())} carimbos de data/hora inválidos "
+                           f"(ex.: {exemplos}); mantidos sem data")
+        timestamps = convertidos
+
+        ids_informados = df.iloc[:, coluna_user_id]
+        ids_texto = ids_informados.astype(str).str.strip()
+        sem_id = ids_informados.isna().to_numpy() | (ids_texto == "").to_numpy()
+        user_ids = ids_texto.to_numpy(dtype=object)
+        if sem_id.any():
+            linhas = pd.Series(df.index[sem_id] + 1).astype(str).str.zfill(3).to_numpy()
+            datas = timestamps[sem_id].dt.strftime("%Y%m%d_%H%M%S").fillna("sem_data")
+            user_ids[sem_id] = "USR_" + datas.to_numpy(dtype=object) + "_" + linhas
+
+        return timestamps.to_numpy(), user_ids
+
+    def processar_questionario_estresse(self, df: pd.DataFrame) -> ResultadosEstresse:
         """
         Processa questionário de estresse
 
+        As respostas são pontuadas coluna a coluna: o bloco de perguntas
+        vira uma matriz de pontos somada por linha e os níveis são obtidos
+        por busca nas faixas de interpretação.
+
         Args:
             df: DataFrame com respostas do questionário
 
         Returns:
-            Lista com resultados processados
+            Tabela colunar com os resultados processados
         """
-        resultados = []
         config_estresse = self.config["questionarios"]["estresse"]
         escala = config_estresse["escala"]
         interpretacao = config_estresse["interpretacao"]
+        perguntas = [f"Q{i}" for i in range(1, 11)]
 
-        for index, row in df.iterrows():
-            try:
-                # Extrair informações básicas
-                timestamp = row.iloc[0] if pd.notna(
-                    row.iloc[0]) else datetime.now()
-
-                # Usar ID da usuária da coluna 11 (índice 11) ou gerar fallback
-                user_id = str(row.iloc[11]).strip() if pd.notna(row.iloc[11]) and len(str(
-                    row.iloc[11]).strip()) > 0 else f"USR_{timestamp.strftime('%Y%m%d_%H%M%S')}_{index+1:03d}"
-
-                # Processar respostas (colunas 1-10, perguntas do questionário)
-                respostas = []
-                pontuacao_total = 0
-
-                for i in range(1, 11):  # Apenas as 10 perguntas (colunas 1-10)
-                    resposta = str(row.iloc[i]).lower(
-                    ).strip() if pd.notna(row.iloc[i]) else ""
-
-                    # Converter resposta para pontuação
-                    pontos = 0
-                    for key, value in escala.items():
-                        if key in resposta:
-                            pontos = value
-                            break
-
-                    respostas.append({
-                        "pergunta": f"Q{i}",
-                        "resposta": resposta,
-                        "pontos": pontos
-                    })
-                    pontuacao_total += pontos
-
-                # Determinar nível de estresse
-                nivel_estresse = "baixo"
-                for nivel, config in interpretacao.items():
-                    if config["min"] <= pontuacao_total <= config["max"]:
-                        nivel_estresse = nivel
-                        break
-
-                resultado = {
-                    "id": f"EST_{index+1}",
-                    "user_id": user_id,
-                    "timestamp": timestamp,
-                    "respostas": respostas,
-                    "pontuacao_total": pontuacao_total,
-                    "nivel_estresse": nivel_estresse,
-                    "cor_indicativa": interpretacao[nivel_estresse]["cor"],
-                    "total_perguntas": len(respostas)
-                }
+        if df.shape[1] < 12:
+            logger.error(
+                f"Planilha de estresse com {df.shape[1]} colunas; esperado ao menos 12")
+            return ResultadosEstresse.vazio(perguntas)
 
-                resultados.append(resultado)
-                logger.info(
+        # Usar ID da usuária da coluna 11 (índice 11), ou a indicada em
+        # colunas.user_id, ou gerar fallback
+        try:
+            coluna_user_id = self.localizar_coluna_user_id("estresse", df.columns, 11)
+        except ValueError as e:
+            logger.error(f"Planilha de estresse: {e}")
+            return ResultadosEstresse.vazio(perguntas)
+        timestamps, user_ids = self.extrair_identificacao(df, coluna_user_id)
+
+        # Apenas as 10 perguntas (colunas 1-10)
+        codigos, vocabulario = codificar(
+            self.normalizar_bloco_respostas(df.iloc[:, 1:11]))
+        # Vale a primeira chave da escala contida na resposta, na ordem do config.json
+        pontos_vocabulario, _ = pontuar_vocabulario(
+            vocabulario, compilar_escala(escala), priorizar_identicas=False)
+        pontos = pontos_vocabulario[codigos]
+        niveis = classificar_faixas(pontos.sum(axis=1), compilar_faixas(interpretacao), "baixo")
+        codigos_nivel, nomes_niveis = codificar(niveis)
+
+        resultados = ResultadosEstresse(
+            linhas=df.index.to_numpy(),
+            user_ids=user_ids,
+            timestamps=timestamps,
+            codigos_respostas=codigos,
+            vocabulario_respostas=vocabulario,
+            pontos=pontos,
+            codigos_nivel=codigos_nivel,
+            niveis=nomes_niveis,
+            cores=[interpretacao.get(nivel, {}).get("cor")
+                   for nivel in nomes_niveis],
+            perguntas=perguntas
+        )
+
+        self.registrar_processamento("estresse", resultados.nivel_estresse)
+        if logger.isEnabledFor(logging.DEBUG):
+            for user_id, pontuacao_total, nivel_estresse in zip(
+                    resultados.user_ids, resultados.pontuacao_total, resultados.nivel_estresse):
+                logger.debug(
                     f"Processado questionário de estresse para {user_id}: {pontuacao_total} pontos - {nivel_estresse}")
 
-            except Exception as e:
-                logger.error(f"Erro ao processar linha {index}: {e}")
-                continue
-
         return resultados
 
-    def processar_questionario_menacme(self, df: pd.DataFrame) -> List[Dict]:
+    def registrar_processamento(self, questionario: str, classificacoes: np.ndarray):
+        """
+        Registra no log um resumo agregado de um bloco processado
+
+        Substitui a linha de log por participante, que dominava o tempo de
+        execução em arquivos grandes (ela continua disponível em DEBUG).
+
+        Args:
+            questionario: Nome do questionário
+            classificacoes: Nível ou fase de cada participante do bloco
+        """
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        nomes, contagens = np.unique(
+            np.asarray(classificacoes, dtype=str), return_counts=True)
+        distribuicao = ", ".join(
+            f"{nome}: {contagem}" for nome, contagem in zip(nomes, contagens))
+        logger.info(
+            f"Processados {len(classificacoes)} questionários de {questionario} ({distribuicao})")
+
+    def compilar_palavras_chave_menacme(self) -> Dict[str, "re.Pattern"]:
+        """
+        Compila as listas de palavras-chave do menacme em expressões regulares
+
+        As listas vêm de ``questionarios.menacme.palavras_chave`` e cada uma
+        vira um único padrão alternado. A compilação acontece uma vez por
+        instância do processador.
+
+        Returns:
+            Dicionário {categoria: padrão compilado}
+        """
+        if self._padroes_menacme is None:
+            palavras_chave = dict(
+                self.configuracao_padrao()["questionarios"]["menacme"]["palavras_chave"])
+            palavras_chave.update(
+                self.config["questionarios"]["menacme"].get("palavras_chave", {}))
+
+            self._padroes_menacme = {
+                categoria: re.compile("|".join(re.escape(palavra.lower()) for palavra in palavras)
+                                      if palavras else r"(?!)")
+                for categoria, palavras in palavras_chave.items()
+            }
+        return self._padroes_menacme
+
+    def detectar_palavras_chave(self, codigos: np.ndarray, vocabulario: np.ndarray) -> Dict[str, np.ndarray]:
+        """
+        Aplica os padrões de palavras-chave do menacme a uma matriz de respostas
+
+        Cada texto distinto é avaliado uma única vez por padrão
+        (``str.contains``) e o resultado é espalhado para a matriz.
+
+        Args:
+            codigos: Matriz de códigos das respostas (linhas x perguntas)
+            vocabulario: Texto correspondente a cada código
+
+        Returns:
+            Dicionário {categoria: matriz booleana com o formato de ``codigos``}
+        """
+        vocabulario_minusculo = pd.Series(vocabulario, dtype=object).str.lower()
+
+        return {
+            categoria: vocabulario_minusculo.str.contains(padrao, regex=True).to_numpy(
+                dtype=bool)[codigos]
+            for categoria, padrao in self.compilar_palavras_chave_menacme().items()
+        }
+
+    def classificar_fases_menopausa(self, sintomas_intensos: np.ndarray,
+                                    irregularidade_menstrual: np.ndarray) -> np.ndarray:
+        """
+        Classifica a fase da menopausa a partir dos contadores por participante
+
+        Args:
+            sintomas_intensos: Quantidade de respostas com sintomas intensos
+            irregularidade_menstrual: Indica se alguma resposta aponta irregularidade
+
+        Returns:
+            Vetor com a fase de cada participante
+        """
+        return np.select(
+            [(sintomas_intensos >= 5) & irregularidade_menstrual,
+             sintomas_intensos >= 3],
+            ["pos_menopausa", "perimenopausa"],
+            default="pre_menopausa"
+        ).astype(object)
+
+    def processar_questionario_menacme(self, df: pd.DataFrame) -> ResultadosMenacme:
         """
         Processa questionário de menacme
 
+        Sintomas e fase são calculados sobre o bloco inteiro de respostas
+        com os padrões compilados de palavras-chave.
+
         Args:
             df: DataFrame com respostas do questionário
 
         Returns:
-            Lista com resultados processados
+            Tabela colunar com os resultados processados
         """
-        resultados = []
+        if df.shape[1] < 2:
+            logger.error(
+                f"Planilha de menacme com {df.shape[1]} colunas; esperado ao menos 2")
+            return ResultadosMenacme.vazio()
 
-        for index, row in df.iterrows():
-            try:
-                # Extrair informações básicas
-                timestamp = row.iloc[0] if pd.notna(
-                    row.iloc[0]) else datetime.now()
-
-                # Usar ID da usuária da última coluna ou gerar fallback
-                user_id = str(row.iloc[-1]).strip() if pd.notna(row.iloc[-1]) and len(str(
-                    row.iloc[-1]).strip()) > 0 else f"USR_{timestamp.strftime('%Y%m%d_%H%M%S')}_{index+1:03d}"
-
-                # Processar respostas específicas do menacme (todas as colunas exceto primeira e última)
-                respostas = []
-                sintomas_menacme = []
-
-                # Excluir primeira (timestamp) e última (user_id)
-                for i in range(1, len(row)-1):
-                    resposta = str(row.iloc[i]).strip(
-                    ) if pd.notna(row.iloc[i]) else ""
-                    respostas.append({
-                        "pergunta": f"M{i}",
-                        "resposta": resposta
-                    })
-
-                    # Identificar sintomas (você pode personalizar esta lógica)
-                    if any(palavra in resposta.lower() for palavra in ["sim", "frequente", "intenso"]):
-                        sintomas_menacme.append(f"M{i}")
-
-                # Determinar fase da menopausa (lógica personalizada)
-                fase_menopausa = self.determinar_fase_menopausa(respostas)
-
-                resultado = {
-                    "id": f"MEN_{index+1}",
-                    "user_id": user_id,
-                    "timestamp": timestamp,
-                    "respostas": respostas,
-                    "sintomas_identificados": sintomas_menacme,
-                    "fase_menopausa": fase_menopausa,
-                    "total_perguntas": len(respostas)
-                }
-
-                resultados.append(resultado)
-                logger.info(
+        # Usar ID da usuária da última coluna, ou a indicada em
+        # colunas.user_id, ou gerar fallback
+        try:
+            coluna_user_id = self.localizar_coluna_user_id("menacme", df.columns, -1)
+        except ValueError as e:
+            logger.error(f"Planilha de menacme: {e}")
+            return ResultadosMenacme.vazio()
+        timestamps, user_ids = self.extrair_identificacao(
+            df, coluna_user_id)
+
+        # Excluir primeira (timestamp) e a do user_id
+        colunas_respostas = [i for i in range(1, df.shape[1]) if i != coluna_user_id]
+        codigos, vocabulario = codificar(self.normalizar_bloco_respostas(
+            df.iloc[:, colunas_respostas], minusculas=False))
+        deteccoes = self.detectar_palavras_chave(codigos, vocabulario)
+        fases = self.classificar_fases_menopausa(
+            deteccoes["sintoma_intenso"].sum(axis=1),
+            deteccoes["irregularidade_menstrual"].any(axis=1))
+        codigos_fase, nomes_fases = codificar(fases)
+
+        resultados = ResultadosMenacme(
+            linhas=df.index.to_numpy(),
+            user_ids=user_ids,
+            timestamps=timestamps,
+            codigos_respostas=codigos,
+            vocabulario_respostas=vocabulario,
+            sintomas=deteccoes["sintoma"],
+            codigos_fase=codigos_fase,
+            fases=nomes_fases,
+            perguntas=[f"M{i}" for i in range(1, df.shape[1] - 1)]
+        )
+
+        self.registrar_processamento("menacme", resultados.fase_menopausa)
+        if logger.isEnabledFor(logging.DEBUG):
+            for user_id, fase_menopausa in zip(resultados.user_ids, resultados.fase_menopausa):
+                logger.debug(
                     f"Processado questionário de menacme para {user_id}: {fase_menopausa}")
 
-            except Exception as e:
-                logger.error(f"Erro ao processar linha {index}: {e}")
-                continue
+        return resultados
 
+    def localizar_coluna_user_id(self, questionario: str, colunas: List, padrao: int) -> int:
+        """
+        Posição da coluna de user_id de um questionário
+
+        Usa ``questionarios.<nome>.colunas.user_id`` (posição ou trecho do
+        cabeçalho) quando definido; caso contrário, a posição padrão.
+
+        Args:
+            questionario: Nome do questionário
+            colunas: Cabeçalhos da planilha
+            padrao: Posição usada quando a coluna não está configurada
+
+        Returns:
+            Posição da coluna (não negativa)
+
+        Raises:
+            ValueError: Se a coluna configurada não for encontrada
+        """
+        especificacao = self.config["questionarios"][questionario].get(
+            "colunas", {}).get("user_id", padrao)
+        return localizar_coluna(colunas, especificacao)
+
+    def obter_plano(self, questionario: str) -> PlanoPontuacao:
+        """
+        Retorna o plano de pontuação compilado de um questionário declarado
+
+        A compilação acontece uma vez por instância do processador.
+
+        Args:
+            questionario: Nome do questionário no config.json
+
+        Returns:
+            Plano de pontuação
+        """
+        if questionario not in self._planos:
+            self._planos[questionario] = PlanoPontuacao(
+                questionario, self.config["questionarios"][questionario])
+        return self._planos[questionario]
+
+    def processar_questionario_configurado(self, questionario: str, df: pd.DataFrame) -> ResultadosQuestionario:
+        """
+        Processa um questionário declarado no config.json (tipos "escala" e "categorico")
+
+        As colunas são localizadas pelo cabeçalho, as respostas distintas
+        são pontuadas uma vez e a matriz de pontos (com itens invertidos)
+        é somada por linha e classificada nas faixas de interpretação.
+
+        Args:
+            questionario: Nome do questionário no config.json
+            df: DataFrame com respostas do questionário
+
+        Returns:
+            Tabela colunar com os resultados processados
+        """
+        plano = self.obter_plano(questionario)
+        try:
+            coluna_timestamp, coluna_user_id, colunas_perguntas = plano.resolver_colunas(df.columns)
+        except ValueError as e:
+            logger.error(f"Planilha de {questionario}: {e}")
+            return self.tabela_vazia(questionario)
+
+        identificacao = df.iloc[:, [coluna_timestamp, coluna_user_id]]
+        timestamps, user_ids = self.extrair_identificacao(identificacao, 1)
+
+        # Escalas numéricas com respostas em branco chegam como float ("3.0")
+        respostas = df.iloc[:, colunas_perguntas].apply(
+            lambda coluna: coluna.astype("Int64") if pd.api.types.is_float_dtype(coluna)
+            and (coluna.dropna() % 1 == 0).all() else coluna)
+        codigos, vocabulario = codificar(self.normalizar_bloco_respostas(
+            respostas, minusculas=False))
+        pontos = codigos_nivel = None
+        nomes_niveis = []
+        if plano.pontuado:
+            pontos = plano.pontuar(codigos, vocabulario)
+            codigos_nivel, nomes_niveis = codificar(plano.classificar(pontos.sum(axis=1)))
+
+        resultados = ResultadosQuestionario(
+            linhas=df.index.to_numpy(),
+            user_ids=user_ids,
+            timestamps=timestamps,
+            codigos_respostas=codigos,
+            vocabulario_respostas=vocabulario,
+            pontos=pontos,
+            codigos_nivel=codigos_nivel,
+            niveis=nomes_niveis,
+            cores=[plano.cores.get(nivel) for nivel in nomes_niveis],
+            perguntas=plano.rotulos(len(colunas_perguntas)),
+            prefixo_id=plano.prefixo_id
+        )
+
+        if plano.pontuado:
+            self.registrar_processamento(questionario, resultados.nivel)
+        else:
+            logger.info(f"Processados {len(resultados)} questionários de {questionario}")
         return resultados
 
-    def determinar_fase_menopausa(self, respostas: List[Dict]) -> str:
+    def combinar_por_usuario(self, resultados_estresse: ResultadosEstresse,
+                             resultados_menacme: ResultadosMenacme) -> ResultadosCombinados:
+        """
+        Combina os resultados dos dois questionários por user_id
+
+        A junção usa um índice por user_id (tempo linear) e produz apenas
+        pares de posições nas duas tabelas. Participantes com mais de um
+        envio seguem a política ``politica_duplicatas`` de
+        ``configuracoes_gerais``:
+
+        - ``"ultima"``: usa o último envio de cada questionário (ordem da planilha)
+        - ``"primeira"``: usa o primeiro envio de cada questionário
+        - ``"todas"``: combina todos os pares de envios (comportamento antigo)
+
+        Args:
+            resultados_estresse: Resultados do questionário de estresse
+            resultados_menacme: Resultados do questionário de menacme
+
+        Returns:
+            Resultados combinados
+        """
+        politica = self.obter_politica_duplicatas()
+
+        indice_menacme = {}
+        for posicao, user_id in enumerate(resultados_menacme.user_ids.tolist()):
+            indice_menacme.setdefault(user_id, []).append(posicao)
+
+        pares = []
+        if politica == "todas":
+            for posicao, user_id in enumerate(resultados_estresse.user_ids.tolist()):
+                for posicao_menacme in indice_menacme.get(user_id, []):
+                    pares.append((posicao, posicao_menacme))
+        else:
+            escolha = -1 if politica == "ultima" else 0
+            estresse_por_usuario = {}
+            for posicao, user_id in enumerate(resultados_estresse.user_ids.tolist()):
+                if politica == "ultima" or user_id not in estresse_por_usuario:
+                    estresse_por_usuario[user_id] = posicao
+
+            for user_id, posicao in estresse_por_usuario.items():
+                envios_menacme = indice_menacme.get(user_id)
+                if envios_menacme:
+                    pares.append((posicao, envios_menacme[escolha]))
+
+        posicoes = np.array(pares, dtype=np.int64).reshape(-1, 2)
+        return ResultadosCombinados(resultados_estresse, resultados_menacme,
+                                    posicoes[:, 0], posicoes[:, 1])
+
+    def listar_questionarios(self) -> List[str]:
+        """
+        Questionários a processar: estresse, menacme e os demais do config.json
+
+        Returns:
+            Nomes dos questionários, na ordem dos resultados
+        """
+        declarados = [questionario for questionario in self.config.get("questionarios", {})
+                      if questionario not in ("estresse", "menacme")]
+        return ["estresse", "menacme"] + declarados
+
+    def tipo_questionario(self, questionario: str) -> str:
+        """
+        Tipo de um questionário (``questionarios.<nome>.tipo``)
+
+        Args:
+            questionario: Nome do questionário
+
+        Returns:
+            "estresse", "menacme", "escala" ou "categorico"
+
+        Raises:
+            ValueError: Se o tipo não for conhecido
         """
-        Determina a fase da menopausa baseada nas respostas
+        tipo = self.config.get("questionarios", {}).get(questionario, {}).get("tipo", questionario)
+        if tipo not in PROCESSADORES_POR_TIPO:
+            raise ValueError(f"Tipo de questionário inválido em {questionario}: {tipo}. "
+                             f"Use {', '.join(PROCESSADORES_POR_TIPO)}")
+        return tipo
+
+    def classe_resultados(self, questionario: str) -> type:
+        """
+        Classe da tabela de resultados de um questionário
 
         Args:
-            respostas: Lista de respostas do questionário
+            questionario: Nome do questionário
 
         Returns:
-            Fase da menopausa identificada
+            Subclasse de TabelaResultados
         """
-        # Lógica personalizada para determinar a fase
-        # Você pode ajustar esta lógica conforme seus critérios específicos
+        return TABELAS_RESULTADOS[self.tipo_questionario(questionario)]
 
-        sintomas_intensos = 0
-        irregularidade_menstrual = False
+    def tabela_vazia(self, questionario: str) -> TabelaResultados:
+        """
+        Tabela sem participantes de um questionário
 
-        for resposta in respostas:
-            texto = resposta["resposta"].lower()
+        Args:
+            questionario: Nome do questionário
 
-            if any(palavra in texto for palavra in ["muito frequente", "intenso", "severo"]):
-                sintomas_intensos += 1
+        Returns:
+            Tabela vazia do tipo do questionário
+        """
+        if self.tipo_questionario(questionario) not in TIPOS_PLANO:
+            return self.classe_resultados(questionario).vazio()
+        plano = self.obter_plano(questionario)
+        return ResultadosQuestionario.vazio(
+            plano.rotulos(len(plano.colunas_perguntas or [])), plano.prefixo_id, plano.pontuado)
+
+    def obter_funcao_processamento(self, questionario: str) -> Callable[[pd.DataFrame], TabelaResultados]:
+        """
+        Retorna o método que processa o DataFrame de um questionário
 
-            if any(palavra in texto for palavra in ["irregular", "parou", "ausente"]):
-                irregularidade_menstrual = True
+        O método vem de PROCESSADORES_POR_TIPO, conforme o tipo declarado.
 
-        if sintomas_intensos >= 5 and irregularidade_menstrual:
-            return "pos_menopausa"
-        elif sintomas_intensos >= 3:
-            return "perimenopausa"
+        Args:
+            questionario: Nome do questionário
+
+        Returns:
+            Método de processamento correspondente
+        """
+        tipo = self.tipo_questionario(questionario)
+        metodo = getattr(self, PROCESSADORES_POR_TIPO[tipo])
+        if tipo in TIPOS_PLANO:
+            return functools.partial(metodo, questionario)
+        return metodo
+
+    def pontuar_bloco(self, questionario: str, bloco: pd.DataFrame) -> TabelaResultados:
+        """
+        Pontua um bloco de respostas registrando tempo e linhas descartadas
+
+        Args:
+            questionario: Nome do questionário
+            bloco: Linhas a pontuar
+
+        Returns:
+            Tabela colunar com os resultados do bloco
+        """
+        with self.metricas.medir("pontuacao") as etapa:
+            resultados = self.obter_funcao_processamento(questionario)(bloco)
+            etapa["linhas"] = len(bloco)
+            etapa["erros"] = len(bloco) - len(resultados)
+        return resultados
+
+    def obter_politica_duplicatas(self) -> str:
+        """
+        Política de duplicatas de ``configuracoes_gerais``
+
+        Returns:
+            "ultima", "primeira" ou "todas"
+
+        Raises:
+            ValueError: Se a política não for conhecida
+        """
+        politica = self.config.get("configuracoes_gerais", {}).get(
+            "politica_duplicatas", "ultima")
+        if politica not in ("ultima", "primeira", "todas"):
+            raise ValueError(
+                f"Política de duplicatas inválida: {politica}. Use 'ultima', 'primeira' ou 'todas'")
+        return politica
+
+    def posicao_coluna_timestamp(self, questionario: str, colunas: List) -> int:
+        """
+        Posição da coluna de carimbo de data/hora de um questionário
+
+        Args:
+            questionario: Nome do questionário
+            colunas: Cabeçalhos da planilha
+
+        Returns:
+            Posição da coluna
+        """
+        if self.tipo_questionario(questionario) in TIPOS_PLANO:
+            return self.obter_plano(questionario).resolver_colunas(colunas)[0]
+        return 0
+
+    def calcular_chaves_envios(self, df: pd.DataFrame) -> np.ndarray:
+        """
+        Chave de cada envio: hash de user_id, carimbo de data/hora e respostas
+
+        A linha inteira entra no hash, então dois envios só têm a mesma
+        chave se forem cópias um do outro (por exemplo, lotes exportados
+        com linhas em comum).
+
+        Args:
+            df: Linhas do questionário
+
+        Returns:
+            Vetor uint64 com a chave de cada linha
+        """
+        return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+    def deduplicar_envios(self, questionario: str, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Remove envios repetidos antes da pontuação
+
+        Cópias de um mesmo envio (mesma chave) são removidas, ficando a
+        primeira (assim um lote novo que repete linhas antigas não altera
+        os resultados já pontuados). Em seguida, com a
+        política ``"ultima"`` ou ``"primeira"``, cada user_id fica só com o
+        envio mais recente ou mais antigo (pelo carimbo de data/hora; em
+        empate, pela ordem dos lotes). Linhas sem user_id nunca são
+        agrupadas entre si.
+
+        Args:
+            questionario: Nome do questionário
+            df: Linhas do questionário
+
+        Returns:
+            Linhas mantidas, na ordem original (com o índice de origem)
+        """
+        if df.empty:
+            return df
+
+        politica = self.obter_politica_duplicatas()
+        chaves = self.calcular_chaves_envios(df)
+        manter = ~pd.Series(chaves).duplicated().to_numpy()
+
+        if politica != "todas":
+            ids_informados = df.iloc[:, self.posicao_coluna_user_id(questionario, df.columns)]
+            ids_texto = ids_informados.astype(str).str.strip()
+            com_id = manter & ids_informados.notna().to_numpy() & (ids_texto != "").to_numpy()
+
+            envios = pd.DataFrame({
+                "user_id": ids_texto.to_numpy()[com_id],
+                "timestamp": self.converter_timestamps(
+                    df.iloc[:, self.posicao_coluna_timestamp(questionario, df.columns)]).to_numpy()[com_id],
+                "posicao": np.flatnonzero(com_id)
+            }).sort_values(["timestamp", "posicao"], kind="stable", na_position="first")
+            repetidos = envios["posicao"].to_numpy()[envios.duplicated(
+                "user_id", keep="last" if politica == "ultima" else "first").to_numpy()]
+            manter[repetidos] = False
+
+        removidos = len(df) - int(manter.sum())
+        if removidos:
+            logger.info(f"{questionario}: {removidos} envios repetidos removidos ({politica})")
+        return df[manter]
+
+    def ler_blocos_questionario(self, questionario: str, caminhos: List[str]) -> Iterator[pd.DataFrame]:
+        """
+        Lê os lotes de um questionário inteiros ou em blocos, já sem envios repetidos
+
+        Sem leitura em blocos, todos os lotes são lidos juntos e
+        deduplicados de uma vez (deduplicar_envios). Com
+        ``configuracoes_gerais.tamanho_bloco_leitura``, os lotes são lidos
+        em sequência e só as cópias são descartadas, por um conjunto de
+        chaves já vistas; a política de duplicatas é aplicada depois, sobre
+        a tabela pontuada (deduplicar_resultados).
+
+        Args:
+            questionario: Nome do questionário
+            caminhos: Arquivos retornados por localizar_arquivos_questionario
+
+        Yields:
+            DataFrames a processar (um único se a leitura em blocos estiver desativada)
+        """
+        tamanho_bloco = self.obter_tamanho_bloco_leitura()
+        if tamanho_bloco:
+            blocos = self._ler_lotes_em_blocos(questionario, caminhos, tamanho_bloco)
         else:
-            return "pre_menopausa"
+            # Bloco único, lido só no primeiro next() (dentro da medição abaixo)
+            blocos = (self.deduplicar_envios(questionario, self.ler_arquivos_questionario(lotes))
+                      for lotes in [caminhos])
+
+        # O tempo de leitura é medido bloco a bloco, fora da pontuação
+        while True:
+            with self.metricas.medir("leitura") as etapa:
+                bloco = next(blocos, None)
+                if bloco is not None:
+                    etapa["linhas"] = len(bloco)
+            if bloco is None:
+                return
+            yield bloco
+
+    def _ler_lotes_em_blocos(self, questionario: str, caminhos: List[str],
+                             tamanho_bloco: int) -> Iterator[pd.DataFrame]:
+        """
+        Lê os lotes em sequência, em blocos, descartando cópias de envios já vistos
+
+        Args:
+            questionario: Nome do questionário
+            caminhos: Arquivos dos lotes
+            tamanho_bloco: Quantidade máxima de linhas por bloco
+
+        Yields:
+            Blocos com posições contínuas entre os lotes
+        """
+        chaves_vistas = set()
+        inicio = 0
+        for caminho in caminhos:
+            fim = inicio
+            for bloco in self.ler_arquivo_em_blocos(caminho, tamanho_bloco):
+                fim = inicio + int(bloco.index.max()) + 1 if len(bloco) else fim
+                bloco.index = bloco.index + inicio
+                chaves = self.calcular_chaves_envios(bloco)
+                manter = ~pd.Series(chaves).duplicated().to_numpy()
+                manter &= np.array([chave not in chaves_vistas for chave in chaves.tolist()], dtype=bool)
+                chaves_vistas.update(chaves.tolist())
+
+                if not manter.all():
+                    logger.debug(f"{questionario}: {int((~manter).sum())} envios repetidos removidos")
+                yield bloco[manter]
+            inicio = fim
+
+    def obter_tamanho_bloco_leitura(self) -> Optional[int]:
+        """
+        Linhas por bloco de ``configuracoes_gerais.tamanho_bloco_leitura``
 
-    def combinar_resultados(self, resultado_estresse: Dict, resultado_menacme: Dict) -> Dict:
+        Returns:
+            Tamanho do bloco, ou None se a leitura em blocos estiver desativada
         """
-        Combina resultados de estresse e menacme para um mesmo participante
+        return self.config.get("configuracoes_gerais", {}).get("tamanho_bloco_leitura") or None
+
+    def deduplicar_resultados(self, questionario: str, tabela: TabelaResultados) -> TabelaResultados:
+        """
+        Aplica a política de duplicatas à tabela pontuada de uma leitura em blocos
+
+        Cada bloco só conhece as próprias linhas, então o envio mais recente
+        (ou mais antigo) de cada user_id só pode ser escolhido depois que
+        todos foram lidos. A regra é a de ``deduplicar_envios``: carimbo de
+        data/hora e, em empate, a ordem das linhas. Os ids ``USR_`` gerados
+        para linhas sem user_id levam o número da linha e nunca se repetem.
 
         Args:
-            resultado_estresse: Resultado do questionário de estresse
-            resultado_menacme: Resultado do questionário de menacme
+            questionario: Nome do questionário
+            tabela: Resultados de todos os blocos, na ordem das linhas
 
         Returns:
-            Resultado combinado
+            Tabela só com os envios escolhidos, na ordem original
         """
-        return {
-            "id_combinado": f"COMB_{resultado_estresse['id']}_{resultado_menacme['id']}",
-            "user_id": resultado_estresse["user_id"],
-            "timestamp": max(resultado_estresse["timestamp"], resultado_menacme["timestamp"]),
-            "estresse": {
-                "pontuacao": resultado_estresse["pontuacao_total"],
-                "nivel": resultado_estresse["nivel_estresse"],
-                "cor": resultado_estresse["cor_indicativa"]
-            },
-            "menacme": {
-                "fase": resultado_menacme["fase_menopausa"],
-                "sintomas": resultado_menacme["sintomas_identificados"]
-            }
-        }
+        politica = self.obter_politica_duplicatas()
+        if politica == "todas" or not len(tabela):
+            return tabela
+
+        envios = pd.DataFrame({
+            "user_id": tabela.user_ids,
+            "timestamp": pd.to_datetime(pd.Series(tabela.timestamps), errors="coerce"),
+            "linha": tabela.linhas
+        }).sort_values(["timestamp", "linha"], kind="stable", na_position="first")
+        repetidos = envios.index.to_numpy()[envios.duplicated(
+            "user_id", keep="last" if politica == "ultima" else "first").to_numpy()]
+        if not len(repetidos):
+            return tabela
+
+        logger.info(f"{questionario}: {len(repetidos)} envios repetidos removidos ({politica})")
+        manter = np.ones(len(tabela), dtype=bool)
+        manter[repetidos] = False
+        return tabela.selecionar(manter)
+
+    def obter_configuracao_paralela(self) -> Tuple[int, int]:
+        """
+        Lê a configuração de processamento paralelo
+
+        Returns:
+            Tupla (quantidade de workers, linhas mínimas para paralelizar um bloco)
+        """
+        config_paralelo = self.config.get(
+            "configuracoes_gerais", {}).get("processamento_paralelo", {})
+        workers = config_paralelo.get("workers") or os.cpu_count() or 1
+        return max(1, int(workers)), int(config_paralelo.get("linhas_minimas_paralelo", 10000))
+
+    def dividir_em_fragmentos(self, df: pd.DataFrame, quantidade: int) -> List[pd.DataFrame]:
+        """
+        Divide um DataFrame em fragmentos contíguos de linhas
+
+        Args:
+            df: DataFrame a dividir
+            quantidade: Quantidade máxima de fragmentos
+
+        Returns:
+            Lista de fragmentos na ordem original
+        """
+        tamanho = max(1, -(-len(df) // quantidade))
+        return [df.iloc[inicio:inicio + tamanho] for inicio in range(0, len(df), tamanho)]
+
+    def processar_questionarios_paralelo(self, arquivos: Dict[str, List[str]], workers: int,
+                                         linhas_minimas: int) -> Dict[str, TabelaResultados]:
+        """
+        Pontua os questionários em um pool de processos
+
+        Blocos com pelo menos ``linhas_minimas`` linhas são divididos em
+        fragmentos entre os workers; blocos menores são pontuados no próprio
+        processo. No máximo ``2 * workers`` fragmentos ficam no pool ao mesmo
+        tempo: a leitura espera pelo fragmento mais antigo antes de enviar
+        outro, então só essa janela de blocos fica em memória. As partes
+        prontas são recolhidas durante a leitura, na ordem das linhas, de
+        forma determinística.
+
+        Args:
+            arquivos: Dicionário {questionario: caminhos dos lotes}
+            workers: Quantidade de processos
+            linhas_minimas: Tamanho mínimo de bloco para usar o pool
+
+        Returns:
+            Dicionário {questionario: resultados}
+        """
+        resultados_partes = {questionario: [] for questionario in arquivos}
+        # Partes ainda não entregues, na ordem das linhas: (questionario, parte, linhas)
+        pendentes = deque()
+        em_andamento = 0
+        limite_em_andamento = 2 * workers
+
+        # Recolhe as partes prontas da frente da fila, esperando pelo pool
+        # enquanto houver mais de ``limite`` fragmentos em andamento
+        def recolher(limite: int):
+            nonlocal em_andamento
+            while pendentes:
+                questionario, parte, linhas = pendentes[0]
+                if isinstance(parte, Future):
+                    if em_andamento <= limite and not parte.done():
+                        return
+                    # Tempo de espera pelo pool conta como pontuação
+                    with self.metricas.medir("pontuacao") as etapa:
+                        resultados_parte = parte.result()
+                        etapa["linhas"] = linhas
+                        etapa["erros"] = linhas - len(resultados_parte)
+                    em_andamento -= 1
+                else:
+                    resultados_parte = parte
+                pendentes.popleft()
+                resultados_partes[questionario].append(resultados_parte)
+
+        executor = None
+        try:
+            for questionario, caminhos in arquivos.items():
+                for bloco in self.ler_blocos_questionario(questionario, caminhos):
+                    if len(bloco) < linhas_minimas:
+                        pendentes.append((questionario, self.pontuar_bloco(questionario, bloco), len(bloco)))
+                        recolher(limite_em_andamento)
+                        continue
+
+                    if executor is None:
+                        executor = ProcessPoolExecutor(max_workers=workers)
+                    for fragmento in self.dividir_em_fragmentos(bloco, workers):
+                        pendentes.append((questionario, executor.submit(
+                            _pontuar_fragmento, self.config, questionario, fragmento), len(fragmento)))
+                        em_andamento += 1
+                        recolher(limite_em_andamento)
+            recolher(0)
+
+            resultados = {questionario: self.classe_resultados(questionario).concatenar(partes)
+                          for questionario, partes in resultados_partes.items()}
+            if self.obter_tamanho_bloco_leitura():
+                resultados = {questionario: self.deduplicar_resultados(questionario, tabela)
+                              for questionario, tabela in resultados.items()}
+            return resultados
+
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+
+    def processar_arquivos_questionario(self, caminhos: List[str], questionario: str) -> TabelaResultados:
+        """
+        Lê e processa os lotes de um questionário
+
+        O leitor é escolhido pela extensão de cada arquivo e os envios
+        repetidos são removidos antes da pontuação. Se
+        ``configuracoes_gerais.tamanho_bloco_leitura`` estiver definido, os
+        lotes são lidos e pontuados bloco a bloco, sem manter o DataFrame
+        inteiro em memória (só as tabelas colunares pontuadas se acumulam);
+        caso contrário são lidos de uma só vez. Os resultados só são
+        gravados depois que todos os lotes foram lidos.
+
+        Args:
+            caminhos: Arquivos dos lotes do questionário
+            questionario: Nome do questionário
+
+        Returns:
+            Tabela colunar com os resultados processados
+        """
+        resultados = self.classe_resultados(questionario).concatenar(
+            [self.pontuar_bloco(questionario, bloco)
+             for bloco in self.ler_blocos_questionario(questionario, caminhos)])
+        if self.obter_tamanho_bloco_leitura():
+            resultados = self.deduplicar_resultados(questionario, resultados)
+        return resultados
 
     def processar_todos_questionarios(self, diretorio_entrada: str) -> Dict:
         """
         Processa todos os questionários encontrados no diretório
 
+        Com um único worker (``processamento_paralelo.workers``), cada
+        questionário é lido e pontuado bloco a bloco no próprio processo.
+        Com mais de um, os blocos grandes são pontuados no pool por
+        ``processar_questionarios_paralelo``, com uma janela limitada de
+        fragmentos em andamento.
+
         Args:
-            diretorio_entrada: Diretório com os arquivos Excel
+            diretorio_entrada: Diretório com os arquivos exportados (.xlsx, .csv, .csv.gz ou .parquet)
 
         Returns:
-            Dicionário com todos os resultados
+            Dicionário com todos os resultados (tabelas colunares)
         """
-        resultados = {
-            "estresse": [],
-            "menacme": [],
-            "combinados": []
-        }
-
-        # Processar questionários de estresse
-        arquivo_estresse = os.path.join(
-            diretorio_entrada, "questionario_estresse.xlsx")
-        if os.path.exists(arquivo_estresse):
-            df_estresse = self.ler_planilha_excel(arquivo_estresse)
-            resultados["estresse"] = self.processar_questionario_estresse(
-                df_estresse)
-
-        # Processar questionários de menacme
-        arquivo_menacme = os.path.join(
-            diretorio_entrada, "questionario_menacme.xlsx")
-        if os.path.exists(arquivo_menacme):
-            df_menacme = self.ler_planilha_excel(arquivo_menacme)
-            resultados["menacme"] = self.processar_questionario_menacme(
-                df_menacme)
+        resultados = {questionario: self.tabela_vazia(questionario)
+                      for questionario in self.listar_questionarios()}
+        resultados["combinados"] = []
+
+        arquivos = {}
+        for questionario in self.listar_questionarios():
+            caminhos = self.localizar_arquivos_questionario(
+                diretorio_entrada, questionario)
+            if caminhos:
+                arquivos[questionario] = caminhos
+
+        # Processar todos os questionários encontrados
+        workers, linhas_minimas = self.obter_configuracao_paralela()
+        if workers > 1:
+            resultados.update(self.processar_questionarios_paralelo(
+                arquivos, workers, linhas_minimas))
+        else:
+            for questionario, caminhos in arquivos.items():
+                resultados[questionario] = self.processar_arquivos_questionario(
+                    caminhos, questionario)
 
         # Combinar resultados por user_id
-        for est in resultados["estresse"]:
-            for men in resultados["menacme"]:
-                if est["user_id"] == men["user_id"]:
-                    resultado_combinado = self.combinar_resultados(est, men)
-                    resultados["combinados"].append(resultado_combinado)
+        with self.metricas.medir("combinacao") as etapa:
+            resultados["combinados"] = self.combinar_por_usuario(
+                resultados["estresse"], resultados["menacme"])
+            etapa["linhas"] = len(resultados["combinados"])
 
         self.resultados = resultados
+        self.user_ids_atualizados = None
+        self.estatisticas = None
         return resultados
 
-    def salvar_resultados(self, diretorio_saida: str):
+    def obter_formatos_saida(self) -> List[str]:
+        """
+        Formatos de saída configurados em configuracoes_gerais.formatos_saida
+
+        Returns:
+            Lista de formatos (ver escritores_resultados.FORMATOS_SAIDA)
+        """
+        formatos = self.config.get("configuracoes_gerais", {}).get(
+            "formatos_saida", ["json"])
+        invalidos = [formato for formato in formatos if formato not in FORMATOS_SAIDA]
+        if invalidos:
+            raise ValueError(
+                f"Formato(s) de saída inválido(s): {', '.join(invalidos)}. "
+                f"Use {', '.join(FORMATOS_SAIDA)}")
+        return list(formatos)
+
+    def salvar_resultados(self, diretorio_saida: str, formatos: Optional[List[str]] = None,
+                          alteracoes: Optional[Dict[str, Optional[TabelaResultados]]] = None) -> List[str]:
         """
         Salva os resultados processados em arquivos
 
+        O JSON é escrito participante a participante e os demais formatos
+        são montados direto dos vetores das tabelas, sem materializar a
+        coorte inteira como dicionários.
+
+        Com ``alteracoes`` (execução incremental), as tabelas fora dele não
+        são regravadas; para as que só ganharam linhas, o NDJSON recebe
+        apenas as linhas novas. O resultados_completos.json e o
+        estatisticas.json só são regravados se algo mudou. Arquivos que
+        ainda não existem são sempre gravados.
+
         Args:
             diretorio_saida: Diretório para salvar os resultados
+            formatos: Formatos a gravar (padrão: configuracoes_gerais.formatos_saida)
+            alteracoes: Tabelas alteradas desde a última gravação, com a
+                tabela das linhas acrescentadas ou None se a tabela deve ser
+                regravada inteira (padrão: grava tudo)
+
+        Returns:
+            Caminhos dos arquivos gravados
         """
+        formatos = self.obter_formatos_saida() if formatos is None else formatos
         os.makedirs(diretorio_saida, exist_ok=True)
+        configuracoes_gerais = self.config.get("configuracoes_gerais", {})
+        opcoes_csv = {
+            "separador": configuracoes_gerais.get("separador_csv", ";"),
+            "encoding": configuracoes_gerais.get("encoding", "utf-8")
+        }
+        arquivos = []
+        alterado = alteracoes is None or bool(alteracoes)
+
+        with self.metricas.medir("gravacao") as etapa:
+            etapa["linhas"] = sum(len(tabela)
+                                  for tabela in self.resultados.values()) if alterado else 0
+
+            caminho = os.path.join(diretorio_saida, "resultados_completos.json")
+            if "json" in formatos and (alterado or not os.path.exists(caminho)):
+                with open(caminho, 'w', encoding='utf-8') as f:
+                    self.escrever_json_resultados(f)
+                arquivos.append(caminho)
+
+            for formato in formatos:
+                if formato == "json":
+                    continue
+                for chave, tabela in self.resultados.items():
+                    if not len(tabela):
+                        continue
+                    caminho_base = os.path.join(diretorio_saida, f"resultados_{chave}")
+                    if alteracoes is not None and os.path.exists(f"{caminho_base}.{formato}"):
+                        if chave not in alteracoes:
+                            continue
+                        if formato == "ndjson" and alteracoes[chave] is not None:
+                            anexar_ndjson(alteracoes[chave], f"{caminho_base}.ndjson")
+                            arquivos.append(f"{caminho_base}.ndjson")
+                            continue
+                    arquivos.append(escrever_tabela(tabela, formato, caminho_base, opcoes_csv))
+
+            if configuracoes_gerais.get("resultados_por_participante", True):
+                self.salvar_resultados_participantes(diretorio_saida)
+
+        caminho = os.path.join(diretorio_saida, "estatisticas.json")
+        if alterado or not os.path.exists(caminho):
+            if self.estatisticas is None:
+                self.estatisticas = self.calcular_estatisticas()
+            self.estatisticas.salvar(caminho)
+            arquivos.append(caminho)
+
+        if alterado:
+            logger.info(f"Resultados salvos em {diretorio_saida} ({', '.join(formatos)})")
+        else:
+            logger.info(f"Nenhuma resposta nova; resultados em {diretorio_saida} mantidos")
+        return arquivos
+
+    def calcular_estatisticas(self) -> EstatisticasCoorte:
+        """
+        Calcula as estatísticas da coorte sobre todos os resultados
+
+        Returns:
+            Estatísticas (ver estatisticas_coorte)
+        """
+        with self.metricas.medir("estatisticas") as etapa:
+            etapa["linhas"] = sum(len(tabela) for chave, tabela in self.resultados.items()
+                                  if chave != "combinados")
+            return EstatisticasCoorte.de_resultados(self.resultados, self.obter_politica_duplicatas())
+
+    def atualizar_estatisticas(self, anteriores: Dict, caminho_estatisticas: str) -> EstatisticasCoorte:
+        """
+        Atualiza as estatísticas salvas com os participantes alterados
+
+        A parte que os participantes de ``user_ids_atualizados`` tinham nos
+        resultados anteriores é subtraída e a parte atual é somada; os
+        demais participantes não são revisitados. Se algum arquivo foi
+        reprocessado ou as estatísticas salvas não correspondem aos
+        resultados anteriores, tudo é recalculado.
 
-        # Salvar como JSON
-        with open(os.path.join(diretorio_saida, "resultados_completos.json"), 'w', encoding='utf-8') as f:
-            json.dump(self.resultados, f, indent=2,
-                      ensure_ascii=False, default=str)
+        Args:
+            anteriores: Tabelas carregadas da execução anterior
+            caminho_estatisticas: Arquivo estatisticas.json da execução anterior
 
-        # Salvar como Excel
-        if self.resultados["estresse"]:
-            df_estresse = pd.DataFrame(self.resultados["estresse"])
-            df_estresse.to_excel(os.path.join(
-                diretorio_saida, "resultados_estresse.xlsx"), index=False)
+        Returns:
+            Estatísticas dos resultados atuais
+        """
+        politica = self.obter_politica_duplicatas()
+        salvas = EstatisticasCoorte.carregar(caminho_estatisticas)
+        if self.user_ids_atualizados is None or salvas is None \
+                or not salvas.confere_com(anteriores, politica):
+            return self.calcular_estatisticas()
 
-        if self.resultados["menacme"]:
-            df_menacme = pd.DataFrame(self.resultados["menacme"])
-            df_menacme.to_excel(os.path.join(
-                diretorio_saida, "resultados_menacme.xlsx"), index=False)
+        afetados = self.user_ids_atualizados
 
-        if self.resultados["combinados"]:
-            df_combinados = pd.DataFrame(self.resultados["combinados"])
-            df_combinados.to_excel(os.path.join(
-                diretorio_saida, "resultados_combinados.xlsx"), index=False)
+        def parte(tabelas: Dict) -> EstatisticasCoorte:
+            restritas = {chave: tabela.selecionar(pd.Series(tabela.user_ids).isin(afetados).to_numpy())
+                         for chave, tabela in tabelas.items() if chave != "combinados"}
+            restritas["combinados"] = self.combinar_por_usuario(restritas["estresse"], restritas["menacme"])
+            return EstatisticasCoorte.de_resultados(restritas, politica)
 
-        logger.info(f"Resultados salvos em {diretorio_saida}")
+        with self.metricas.medir("estatisticas") as etapa:
+            etapa["linhas"] = len(afetados)
+            return salvas.somar(parte(anteriores), -1).somar(parte(self.resultados))
+
+    def salvar_resultados_participantes(self, diretorio_saida: str) -> Dict[str, int]:
+        """
+        Grava os arquivos por participante lidos por api_web.py
+
+        Após uma execução incremental, apenas os participantes com envios
+        novos são considerados.
+
+        Args:
+            diretorio_saida: Diretório dos resultados
+
+        Returns:
+            Contagem de arquivos gravados, inalterados e removidos
+        """
+        tabelas = {chave: tabela for chave, tabela in self.resultados.items()
+                   if chave != "combinados"}
+        contagem = escrever_resultados_participantes(
+            tabelas, diretorio_saida, self.obter_politica_duplicatas(), self.user_ids_atualizados)
+        logger.info(
+            f"Arquivos por participante: {contagem['gravados']} gravados, "
+            f"{contagem['inalterados']} inalterados, {contagem['removidos']} removidos")
+        return contagem
+
+    def escrever_json_resultados(self, arquivo):
+        """
+        Escreve os resultados em JSON, um participante por vez
+
+        O texto gerado é o mesmo de ``json.dump(resultados, indent=2)``.
+
+        Args:
+            arquivo: Arquivo texto aberto para escrita
+        """
+        arquivo.write("{")
+        for i, (chave, tabela) in enumerate(self.resultados.items()):
+            arquivo.write(",\n" if i else "\n")
+            arquivo.write(f'  {json.dumps(chave, ensure_ascii=False)}: ')
+            if not len(tabela):
+                arquivo.write("[]")
+                continue
+
+            arquivo.write("[")
+            for j, registro in enumerate(tabela.como_dicts()):
+                texto = json.dumps(registro, indent=2,
+                                   ensure_ascii=False, default=str)
+                arquivo.write(",\n    " if j else "\n    ")
+                arquivo.write(texto.replace("\n", "\n    "))
+            arquivo.write("\n  ]")
+        arquivo.write("\n}" if self.resultados else "}")
+
+    def calcular_hash_linhas(self, df: pd.DataFrame, linhas_processadas: int) -> Tuple[str, str]:
+        """
+        Calcula hashes do conteúdo das linhas de um DataFrame
+
+        O hash de cada linha é calculado uma única vez e serve aos dois
+        resultados.
+
+        Args:
+            df: Linhas a serem identificadas
+            linhas_processadas: Quantidade de linhas do primeiro hash
+
+        Returns:
+            Tupla (hash das primeiras ``linhas_processadas`` linhas, hash de
+            todas as linhas), em SHA-256 hexadecimal
+        """
+        hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+        return (hashlib.sha256(hashes[:linhas_processadas].tobytes()).hexdigest(),
+                hashlib.sha256(hashes.tobytes()).hexdigest())
+
+    def carregar_controle(self, caminho_controle: str = "controle_ids.json") -> Dict:
+        """
+        Carrega o controle de processamento incremental
+
+        Args:
+            caminho_controle: Caminho para o arquivo de controle
+
+        Returns:
+            Dicionário de controle (vazio se ainda não existir)
+        """
+        if not os.path.exists(caminho_controle):
+            return {
+                "ultimo_id_processado": 0,
+                "ultima_atualizacao": "Nunca",
+                "questionarios_processados": {}
+            }
+
+        with open(caminho_controle, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    def salvar_controle(self, controle: Dict, caminho_controle: str = "controle_ids.json"):
+        """
+        Salva o controle de processamento incremental de forma atômica
+
+        Args:
+            controle: Dicionário de controle
+            caminho_controle: Caminho para o arquivo de controle
+        """
+        caminho_temporario = f"{caminho_controle}.tmp"
+        with open(caminho_temporario, 'w', encoding='utf-8') as f:
+            json.dump(controle, f, indent=2, ensure_ascii=False, default=str)
+        os.replace(caminho_temporario, caminho_controle)
+
+    def carregar_resultados_anteriores(self, diretorio_saida: str) -> Dict:
+        """
+        Carrega os resultados salvos pela última execução
+
+        Lê o resultados_completos.json ou, sem "json" nos formatos de saída,
+        o NDJSON de cada questionário. Os demais formatos de saída são planos e não guardam
+        tudo o que a tabela precisa.
+
+        Args:
+            diretorio_saida: Diretório onde os resultados foram salvos
+
+        Returns:
+            Dicionário com a tabela de cada questionário (None se os
+            resultados anteriores dele não puderam ser lidos)
+        """
+        formatos = self.obter_formatos_saida()
+        registros = {questionario: None for questionario in self.listar_questionarios()}
+        caminho = os.path.join(diretorio_saida, "resultados_completos.json")
+        if "json" in formatos:
+            if os.path.exists(caminho):
+                with open(caminho, 'r', encoding='utf-8') as f:
+                    salvos = json.load(f)
+                registros = {chave: salvos.get(chave) for chave in registros}
+        elif "ndjson" in formatos:
+            for chave in registros:
+                caminho = os.path.join(diretorio_saida, f"resultados_{chave}.ndjson")
+                if os.path.exists(caminho):
+                    with open(caminho, 'r', encoding='utf-8') as f:
+                        registros[chave] = [json.loads(linha) for linha in f if linha.strip()]
+        else:
+            logger.warning("Processamento incremental requer 'json' ou 'ndjson' em formatos_saida; "
+                           "sem os resultados anteriores, os questionários serão reprocessados por inteiro")
+
+        # Os timestamps foram gravados como texto
+        for chave in registros:
+            for registro in registros[chave] or []:
+                registro["timestamp"] = pd.Timestamp(registro["timestamp"])
+
+        return {
+            questionario: None if registros[questionario] is None
+            else self.classe_resultados(questionario).de_registros(registros[questionario])
+            if registros[questionario] else self.tabela_vazia(questionario)
+            for questionario in registros
+        }
+
+    def processar_incremental(self, diretorio_entrada: str, diretorio_saida: str,
+                              caminho_controle: str = "controle_ids.json") -> Dict:
+        """
+        Processa apenas as respostas novas desde a última execução
+
+        Para cada questionário o controle guarda quantas linhas já foram
+        processadas, o último timestamp e um hash dessas linhas. Se as
+        linhas já processadas não mudaram, só as seguintes são pontuadas e
+        juntadas aos resultados anteriores; caso contrário (ou se os
+        resultados anteriores não puderem ser lidos) o arquivo é
+        reprocessado por inteiro. Os resultados e o controle são salvos ao
+        final, regravando só as tabelas que mudaram (ver salvar_resultados),
+        e ``self.user_ids_atualizados`` indica quais participantes mudaram
+        (None quando algum arquivo foi reprocessado por inteiro).
+
+        Args:
+            diretorio_entrada: Diretório com os arquivos exportados
+            diretorio_saida: Diretório com os resultados salvos
+            caminho_controle: Caminho para o arquivo de controle
+
+        Returns:
+            Dicionário com todos os resultados (anteriores + novos)
+        """
+        controle = self.carregar_controle(caminho_controle)
+        marcas = controle.setdefault("questionarios_processados", {})
+        anteriores = self.carregar_resultados_anteriores(diretorio_saida)
+        sem_resultados = {questionario for questionario, tabela in anteriores.items() if tabela is None}
+        anteriores = {questionario: self.tabela_vazia(questionario) if tabela is None else tabela
+                      for questionario, tabela in anteriores.items()}
+
+        resultados = dict(anteriores)
+        novos = {}
+        # Tabela -> linhas acrescentadas, ou None se mudou de outro modo
+        alteracoes = {}
+        reprocessado = False
+
+        for questionario in self.listar_questionarios():
+            caminhos = self.localizar_arquivos_questionario(
+                diretorio_entrada, questionario)
+            if not caminhos:
+                continue
+            nomes = [os.path.basename(caminho) for caminho in caminhos]
+
+            with self.metricas.medir("leitura") as etapa:
+                df = self.ler_arquivos_questionario(caminhos)
+                etapa["linhas"] = len(df)
+
+            # Lotes novos entram depois dos já processados (ordem alfabética)
+            marca = marcas.get(questionario, {})
+            linhas_processadas = marca.get("linhas_processadas", 0)
+            lotes_processados = marca.get("arquivos", [marca.get("arquivo")])
+            hash_processadas, hash_conteudo = self.calcular_hash_linhas(df, linhas_processadas)
+            continua = (
+                questionario not in sem_resultados
+                and lotes_processados == nomes[:len(lotes_processados)]
+                and 0 < linhas_processadas <= len(df)
+                and marca.get("hash_conteudo") == hash_processadas
+            )
+
+            if continua:
+                # Envios novos podem substituir envios já pontuados do mesmo
+                # participante: a deduplicação vê todas as linhas, mas só as
+                # novas são pontuadas
+                mantidas = self.deduplicar_envios(questionario, df)
+                anterior = anteriores[questionario]
+                novos[questionario] = self.pontuar_bloco(
+                    questionario, mantidas[mantidas.index >= linhas_processadas])
+                preservadas = np.isin(anterior.linhas, mantidas.index.to_numpy())
+                resultados[questionario] = self.classe_resultados(questionario).concatenar([
+                    anterior.selecionar(preservadas), novos[questionario]])
+                if not preservadas.all():
+                    alteracoes[questionario] = None
+                elif len(novos[questionario]):
+                    alteracoes[questionario] = novos[questionario]
+                logger.info(
+                    f"{questionario}: {len(df) - linhas_processadas} respostas novas após a linha {linhas_processadas}")
+            else:
+                if linhas_processadas and questionario in sem_resultados:
+                    logger.warning(
+                        f"{questionario}: resultados anteriores não encontrados em {diretorio_saida}; "
+                        f"reprocessando {', '.join(nomes)} por inteiro")
+                elif linhas_processadas:
+                    logger.warning(
+                        f"{questionario}: respostas já processadas foram alteradas; reprocessando {', '.join(nomes)} por inteiro")
+                novos[questionario] = self.pontuar_bloco(
+                    questionario, self.deduplicar_envios(questionario, df))
+                resultados[questionario] = novos[questionario]
+                alteracoes[questionario] = None
+                reprocessado = True
+
+            ultimo_timestamp = df.iloc[-1, 0] if len(df) else None
+            marcas[questionario] = {
+                "arquivo": nomes[0],
+                "arquivos": nomes,
+                "linhas_processadas": len(df),
+                "ultimo_timestamp": ultimo_timestamp if pd.notna(ultimo_timestamp) else None,
+                "hash_conteudo": hash_conteudo
+            }
+
+        # A junção por user_id é linear sobre os vetores; os diagnósticos
+        # ficam restritos aos participantes com respostas novas
+        with self.metricas.medir("combinacao") as etapa:
+            resultados["combinados"] = self.combinar_por_usuario(
+                resultados["estresse"], resultados["menacme"])
+            etapa["linhas"] = len(resultados["combinados"])
+        if reprocessado:
+            self.user_ids_atualizados = None
+        else:
+            self.user_ids_atualizados = {
+                user_id for tabela in novos.values() for user_id in tabela.user_ids.tolist()}
+
+        if "estresse" in alteracoes or "menacme" in alteracoes:
+            alteracoes["combinados"] = None
+        # Só dá para anexar ao NDJSON quando foi ele a origem dos resultados anteriores
+        if "json" in self.obter_formatos_saida():
+            alteracoes = dict.fromkeys(alteracoes)
+
+        self.resultados = resultados
+        self.estatisticas = self.atualizar_estatisticas(
+            anteriores, os.path.join(diretorio_saida, "estatisticas.json"))
+        self.salvar_resultados(diretorio_saida, alteracoes=alteracoes)
+
+        ids_novos = [user_id for tabela in novos.values()
+                     for user_id in tabela.user_ids[-1:].tolist()]
+        if ids_novos:
+            controle["ultimo_id_processado"] = ids_novos[-1]
+        controle["ultima_atualizacao"] = datetime.now().isoformat()
+        self.salvar_controle(controle, caminho_controle)
+
+        return resultados
+
+    def posicao_coluna_user_id(self, questionario: str, colunas: List) -> int:
+        """
+        Posição da coluna de user_id de um questionário, como na pontuação
+
+        Args:
+            questionario: Nome do questionário
+            colunas: Cabeçalhos da planilha
+
+        Returns:
+            Posição da coluna
+        """
+        tipo = self.tipo_questionario(questionario)
+        if tipo in TIPOS_PLANO:
+            return self.obter_plano(questionario).resolver_colunas(colunas)[1]
+        return self.localizar_coluna_user_id(questionario, colunas, 11 if tipo == "estresse" else -1)
+
+    def ler_cabecalho(self, caminho_arquivo: str) -> List:
+        """
+        Lê apenas os cabeçalhos de um arquivo de respostas
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo (.xlsx, .csv, .csv.gz ou .parquet)
+
+        Returns:
+            Lista de cabeçalhos
+        """
+        formato = self.detectar_formato(caminho_arquivo)
+        if formato == ".parquet":
+            import pyarrow.parquet as pq
+            return list(pq.ParquetFile(caminho_arquivo).schema_arrow.names)
+        if formato == ".xlsx":
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(caminho_arquivo, read_only=True, data_only=True)
+            try:
+                cabecalho = next(workbook.active.iter_rows(max_row=1, values_only=True), ())
+            finally:
+                workbook.close()
+            return [valor if valor is not None else f"Unnamed: {i}" for i, valor in enumerate(cabecalho)]
+        opcoes = self._opcoes_csv()
+        return pd.read_csv(caminho_arquivo, nrows=0, sep=opcoes["sep"],
+                           encoding=opcoes["encoding"]).columns.tolist()
+
+    def indexar_user_ids(self, caminho_arquivo: str, posicao_user_id: int) -> Tuple[Dict[str, List[int]], int]:
+        """
+        Lê só a coluna de user_id de um arquivo e agrupa as posições das linhas
+
+        Linhas sem user_id são ignoradas (recebem ids gerados na pontuação).
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo de respostas
+            posicao_user_id: Posição da coluna de user_id
+
+        Returns:
+            Tupla ({user_id: [posições das linhas]}, total de linhas do arquivo)
+        """
+        formato = self.detectar_formato(caminho_arquivo)
+        if formato == ".parquet":
+            import pyarrow.parquet as pq
+            nome = pq.ParquetFile(caminho_arquivo).schema_arrow.names[posicao_user_id]
+            valores = pd.read_parquet(caminho_arquivo, columns=[nome]).iloc[:, 0]
+        elif formato == ".xlsx":
+            from openpyxl import load_workbook
+
+            workbook = load_workbook(caminho_arquivo, read_only=True, data_only=True)
+            try:
+                planilha = workbook.active
+                valores = pd.Series([linha[0] for linha in planilha.iter_rows(
+                    min_row=2, min_col=posicao_user_id + 1, max_col=posicao_user_id + 1,
+                    values_only=True)], dtype=object)
+            finally:
+                workbook.close()
+        else:
+            opcoes = self._opcoes_csv()
+            valores = pd.read_csv(caminho_arquivo, usecols=[posicao_user_id], sep=opcoes["sep"],
+                                  encoding=opcoes["encoding"]).iloc[:, 0]
+
+        ids_texto = valores.astype(str).str.strip()
+        ids_texto = ids_texto[valores.notna().to_numpy() & (ids_texto != "").to_numpy()]
+        posicoes = pd.Series(np.arange(len(valores)))[ids_texto.index]
+        return ({user_id: grupo.tolist() for user_id, grupo in posicoes.groupby(ids_texto.to_numpy(), sort=False)},
+                len(valores))
+
+    def ler_linhas_arquivo(self, caminho_arquivo: str, posicoes: List[int]) -> pd.DataFrame:
+        """
+        Lê apenas algumas linhas de um arquivo de respostas
+
+        Parquet (inclusive o do cache de leitura) é lido só nos grupos de
+        linhas que contêm as posições; planilhas são percorridas até a
+        última posição pedida. O índice do resultado é a posição da linha,
+        como na leitura completa, preservando os ids ``EST_n``/``MEN_n``.
+
+        Args:
+            caminho_arquivo: Caminho para o arquivo de respostas
+            posicoes: Posições das linhas (sem o cabeçalho), em ordem
+
+        Returns:
+            DataFrame com as linhas pedidas
+        """
+        formato = self.detectar_formato(caminho_arquivo)
+        caminho_parquet = caminho_arquivo if formato == ".parquet" else (
+            self.cache.localizar(caminho_arquivo) if self.cache else None)
+
+        if caminho_parquet:
+            import pyarrow.parquet as pq
+
+            arquivo = pq.ParquetFile(caminho_parquet)
+            partes, inicio = [], 0
+            for grupo in range(arquivo.num_row_groups):
+                fim = inicio + arquivo.metadata.row_group(grupo).num_rows
+                locais = [posicao - inicio for posicao in posicoes if inicio <= posicao < fim]
+                if locais:
+                    partes.append(arquivo.read_row_group(grupo).take(locais).to_pandas(
+                        ignore_metadata=True))
+                inicio = fim
+            nomes = [nome for nome in arquivo.schema_arrow.names if not nome.startswith("__index_level_")]
+            df = pd.concat(partes)[nomes] if partes else pd.DataFrame(columns=nomes)
+            df.index = posicoes[:len(df)]
+            return df
+
+        if formato == ".xlsx":
+            from openpyxl import load_workbook
+
+            pedidas = set(posicoes)
+            workbook = load_workbook(caminho_arquivo, read_only=True, data_only=True)
+            try:
+                linhas_planilha = workbook.active.iter_rows(max_row=max(posicoes) + 2, values_only=True)
+                cabecalho = list(next(linhas_planilha, ()))
+                linhas, indices = [], []
+                for posicao, linha in enumerate(linhas_planilha):
+                    if posicao in pedidas:
+                        linhas.append(linha)
+                        indices.append(posicao)
+            finally:
+                workbook.close()
+            return self._montar_bloco(linhas, indices, cabecalho)
+
+        partes = []
+        with pd.read_csv(caminho_arquivo, chunksize=50000, **self._opcoes_csv()) as leitor:
+            for bloco in leitor:
+                partes.append(bloco.loc[bloco.index.intersection(posicoes)])
+                if bloco.index[-1] >= posicoes[-1]:
+                    break
+        return pd.concat(partes)
+
+    def processar_participante(self, diretorio_entrada: str, diretorio_saida: str, user_id: str,
+                               caminho_indice: Optional[str] = None) -> Dict[str, TabelaResultados]:
+        """
+        Processa apenas as respostas de um participante
+
+        As posições das linhas vêm de um índice persistido (reconstruído
+        quando um lote de entrada muda). Só essas linhas são lidas, com os
+        envios repetidos removidos como no processamento completo, e só os arquivos ``{user_id}_{questionario}.json`` do
+        participante são regravados; ``resultados_completos.json`` e as
+        planilhas consolidadas não são alterados.
+
+        Args:
+            diretorio_entrada: Diretório com os arquivos exportados
+            diretorio_saida: Diretório dos resultados
+            user_id: Identificador do participante
+            caminho_indice: Arquivo do índice (padrão: indice_user_ids.json no diretório de saída)
+
+        Returns:
+            Dicionário {questionario: resultados} dos questionários em que o participante aparece
+        """
+        indice = IndiceParticipantes(
+            caminho_indice or os.path.join(diretorio_saida, "indice_user_ids.json"))
+        resultados = {}
+
+        for questionario in self.listar_questionarios():
+            with self.metricas.medir("leitura") as etapa:
+                # O índice das linhas segue a numeração contínua entre lotes
+                # da leitura completa
+                partes, deslocamento = [], 0
+                for arquivo in self.localizar_arquivos_questionario(diretorio_entrada, questionario):
+                    posicoes, total_linhas = indice.posicoes(
+                        questionario, arquivo, user_id, lambda arquivo=arquivo: self.indexar_user_ids(
+                            arquivo, self.posicao_coluna_user_id(questionario, self.ler_cabecalho(arquivo))))
+                    if posicoes:
+                        parte = self.ler_linhas_arquivo(arquivo, posicoes)
+                        if partes:
+                            parte.columns = partes[0].columns
+                        parte.index = parte.index + deslocamento
+                        partes.append(parte)
+                    deslocamento += total_linhas
+                if not partes:
+                    continue
+                df = self.deduplicar_envios(questionario, pd.concat(partes) if len(partes) > 1 else partes[0])
+                etapa["linhas"] = len(df)
+
+            resultados[questionario] = self.pontuar_bloco(questionario, df)
+
+        if resultados:
+            self.resultados = resultados
+            self.user_ids_atualizados = {user_id}
+            os.makedirs(diretorio_saida, exist_ok=True)
+            with self.metricas.medir("gravacao") as etapa:
+                self.salvar_resultados_participantes(diretorio_saida)
+                etapa["linhas"] = len(resultados)
+        else:
+            logger.warning(f"Participante {user_id} não encontrado em {diretorio_entrada}")
+
+        return resultados
+
+
+def _pontuar_fragmento(config: Dict, questionario: str, fragmento: pd.DataFrame) -> TabelaResultados:
+    """
+    Pontua um fragmento de linhas em um processo do pool
+
+    Args:
+        config: Configuração do processador que enviou o fragmento
+        questionario: Nome do questionário
+        fragmento: Linhas a pontuar
+
+    Returns:
+        Tabela colunar com os resultados processados
+    """
+    processador = ProcessadorQuestionarios(config=config, usar_cache=False)
+    return processador.obter_funcao_processamento(questionario)(fragmento)
 
 
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Processa os questionários de dados_entrada")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="ignora o cache de planilhas já lidas")
+    parser.add_argument("--user-id",
+                        help="processa apenas as respostas deste participante")
+    parser.add_argument("--profile", action="store_true",
+                        help="perfila cada etapa (cProfile e tracemalloc) em resultados/profile")
+    args = parser.parse_args()
+
     # Exemplo de uso
-    processador = ProcessadorQuestionarios()
+    processador = ProcessadorQuestionarios(usar_cache=not args.no_cache)
+    if args.profile:
+        from perfil_execucao import PerfilExecucao
+        processador.metricas.perfil = PerfilExecucao(os.path.join("resultados", "profile"))
 
     # Criar diretórios necessários
     os.makedirs("dados_entrada", exist_ok=True)
     os.makedirs("resultados", exist_ok=True)
 
+    if args.user_id:
+        # Apenas um participante (usado por /api/processar/<user_id>)
+        import sys
+
+        try:
+            resultados = processador.processar_participante(
+                "dados_entrada", "resultados", args.user_id)
+        except Exception as e:
+            logger.error(f"Erro ao processar {args.user_id}: {e}")
+            sys.exit(1)
+        finally:
+            if args.profile:
+                processador.metricas.perfil.salvar()
+        if not resultados:
+            print(f"Participante {args.user_id} não encontrado", file=sys.stderr)
+            sys.exit(1)
+        print(f"Participante {args.user_id} processado: {', '.join(resultados)}")
+        sys.exit(0)
+
     # Processar questionários
     try:
         resultados = processador.processar_todos_questionarios("dados_entrada")
@@ -407,3 +2114,6 @@ if __name__ == "__main__":
 
     except Exception as e:
         logger.error(f"Erro durante o processamento: {e}")
+    finally:
+        if args.profile:
+            processador.metricas.perfil.salvar()
@@ -0,0 +1,965 @@
+"""
+Armazenamento compacto (colunar) dos resultados processados
+
+Em vez de um dicionário por participante com uma lista de dicionários de
+respostas, cada questionário guarda vetores NumPy tipados: pontuações,
+códigos de nível/fase e matrizes de códigos de respostas (int8 quando o
+vocabulário de respostas cabe). O acesso por participante continua
+disponível por meio de "visões" leves com ``__slots__``, que se comportam
+como os dicionários de antes (``registro["user_id"]``).
+"""
+
+import copy
+import hashlib
+from collections.abc import Mapping
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+
+def tipo_codigos(quantidade: int) -> np.dtype:
+    """
+    Escolhe o menor tipo inteiro capaz de representar ``quantidade`` códigos
+
+    Args:
+        quantidade: Quantidade de categorias distintas
+
+    Returns:
+        Tipo NumPy (int8, int16 ou int32)
+    """
+    for tipo in (np.int8, np.int16):
+        if quantidade <= np.iinfo(tipo).max:
+            return np.dtype(tipo)
+    return np.dtype(np.int32)
+
+
+def codificar(valores: Sequence) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Converte valores em códigos inteiros e vocabulário
+
+    Args:
+        valores: Valores a codificar (qualquer formato)
+
+    Returns:
+        Tupla (códigos com o formato de ``valores``, vocabulário)
+    """
+    valores = np.asarray(valores, dtype=object)
+    codigos, vocabulario = pd.factorize(valores.ravel())
+    vocabulario = np.asarray(vocabulario, dtype=object)
+    return codigos.astype(tipo_codigos(len(vocabulario))).reshape(valores.shape), vocabulario
+
+
+def unificar_categorias(partes: List[Tuple[np.ndarray, np.ndarray]]) -> Tuple[List[np.ndarray], np.ndarray]:
+    """
+    Recodifica várias matrizes de códigos para um vocabulário comum
+
+    Args:
+        partes: Lista de (códigos, vocabulário) de cada parte
+
+    Returns:
+        Tupla (códigos recodificados de cada parte, vocabulário comum)
+    """
+    comum = pd.Index(pd.unique(np.concatenate(
+        [np.asarray(vocabulario, dtype=object) for _, vocabulario in partes])))
+    tipo = tipo_codigos(len(comum))
+    recodificados = [
+        comum.get_indexer(np.asarray(vocabulario, dtype=object)).astype(tipo)[codigos]
+        if len(vocabulario) else codigos.astype(tipo)
+        for codigos, vocabulario in partes
+    ]
+    return recodificados, np.asarray(comum, dtype=object)
+
+
+def converter_timestamp(valor):
+    """
+    Converte um valor do vetor de timestamps para o tipo exposto nas visões
+
+    Args:
+        valor: Elemento do vetor (datetime64 ou objeto)
+
+    Returns:
+        pd.Timestamp para datas NumPy; o próprio valor nos demais casos
+    """
+    if isinstance(valor, np.datetime64):
+        return pd.Timestamp(valor)
+    return valor
+
+
+def concatenar_timestamps(vetores: List[np.ndarray]) -> np.ndarray:
+    """
+    Concatena vetores de timestamps preservando o tipo datetime64 quando possível
+
+    Args:
+        vetores: Vetores de timestamps
+
+    Returns:
+        Vetor concatenado
+    """
+    if all(np.issubdtype(vetor.dtype, np.datetime64) for vetor in vetores):
+        return np.concatenate([vetor.astype("datetime64[ns]") for vetor in vetores])
+    return np.concatenate([
+        np.array([converter_timestamp(valor) for valor in vetor], dtype=object)
+        if np.issubdtype(vetor.dtype, np.datetime64) else vetor
+        for vetor in vetores
+    ])
+
+
+class TabelaResultados:
+    """
+    Base das tabelas colunares de resultados de um questionário
+
+    Subclasses definem ``prefixo_id``, a visão por participante em
+    ``classe_registro`` e os vetores alinhados por linha em
+    ``colunas_por_linha``.
+    """
+
+    prefixo_id = ""
+    classe_registro = None
+    colunas_por_linha = ("linhas", "user_ids", "timestamps", "codigos_respostas")
+
+    def __len__(self) -> int:
+        return len(self.linhas)
+
+    def __iter__(self) -> Iterator["RegistroBase"]:
+        for posicao in range(len(self)):
+            yield self.classe_registro(self, posicao)
+
+    def __getitem__(self, posicao: int) -> "RegistroBase":
+        if posicao < 0:
+            posicao += len(self)
+        if not 0 <= posicao < len(self):
+            raise IndexError(posicao)
+        return self.classe_registro(self, posicao)
+
+    @property
+    def ids(self) -> List[str]:
+        """
+        Identificadores ``<prefixo>_<linha + 1>`` de todos os participantes
+        """
+        return [f"{self.prefixo_id}_{linha + 1}" for linha in self.linhas.tolist()]
+
+    def respostas_texto(self) -> np.ndarray:
+        """
+        Matriz com o texto das respostas (linhas x perguntas)
+        """
+        return self.vocabulario_respostas[self.codigos_respostas] if len(self.vocabulario_respostas) \
+            else np.full(self.codigos_respostas.shape, "", dtype=object)
+
+    def como_dicts(self) -> Iterator[Dict]:
+        """
+        Gera cada participante como dicionário, um de cada vez
+        """
+        for registro in self:
+            yield registro.como_dict()
+
+    def hashes_linhas(self) -> np.ndarray:
+        """
+        Hash do conteúdo de cada participante, calculado direto dos vetores
+
+        Cobre as mesmas informações de ``como_dict`` (pelo DataFrame de
+        ``para_dataframe``, com as colunas no prefixo), sem serializar os
+        participantes. Timestamps entram como texto, como no JSON.
+
+        Returns:
+            Vetor de textos hexadecimais, um por linha
+        """
+        df = self.para_dataframe()
+        df["timestamp"] = df["timestamp"].astype(str)
+        colunas = hashlib.sha256("\x1f".join(map(str, df.columns)).encode('utf-8')).hexdigest()[:16]
+        return np.array([f"{colunas}{valor:016x}"
+                         for valor in pd.util.hash_pandas_object(df, index=False).tolist()], dtype=object)
+
+    def selecionar(self, mascara: np.ndarray) -> "TabelaResultados":
+        """
+        Nova tabela só com as linhas marcadas, sem recodificar respostas
+
+        Args:
+            mascara: Vetor booleano (ou de posições) sobre as linhas
+
+        Returns:
+            Tabela do mesmo tipo com as linhas selecionadas
+        """
+        selecao = copy.copy(self)
+        for coluna in self.colunas_por_linha:
+            if hasattr(self, coluna):
+                setattr(selecao, coluna, getattr(self, coluna)[mascara])
+        return selecao
+
+
+class ResultadosEstresse(TabelaResultados):
+    """
+    Resultados do questionário de estresse em formato colunar
+    """
+
+    prefixo_id = "EST"
+    colunas_por_linha = TabelaResultados.colunas_por_linha + ("pontos", "pontuacao_total", "codigos_nivel")
+
+    def __init__(self, linhas: np.ndarray, user_ids: np.ndarray, timestamps: np.ndarray,
+                 codigos_respostas: np.ndarray, vocabulario_respostas: np.ndarray, pontos: np.ndarray,
+                 codigos_nivel: np.ndarray, niveis: np.ndarray, cores: np.ndarray, perguntas: Sequence[str]):
+        """
+        Args:
+            linhas: Índice de cada participante na planilha de origem
+            user_ids: Identificador de cada participante
+            timestamps: Carimbo de data/hora de cada envio
+            codigos_respostas: Matriz de códigos das respostas (linhas x perguntas)
+            vocabulario_respostas: Texto correspondente a cada código de resposta
+            pontos: Matriz de pontos por resposta
+            codigos_nivel: Código do nível de estresse de cada participante
+            niveis: Nome de cada código de nível
+            cores: Cor indicativa de cada código de nível
+            perguntas: Rótulos das perguntas ("Q1", "Q2", ...)
+        """
+        self.linhas = np.asarray(linhas, dtype=np.int64)
+        self.user_ids = np.asarray(user_ids, dtype=object)
+        self.timestamps = np.asarray(timestamps)
+        self.codigos_respostas = codigos_respostas
+        self.vocabulario_respostas = np.asarray(vocabulario_respostas, dtype=object)
+        self.pontos = pontos.astype(np.int8) if pontos.size and np.abs(pontos).max() <= 127 else pontos
+        self.pontuacao_total = pontos.sum(axis=1, dtype=np.int32) if pontos.ndim == 2 \
+            else np.zeros(len(self.linhas), dtype=np.int32)
+        self.codigos_nivel = codigos_nivel
+        self.niveis = np.asarray(niveis, dtype=object)
+        self.cores = np.asarray(cores, dtype=object)
+        self.perguntas = tuple(perguntas)
+
+    @property
+    def nivel_estresse(self) -> np.ndarray:
+        """
+        Nome do nível de estresse de cada participante
+        """
+        return self.niveis[self.codigos_nivel]
+
+    @property
+    def cor_indicativa(self) -> np.ndarray:
+        """
+        Cor indicativa de cada participante
+        """
+        return self.cores[self.codigos_nivel]
+
+    @classmethod
+    def vazio(cls, perguntas: Sequence[str] = ()) -> "ResultadosEstresse":
+        """
+        Cria uma tabela sem participantes
+        """
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=object), np.empty(0, dtype=object),
+                   np.empty((0, len(perguntas)), dtype=np.int8), np.empty(0, dtype=object),
+                   np.empty((0, len(perguntas)), dtype=np.int8), np.empty(0, dtype=np.int8),
+                   np.empty(0, dtype=object), np.empty(0, dtype=object), perguntas)
+
+    @classmethod
+    def de_registros(cls, registros: List[Dict]) -> "ResultadosEstresse":
+        """
+        Reconstrói a tabela a partir de dicionários (ex.: resultados_completos.json)
+
+        Args:
+            registros: Participantes no formato de ``RegistroEstresse.como_dict``
+
+        Returns:
+            Tabela colunar equivalente
+        """
+        if not registros:
+            return cls.vazio()
+
+        perguntas = [resposta["pergunta"]
+                     for resposta in registros[0]["respostas"]]
+        codigos_respostas, vocabulario = codificar(
+            [[resposta["resposta"] for resposta in registro["respostas"]] for registro in registros])
+        pontos = np.array([[resposta["pontos"] for resposta in registro["respostas"]]
+                           for registro in registros], dtype=np.int64).reshape(len(registros), len(perguntas))
+        codigos_nivel, niveis = codificar(
+            [registro["nivel_estresse"] for registro in registros])
+        cores = {registro["nivel_estresse"]: registro["cor_indicativa"] for registro in registros}
+
+        return cls(
+            [int(registro["id"].rsplit("_", 1)[1]) - 1 for registro in registros],
+            [registro["user_id"] for registro in registros],
+            np.array([registro["timestamp"] for registro in registros], dtype=object),
+            codigos_respostas, vocabulario, pontos, codigos_nivel, niveis,
+            [cores[nivel] for nivel in niveis], perguntas
+        )
+
+    @classmethod
+    def concatenar(cls, partes: List["ResultadosEstresse"]) -> "ResultadosEstresse":
+        """
+        Junta várias tabelas (por exemplo, blocos de leitura) em uma só, na ordem dada
+
+        Args:
+            partes: Tabelas a juntar
+
+        Returns:
+            Tabela única
+        """
+        partes = [parte for parte in partes if len(parte)]
+        if not partes:
+            return cls.vazio()
+        if len(partes) == 1:
+            return partes[0]
+        if len({parte.perguntas for parte in partes}) > 1:
+            raise ValueError(
+                "Não é possível juntar resultados de estresse com perguntas diferentes")
+
+        codigos_respostas, vocabulario = unificar_categorias(
+            [(parte.codigos_respostas, parte.vocabulario_respostas) for parte in partes])
+        codigos_nivel, niveis = unificar_categorias(
+            [(parte.codigos_nivel, parte.niveis) for parte in partes])
+        cores = {}
+        for parte in partes:
+            cores.update(zip(parte.niveis.tolist(), parte.cores.tolist()))
+
+        return cls(
+            np.concatenate([parte.linhas for parte in partes]),
+            np.concatenate([parte.user_ids for parte in partes]),
+            concatenar_timestamps([parte.timestamps for parte in partes]),
+            np.concatenate(codigos_respostas),
+            vocabulario,
+            np.concatenate([parte.pontos for parte in partes]),
+            np.concatenate(codigos_nivel),
+            niveis,
+            [cores[nivel] for nivel in niveis.tolist()],
+            partes[0].perguntas
+        )
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Monta um DataFrame plano (uma coluna por pergunta) direto dos vetores
+
+        Returns:
+            DataFrame com uma linha por participante
+        """
+        colunas = {
+            "id": self.ids,
+            "user_id": self.user_ids,
+            "timestamp": self.timestamps,
+            "pontuacao_total": self.pontuacao_total,
+            "nivel_estresse": self.nivel_estresse,
+            "cor_indicativa": self.cor_indicativa,
+            "total_perguntas": len(self.perguntas)
+        }
+        textos = self.respostas_texto()
+        for i, pergunta in enumerate(self.perguntas):
+            colunas[pergunta] = textos[:, i]
+            colunas[f"{pergunta}_pontos"] = self.pontos[:, i]
+        return pd.DataFrame(colunas)
+
+
+class ResultadosMenacme(TabelaResultados):
+    """
+    Resultados do questionário de menacme em formato colunar
+    """
+
+    prefixo_id = "MEN"
+    colunas_por_linha = TabelaResultados.colunas_por_linha + ("sintomas", "codigos_fase")
+
+    def __init__(self, linhas: np.ndarray, user_ids: np.ndarray, timestamps: np.ndarray,
+                 codigos_respostas: np.ndarray, vocabulario_respostas: np.ndarray, sintomas: np.ndarray,
+                 codigos_fase: np.ndarray, fases: np.ndarray, perguntas: Sequence[str]):
+        """
+        Args:
+            linhas: Índice de cada participante na planilha de origem
+            user_ids: Identificador de cada participante
+            timestamps: Carimbo de data/hora de cada envio
+            codigos_respostas: Matriz de códigos das respostas (linhas x perguntas)
+            vocabulario_respostas: Texto correspondente a cada código de resposta
+            sintomas: Matriz booleana de sintomas identificados por pergunta
+            codigos_fase: Código da fase da menopausa de cada participante
+            fases: Nome de cada código de fase
+            perguntas: Rótulos das perguntas ("M1", "M2", ...)
+        """
+        self.linhas = np.asarray(linhas, dtype=np.int64)
+        self.user_ids = np.asarray(user_ids, dtype=object)
+        self.timestamps = np.asarray(timestamps)
+        self.codigos_respostas = codigos_respostas
+        self.vocabulario_respostas = np.asarray(vocabulario_respostas, dtype=object)
+        self.sintomas = np.asarray(sintomas, dtype=bool)
+        self.codigos_fase = codigos_fase
+        self.fases = np.asarray(fases, dtype=object)
+        self.perguntas = tuple(perguntas)
+
+    @property
+    def fase_menopausa(self) -> np.ndarray:
+        """
+        Nome da fase da menopausa de cada participante
+        """
+        return self.fases[self.codigos_fase]
+
+    def sintomas_de(self, posicao: int) -> List[str]:
+        """
+        Lista de perguntas com sintoma identificado para um participante
+        """
+        return [self.perguntas[i] for i in np.flatnonzero(self.sintomas[posicao])]
+
+    @classmethod
+    def vazio(cls, perguntas: Sequence[str] = ()) -> "ResultadosMenacme":
+        """
+        Cria uma tabela sem participantes
+        """
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=object), np.empty(0, dtype=object),
+                   np.empty((0, len(perguntas)), dtype=np.int8), np.empty(0, dtype=object),
+                   np.empty((0, len(perguntas)), dtype=bool), np.empty(0, dtype=np.int8),
+                   np.empty(0, dtype=object), perguntas)
+
+    @classmethod
+    def de_registros(cls, registros: List[Dict]) -> "ResultadosMenacme":
+        """
+        Reconstrói a tabela a partir de dicionários (ex.: resultados_completos.json)
+
+        Args:
+            registros: Participantes no formato de ``RegistroMenacme.como_dict``
+
+        Returns:
+            Tabela colunar equivalente
+        """
+        if not registros:
+            return cls.vazio()
+
+        perguntas = [resposta["pergunta"]
+                     for resposta in registros[0]["respostas"]]
+        posicoes = {pergunta: i for i, pergunta in enumerate(perguntas)}
+        codigos_respostas, vocabulario = codificar(
+            [[resposta["resposta"] for resposta in registro["respostas"]] for registro in registros])
+        sintomas = np.zeros((len(registros), len(perguntas)), dtype=bool)
+        for i, registro in enumerate(registros):
+            for pergunta in registro["sintomas_identificados"]:
+                sintomas[i, posicoes[pergunta]] = True
+        codigos_fase, fases = codificar(
+            [registro["fase_menopausa"] for registro in registros])
+
+        return cls(
+            [int(registro["id"].rsplit("_", 1)[1]) - 1 for registro in registros],
+            [registro["user_id"] for registro in registros],
+            np.array([registro["timestamp"] for registro in registros], dtype=object),
+            codigos_respostas.reshape(len(registros), len(perguntas)), vocabulario,
+            sintomas, codigos_fase, fases, perguntas
+        )
+
+    @classmethod
+    def concatenar(cls, partes: List["ResultadosMenacme"]) -> "ResultadosMenacme":
+        """
+        Junta várias tabelas (por exemplo, blocos de leitura) em uma só, na ordem dada
+
+        Args:
+            partes: Tabelas a juntar
+
+        Returns:
+            Tabela única
+        """
+        partes = [parte for parte in partes if len(parte)]
+        if not partes:
+            return cls.vazio()
+        if len(partes) == 1:
+            return partes[0]
+        if len({parte.perguntas for parte in partes}) > 1:
+            raise ValueError(
+                "Não é possível juntar resultados de menacme com perguntas diferentes")
+
+        codigos_respostas, vocabulario = unificar_categorias(
+            [(parte.codigos_respostas, parte.vocabulario_respostas) for parte in partes])
+        codigos_fase, fases = unificar_categorias(
+            [(parte.codigos_fase, parte.fases) for parte in partes])
+
+        return cls(
+            np.concatenate([parte.linhas for parte in partes]),
+            np.concatenate([parte.user_ids for parte in partes]),
+            concatenar_timestamps([parte.timestamps for parte in partes]),
+            np.concatenate(codigos_respostas),
+            vocabulario,
+            np.concatenate([parte.sintomas for parte in partes]),
+            np.concatenate(codigos_fase),
+            fases,
+            partes[0].perguntas
+        )
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Monta um DataFrame plano (uma coluna por pergunta) direto dos vetores
+
+        Returns:
+            DataFrame com uma linha por participante
+        """
+        perguntas = np.array(self.perguntas, dtype=object)
+        colunas = {
+            "id": self.ids,
+            "user_id": self.user_ids,
+            "timestamp": self.timestamps,
+            "sintomas_identificados": [", ".join(perguntas[linha]) for linha in self.sintomas],
+            "fase_menopausa": self.fase_menopausa,
+            "total_perguntas": len(self.perguntas)
+        }
+        textos = self.respostas_texto()
+        for i, pergunta in enumerate(self.perguntas):
+            colunas[pergunta] = textos[:, i]
+        return pd.DataFrame(colunas)
+
+
+class ResultadosQuestionario(TabelaResultados):
+    """
+    Resultados de um questionário declarado no config.json (ver motor_pontuacao)
+
+    Questionários do tipo "escala" guardam pontos, pontuação total e
+    nível; os do tipo "categorico" guardam apenas as respostas.
+    """
+
+    colunas_por_linha = TabelaResultados.colunas_por_linha + ("pontos", "pontuacao_total", "codigos_nivel")
+
+    def __init__(self, linhas: np.ndarray, user_ids: np.ndarray, timestamps: np.ndarray,
+                 codigos_respostas: np.ndarray, vocabulario_respostas: np.ndarray,
+                 pontos: Optional[np.ndarray], codigos_nivel: Optional[np.ndarray],
+                 niveis: Sequence[str], cores: Sequence[Optional[str]],
+                 perguntas: Sequence[str], prefixo_id: str):
+        """
+        Args:
+            linhas: Índice de cada participante na planilha de origem
+            user_ids: Identificador de cada participante
+            timestamps: Carimbo de data/hora de cada envio
+            codigos_respostas: Matriz de códigos das respostas (linhas x perguntas)
+            vocabulario_respostas: Texto correspondente a cada código de resposta
+            pontos: Matriz de pontos por resposta (None em questionários sem pontuação)
+            codigos_nivel: Código do nível de cada participante (None sem pontuação)
+            niveis: Nome de cada código de nível
+            cores: Cor indicativa de cada código de nível
+            perguntas: Rótulos das perguntas ("V1", "V2", ...)
+            prefixo_id: Prefixo dos identificadores ("VUL", "SOC", ...)
+        """
+        self.linhas = np.asarray(linhas, dtype=np.int64)
+        self.user_ids = np.asarray(user_ids, dtype=object)
+        self.timestamps = np.asarray(timestamps)
+        self.codigos_respostas = codigos_respostas
+        self.vocabulario_respostas = np.asarray(vocabulario_respostas, dtype=object)
+        self.pontuado = pontos is not None
+        if self.pontuado:
+            self.pontos = pontos.astype(np.int8) if pontos.size and np.abs(pontos).max() <= 127 else pontos
+            self.pontuacao_total = pontos.sum(axis=1, dtype=np.int32) if pontos.ndim == 2 \
+                else np.zeros(len(self.linhas), dtype=np.int32)
+            self.codigos_nivel = codigos_nivel
+        self.niveis = np.asarray(niveis, dtype=object)
+        self.cores = np.asarray(cores, dtype=object)
+        self.perguntas = tuple(perguntas)
+        self.prefixo_id = prefixo_id
+        self.chaves = RegistroQuestionario.chaves_pontuado if self.pontuado \
+            else RegistroQuestionario.chaves_categorico
+
+    @property
+    def nivel(self) -> np.ndarray:
+        """
+        Nome do nível de cada participante
+        """
+        return self.niveis[self.codigos_nivel]
+
+    @property
+    def cor_indicativa(self) -> np.ndarray:
+        """
+        Cor indicativa de cada participante
+        """
+        return self.cores[self.codigos_nivel]
+
+    @classmethod
+    def vazio(cls, perguntas: Sequence[str] = (), prefixo_id: str = "",
+              pontuado: bool = True) -> "ResultadosQuestionario":
+        """
+        Cria uma tabela sem participantes
+        """
+        return cls(np.empty(0, dtype=np.int64), np.empty(0, dtype=object), np.empty(0, dtype=object),
+                   np.empty((0, len(perguntas)), dtype=np.int8), np.empty(0, dtype=object),
+                   np.empty((0, len(perguntas)), dtype=np.int8) if pontuado else None,
+                   np.empty(0, dtype=np.int8) if pontuado else None,
+                   np.empty(0, dtype=object), np.empty(0, dtype=object), perguntas, prefixo_id)
+
+    @classmethod
+    def de_registros(cls, registros: List[Dict]) -> "ResultadosQuestionario":
+        """
+        Reconstrói a tabela a partir de dicionários (ex.: resultados_completos.json)
+
+        Args:
+            registros: Participantes no formato de ``RegistroQuestionario.como_dict``
+
+        Returns:
+            Tabela colunar equivalente
+        """
+        if not registros:
+            return cls.vazio()
+
+        perguntas = [resposta["pergunta"]
+                     for resposta in registros[0]["respostas"]]
+        codigos_respostas, vocabulario = codificar(
+            [[resposta["resposta"] for resposta in registro["respostas"]] for registro in registros])
+        codigos_respostas = codigos_respostas.reshape(len(registros), len(perguntas))
+        pontos = codigos_nivel = None
+        niveis, cores = [], []
+        if "pontuacao_total" in registros[0]:
+            pontos = np.array([[resposta["pontos"] for resposta in registro["respostas"]]
+                               for registro in registros], dtype=np.int64).reshape(len(registros), len(perguntas))
+            codigos_nivel, niveis = codificar([registro["nivel"] for registro in registros])
+            cor_por_nivel = {registro["nivel"]: registro["cor_indicativa"] for registro in registros}
+            cores = [cor_por_nivel[nivel] for nivel in niveis]
+
+        return cls(
+            [int(registro["id"].rsplit("_", 1)[1]) - 1 for registro in registros],
+            [registro["user_id"] for registro in registros],
+            np.array([registro["timestamp"] for registro in registros], dtype=object),
+            codigos_respostas, vocabulario, pontos, codigos_nivel, niveis, cores,
+            perguntas, registros[0]["id"].rsplit("_", 1)[0]
+        )
+
+    @classmethod
+    def concatenar(cls, partes: List["ResultadosQuestionario"]) -> "ResultadosQuestionario":
+        """
+        Junta várias tabelas (por exemplo, blocos de leitura) em uma só, na ordem dada
+
+        Args:
+            partes: Tabelas a juntar
+
+        Returns:
+            Tabela única
+        """
+        partes = [parte for parte in partes if len(parte)]
+        if not partes:
+            return cls.vazio()
+        if len(partes) == 1:
+            return partes[0]
+        if len({(parte.perguntas, parte.prefixo_id, parte.pontuado) for parte in partes}) > 1:
+            raise ValueError(
+                "Não é possível juntar resultados de questionários diferentes")
+
+        codigos_respostas, vocabulario = unificar_categorias(
+            [(parte.codigos_respostas, parte.vocabulario_respostas) for parte in partes])
+        pontos = codigos_nivel = None
+        niveis, cores = [], []
+        if partes[0].pontuado:
+            pontos = np.concatenate([parte.pontos for parte in partes])
+            codigos_nivel, niveis = unificar_categorias(
+                [(parte.codigos_nivel, parte.niveis) for parte in partes])
+            codigos_nivel = np.concatenate(codigos_nivel)
+            cor_por_nivel = {}
+            for parte in partes:
+                cor_por_nivel.update(zip(parte.niveis.tolist(), parte.cores.tolist()))
+            cores = [cor_por_nivel[nivel] for nivel in niveis.tolist()]
+
+        return cls(
+            np.concatenate([parte.linhas for parte in partes]),
+            np.concatenate([parte.user_ids for parte in partes]),
+            concatenar_timestamps([parte.timestamps for parte in partes]),
+            np.concatenate(codigos_respostas),
+            vocabulario,
+            pontos, codigos_nivel, niveis, cores,
+            partes[0].perguntas,
+            partes[0].prefixo_id
+        )
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Monta um DataFrame plano (uma coluna por pergunta) direto dos vetores
+
+        Returns:
+            DataFrame com uma linha por participante
+        """
+        colunas = {
+            "id": self.ids,
+            "user_id": self.user_ids,
+            "timestamp": self.timestamps
+        }
+        if self.pontuado:
+            colunas["pontuacao_total"] = self.pontuacao_total
+            colunas["nivel"] = self.nivel
+            colunas["cor_indicativa"] = self.cor_indicativa
+        colunas["total_perguntas"] = len(self.perguntas)
+
+        textos = self.respostas_texto()
+        for i, pergunta in enumerate(self.perguntas):
+            colunas[pergunta] = textos[:, i]
+            if self.pontuado:
+                colunas[f"{pergunta}_pontos"] = self.pontos[:, i]
+        return pd.DataFrame(colunas)
+
+
+class ResultadosCombinados:
+    """
+    Resultados combinados: pares de posições nas tabelas de estresse e menacme
+    """
+
+    def __init__(self, estresse: ResultadosEstresse, menacme: ResultadosMenacme,
+                 posicoes_estresse: np.ndarray, posicoes_menacme: np.ndarray):
+        """
+        Args:
+            estresse: Tabela de resultados de estresse
+            menacme: Tabela de resultados de menacme
+            posicoes_estresse: Posição do participante na tabela de estresse
+            posicoes_menacme: Posição do participante na tabela de menacme
+        """
+        self.estresse = estresse
+        self.menacme = menacme
+        self.posicoes_estresse = np.asarray(posicoes_estresse, dtype=np.int64)
+        self.posicoes_menacme = np.asarray(posicoes_menacme, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return len(self.posicoes_estresse)
+
+    def __iter__(self) -> Iterator["RegistroCombinado"]:
+        for posicao in range(len(self)):
+            yield RegistroCombinado(self, posicao)
+
+    def __getitem__(self, posicao: int) -> "RegistroCombinado":
+        if posicao < 0:
+            posicao += len(self)
+        if not 0 <= posicao < len(self):
+            raise IndexError(posicao)
+        return RegistroCombinado(self, posicao)
+
+    @property
+    def user_ids(self) -> np.ndarray:
+        """
+        Identificador de cada participante combinado
+        """
+        return self.estresse.user_ids[self.posicoes_estresse]
+
+    def como_dicts(self) -> Iterator[Dict]:
+        """
+        Gera cada resultado combinado como dicionário, um de cada vez
+        """
+        for registro in self:
+            yield registro.como_dict()
+
+    def para_dataframe(self) -> pd.DataFrame:
+        """
+        Monta um DataFrame plano direto dos vetores das duas tabelas
+
+        Returns:
+            DataFrame com uma linha por participante combinado
+        """
+        est, men = self.posicoes_estresse, self.posicoes_menacme
+        ids_estresse = np.array(self.estresse.ids, dtype=object)[est] if len(self) else []
+        ids_menacme = np.array(self.menacme.ids, dtype=object)[men] if len(self) else []
+        perguntas = np.array(self.menacme.perguntas, dtype=object)
+
+        return pd.DataFrame({
+            "id_combinado": [f"COMB_{id_est}_{id_men}" for id_est, id_men in zip(ids_estresse, ids_menacme)],
+            "user_id": self.user_ids,
+            "timestamp": [registro["timestamp"] for registro in self],
+            "estresse_pontuacao": self.estresse.pontuacao_total[est],
+            "estresse_nivel": self.estresse.nivel_estresse[est],
+            "estresse_cor": self.estresse.cor_indicativa[est],
+            "menacme_fase": self.menacme.fase_menopausa[men],
+            "menacme_sintomas": [", ".join(perguntas[linha]) for linha in self.menacme.sintomas[men]]
+        })
+
+
+class RegistroBase(Mapping):
+    """
+    Visão de um participante sobre uma tabela colunar
+
+    Não copia dados: cada chave é lida dos vetores no momento do acesso.
+    """
+
+    __slots__ = ("_tabela", "_posicao")
+    chaves = ()
+
+    def __init__(self, tabela, posicao: int):
+        self._tabela = tabela
+        self._posicao = posicao
+
+    def __getitem__(self, chave: str):
+        if chave not in self.chaves:
+            raise KeyError(chave)
+        return getattr(self, f"_valor_{chave}")()
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.chaves)
+
+    def __len__(self) -> int:
+        return len(self.chaves)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.como_dict()!r})"
+
+    def como_dict(self) -> Dict:
+        """
+        Cópia do participante como dicionário comum
+        """
+        return {chave: self[chave] for chave in self.chaves}
+
+
+class RegistroEstresse(RegistroBase):
+    """
+    Participante do questionário de estresse
+    """
+
+    __slots__ = ()
+    chaves = ("id", "user_id", "timestamp", "respostas", "pontuacao_total",
+              "nivel_estresse", "cor_indicativa", "total_perguntas")
+
+    def _valor_id(self):
+        return f"EST_{self._tabela.linhas[self._posicao] + 1}"
+
+    def _valor_user_id(self):
+        return self._tabela.user_ids[self._posicao]
+
+    def _valor_timestamp(self):
+        return converter_timestamp(self._tabela.timestamps[self._posicao])
+
+    def _valor_respostas(self):
+        tabela, posicao = self._tabela, self._posicao
+        return [
+            {
+                "pergunta": pergunta,
+                "resposta": tabela.vocabulario_respostas[tabela.codigos_respostas[posicao, i]],
+                "pontos": int(tabela.pontos[posicao, i])
+            }
+            for i, pergunta in enumerate(tabela.perguntas)
+        ]
+
+    def _valor_pontuacao_total(self):
+        return int(self._tabela.pontuacao_total[self._posicao])
+
+    def _valor_nivel_estresse(self):
+        return self._tabela.niveis[self._tabela.codigos_nivel[self._posicao]]
+
+    def _valor_cor_indicativa(self):
+        return self._tabela.cores[self._tabela.codigos_nivel[self._posicao]]
+
+    def _valor_total_perguntas(self):
+        return len(self._tabela.perguntas)
+
+
+class RegistroMenacme(RegistroBase):
+    """
+    Participante do questionário de menacme
+    """
+
+    __slots__ = ()
+    chaves = ("id", "user_id", "timestamp", "respostas", "sintomas_identificados",
+              "fase_menopausa", "total_perguntas")
+
+    def _valor_id(self):
+        return f"MEN_{self._tabela.linhas[self._posicao] + 1}"
+
+    def _valor_user_id(self):
+        return self._tabela.user_ids[self._posicao]
+
+    def _valor_timestamp(self):
+        return converter_timestamp(self._tabela.timestamps[self._posicao])
+
+    def _valor_respostas(self):
+        tabela, posicao = self._tabela, self._posicao
+        return [
+            {
+                "pergunta": pergunta,
+                "resposta": tabela.vocabulario_respostas[tabela.codigos_respostas[posicao, i]]
+            }
+            for i, pergunta in enumerate(tabela.perguntas)
+        ]
+
+    def _valor_sintomas_identificados(self):
+        return self._tabela.sintomas_de(self._posicao)
+
+    def _valor_fase_menopausa(self):
+        return self._tabela.fases[self._tabela.codigos_fase[self._posicao]]
+
+    def _valor_total_perguntas(self):
+        return len(self._tabela.perguntas)
+
+
+class RegistroQuestionario(RegistroBase):
+    """
+    Participante de um questionário declarado no config.json
+
+    As chaves dependem de o questionário ser pontuado ou não.
+    """
+
+    __slots__ = ()
+    chaves_pontuado = ("id", "user_id", "timestamp", "respostas", "pontuacao_total",
+                       "nivel", "cor_indicativa", "total_perguntas")
+    chaves_categorico = ("id", "user_id", "timestamp", "respostas", "total_perguntas")
+
+    @property
+    def chaves(self) -> Tuple[str, ...]:
+        return self._tabela.chaves
+
+    def _valor_id(self):
+        return f"{self._tabela.prefixo_id}_{self._tabela.linhas[self._posicao] + 1}"
+
+    def _valor_user_id(self):
+        return self._tabela.user_ids[self._posicao]
+
+    def _valor_timestamp(self):
+        return converter_timestamp(self._tabela.timestamps[self._posicao])
+
+    def _valor_respostas(self):
+        tabela, posicao = self._tabela, self._posicao
+        respostas = [
+            {
+                "pergunta": pergunta,
+                "resposta": tabela.vocabulario_respostas[tabela.codigos_respostas[posicao, i]]
+            }
+            for i, pergunta in enumerate(tabela.perguntas)
+        ]
+        if tabela.pontuado:
+            for i, resposta in enumerate(respostas):
+                resposta["pontos"] = int(tabela.pontos[posicao, i])
+        return respostas
+
+    def _valor_pontuacao_total(self):
+        return int(self._tabela.pontuacao_total[self._posicao])
+
+    def _valor_nivel(self):
+        return self._tabela.niveis[self._tabela.codigos_nivel[self._posicao]]
+
+    def _valor_cor_indicativa(self):
+        return self._tabela.cores[self._tabela.codigos_nivel[self._posicao]]
+
+    def _valor_total_perguntas(self):
+        return len(self._tabela.perguntas)
+
+
+class RegistroCombinado(RegistroBase):
+    """
+    Participante com resultados de estresse e menacme combinados
+    """
+
+    __slots__ = ()
+    chaves = ("id_combinado", "user_id", "timestamp", "estresse", "menacme")
+
+    @property
+    def registro_estresse(self) -> RegistroEstresse:
+        """
+        Visão do participante na tabela de estresse
+        """
+        return RegistroEstresse(self._tabela.estresse, int(self._tabela.posicoes_estresse[self._posicao]))
+
+    @property
+    def registro_menacme(self) -> RegistroMenacme:
+        """
+        Visão do participante na tabela de menacme
+        """
+        return RegistroMenacme(self._tabela.menacme, int(self._tabela.posicoes_menacme[self._posicao]))
+
+    def _valor_id_combinado(self):
+        return f"COMB_{self.registro_estresse['id']}_{self.registro_menacme['id']}"
+
+    def _valor_user_id(self):
+        return self.registro_estresse["user_id"]
+
+    def _valor_timestamp(self):
+        datas = [data for data in (self.registro_estresse["timestamp"], self.registro_menacme["timestamp"])
+                 if not pd.isna(data)]
+        return max(datas, default=pd.NaT)
+
+    def _valor_estresse(self):
+        est = self.registro_estresse
+        return {
+            "pontuacao": est["pontuacao_total"],
+            "nivel": est["nivel_estresse"],
+            "cor": est["cor_indicativa"]
+        }
+
+    def _valor_menacme(self):
+        men = self.registro_menacme
+        return {
+            "fase": men["fase_menopausa"],
+            "sintomas": men["sintomas_identificados"]
+        }
+
+
+ResultadosEstresse.classe_registro = RegistroEstresse
+ResultadosMenacme.classe_registro = RegistroMenacme
+ResultadosQuestionario.classe_registro = RegistroQuestionario
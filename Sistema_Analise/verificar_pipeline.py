@@ -0,0 +1,245 @@
+"""
+Verificação de regressão do pipeline sobre dados sintéticos
+
+Executa as etapas do ``main.py`` (processamento, gravação dos resultados e
+diagnósticos) em diretórios temporários, para cada cenário de entrada, e
+confere que todas terminam e gravam o que se espera. Os dados vêm de
+gerar_dados_sinteticos, com semente fixa.
+
+Termina com código 1 se algum cenário falhar, para uso em CI ou cron.
+
+Uso:
+    python verificar_pipeline.py
+    python verificar_pipeline.py --linhas 500
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import sys
+import tempfile
+import traceback
+from contextlib import redirect_stdout
+from typing import Callable, Dict, List, Optional
+
+import pandas as pd
+
+from gerar_dados_sinteticos import escrever_questionarios, gerar_questionarios
+from gerador_diagnosticos import GeradorDiagnosticos
+from processador_questionarios import ProcessadorQuestionarios
+
+DIRETORIO = os.path.dirname(os.path.abspath(__file__))
+
+
+def carregar_config() -> Dict:
+    """
+    Configuração do config.json ao lado deste script
+
+    Returns:
+        Dicionário de configuração
+    """
+    with open(os.path.join(DIRETORIO, "config.json"), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def executar_pipeline(questionarios: Dict[str, pd.DataFrame], diretorio: str,
+                      config: Dict) -> ProcessadorQuestionarios:
+    """
+    Grava as exportações e executa o processamento completo, como o main.py
+
+    Args:
+        questionarios: Dicionário {questionario: DataFrame} a exportar
+        diretorio: Diretório de trabalho (recebe dados_entrada, resultados e diagnosticos)
+        config: Configuração do processador
+
+    Returns:
+        Processador com os resultados da execução
+    """
+    entrada = os.path.join(diretorio, "dados_entrada")
+    os.makedirs(entrada, exist_ok=True)
+    escrever_questionarios(questionarios, entrada, "parquet")
+
+    processador = ProcessadorQuestionarios(config=config, usar_cache=False)
+    # As mensagens de progresso das etapas não interessam aqui
+    with redirect_stdout(io.StringIO()):
+        processador.processar_todos_questionarios(entrada)
+        processador.salvar_resultados(os.path.join(diretorio, "resultados"))
+        GeradorDiagnosticos(processador).gerar_todos_diagnosticos(
+            os.path.join(diretorio, "diagnosticos"), workers=1)
+    return processador
+
+
+def verificar_questionarios_ausentes(dados: Dict[str, pd.DataFrame], config: Dict) -> List[str]:
+    """
+    Entradas sem algum dos questionários (ou sem nenhum) também terminam
+
+    Args:
+        dados: Exportações sintéticas dos quatro questionários
+        config: Configuração do processador
+
+    Returns:
+        Mensagens de falha
+    """
+    falhas = []
+    for presentes in ([], ["estresse"], ["menacme"]):
+        nome = ", ".join(presentes) or "nenhum questionário"
+        with tempfile.TemporaryDirectory() as diretorio:
+            executar_pipeline({questionario: dados[questionario] for questionario in presentes},
+                              diretorio, config)
+            with open(os.path.join(diretorio, "resultados", "estatisticas.json"), 'r', encoding='utf-8') as f:
+                resumo = json.load(f)["resumo"]["questionarios"]
+            if sorted(resumo) != sorted(presentes):
+                falhas.append(f"{nome}: estatisticas.json resume {sorted(resumo)}")
+    return falhas
+
+
+def verificar_leitura_em_blocos(dados: Dict[str, pd.DataFrame], config: Dict) -> List[str]:
+    """
+    A leitura em blocos produz os mesmos resultados que a leitura inteira
+
+    Args:
+        dados: Exportações sintéticas dos quatro questionários
+        config: Configuração do processador
+
+    Returns:
+        Mensagens de falha
+    """
+    falhas = []
+    tamanho_bloco = max(1, len(dados["estresse"]) // 7)
+    for politica in ("ultima", "primeira", "todas"):
+        saidas = []
+        for bloco in (None, tamanho_bloco):
+            config_cenario = json.loads(json.dumps(config))
+            config_cenario["configuracoes_gerais"].update(
+                politica_duplicatas=politica, tamanho_bloco_leitura=bloco)
+            with tempfile.TemporaryDirectory() as diretorio:
+                executar_pipeline(dados, diretorio, config_cenario)
+                with open(os.path.join(diretorio, "resultados", "resultados_completos.json"), 'rb') as f:
+                    saidas.append(f.read())
+        if saidas[0] != saidas[1]:
+            falhas.append(f"{politica}: resultados_completos.json difere com tamanho_bloco_leitura={tamanho_bloco}")
+    return falhas
+
+
+def verificar_reexecucao(dados: Dict[str, pd.DataFrame], config: Dict) -> List[str]:
+    """
+    Reexecutar sobre a mesma entrada grava os mesmos resultados, mesmo com
+    carimbos de data/hora inválidos ou ausentes e linhas sem ID
+
+    Args:
+        dados: Exportações sintéticas dos quatro questionários
+        config: Configuração do processador
+
+    Returns:
+        Mensagens de falha
+    """
+    incompletos = {}
+    for questionario, df in dados.items():
+        df = df.astype({df.columns[0]: str, df.columns[-1]: object})
+        df.iloc[::11, 0] = "data inválida"
+        df.iloc[5::11, 0] = None
+        df.iloc[::7, -1] = None
+        incompletos[questionario] = df
+
+    saidas = []
+    for _ in range(2):
+        with tempfile.TemporaryDirectory() as diretorio:
+            executar_pipeline(incompletos, diretorio, config)
+            with open(os.path.join(diretorio, "resultados", "resultados_completos.json"), 'rb') as f:
+                saidas.append(f.read())
+    return [] if saidas[0] == saidas[1] else ["resultados_completos.json difere entre duas execuções"]
+
+
+def verificar_incremental(dados: Dict[str, pd.DataFrame], config: Dict) -> List[str]:
+    """
+    O modo incremental grava o mesmo que uma execução completa e não
+    regrava nada quando não há respostas novas
+
+    As exportações chegam em duas partes; a segunda execução incremental
+    deve produzir os mesmos arquivos (JSON, ou NDJSON anexado) que o
+    processamento completo de tudo, e a terceira, sem nada novo, não deve
+    tocar em nenhum arquivo de resultados.
+
+    Args:
+        dados: Exportações sintéticas dos quatro questionários
+        config: Configuração do processador
+
+    Returns:
+        Mensagens de falha
+    """
+    falhas = []
+    primeira_parte = {questionario: df.iloc[:len(df) * 2 // 3] for questionario, df in dados.items()}
+    # Com "todas", nenhum envio anterior é substituído e o NDJSON só recebe linhas
+    for formato, politica in (("json", "ultima"), ("ndjson", "ultima"), ("ndjson", "todas")):
+        nome = f"{formato}/{politica}"
+        config_cenario = json.loads(json.dumps(config))
+        config_cenario["configuracoes_gerais"].update(formatos_saida=[formato], politica_duplicatas=politica)
+        with tempfile.TemporaryDirectory() as diretorio:
+            executar_pipeline(dados, os.path.join(diretorio, "completo"), config_cenario)
+
+            entrada = os.path.join(diretorio, "dados_entrada")
+            saida = os.path.join(diretorio, "resultados")
+            controle = os.path.join(diretorio, "controle_ids.json")
+            for parte in (primeira_parte, dados, dados):
+                os.makedirs(entrada, exist_ok=True)
+                escrever_questionarios(parte, entrada, "parquet")
+                estados = {arquivo: os.stat(os.path.join(saida, arquivo)).st_mtime_ns
+                           for arquivo in os.listdir(saida)} if os.path.isdir(saida) else {}
+                with redirect_stdout(io.StringIO()):
+                    ProcessadorQuestionarios(config=config_cenario, usar_cache=False).processar_incremental(
+                        entrada, saida, controle)
+
+            regravados = sorted(arquivo for arquivo, mtime in estados.items()
+                                if os.stat(os.path.join(saida, arquivo)).st_mtime_ns != mtime)
+            if regravados:
+                falhas.append(f"{nome}: execução sem respostas novas regravou {', '.join(regravados)}")
+            for arquivo in sorted(os.listdir(os.path.join(diretorio, "completo", "resultados"))):
+                if not arquivo.startswith("resultados_"):
+                    continue
+                with open(os.path.join(diretorio, "completo", "resultados", arquivo), 'rb') as f:
+                    esperado = f.read()
+                with open(os.path.join(saida, arquivo), 'rb') as f:
+                    if f.read() != esperado:
+                        falhas.append(f"{nome}: {arquivo} incremental difere do processamento completo")
+    return falhas
+
+
+# Nome do cenário -> verificação (dados, config) -> mensagens de falha
+VERIFICACOES: Dict[str, Callable[[Dict[str, pd.DataFrame], Dict], List[str]]] = {
+    "questionarios_ausentes": verificar_questionarios_ausentes,
+    "leitura_em_blocos": verificar_leitura_em_blocos,
+    "reexecucao": verificar_reexecucao,
+    "incremental": verificar_incremental,
+}
+
+
+def main(argumentos: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Verificação de regressão do pipeline")
+    parser.add_argument("--linhas", type=int, default=300,
+                        help="linhas por questionário nos dados sintéticos (padrão: 300)")
+    parser.add_argument("--semente", type=int, default=42, help="semente dos dados (padrão: 42)")
+    args = parser.parse_args(argumentos)
+
+    logging.disable(logging.INFO)
+    dados = gerar_questionarios(args.linhas, args.semente)
+    config = carregar_config()
+
+    falhas = []
+    for nome, verificacao in VERIFICACOES.items():
+        try:
+            falhas_cenario = verificacao(dados, config)
+        except Exception as e:
+            traceback.print_exc()
+            falhas_cenario = [f"{type(e).__name__}: {e}"]
+        falhas.extend(f"{nome}: {falha}" for falha in falhas_cenario)
+        print(f"{'❌' if falhas_cenario else '✅'} {nome}")
+
+    for falha in falhas:
+        print(f"❌ {falha}")
+    return 1 if falhas else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))